@@ -0,0 +1,30 @@
+# archivos.py
+# -*- coding: utf-8 -*-
+""""
+Búsqueda de los XML de circuitos y mensajes de error comunes a las
+herramientas que procesan varios archivos (lote y temporada), sin
+importar ningún generador
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import glob
+import os
+import xml.etree.ElementTree as ET
+
+def describirError(error, archivoXML):
+    """
+    Mensaje de error con el mismo texto que los main de cada generador
+    """
+    if isinstance(error, FileNotFoundError):
+        return f"Error: No se encontró el archivo {archivoXML}"
+    if isinstance(error, ET.ParseError):
+        return f"Error al parsear el archivo XML: {error}"
+    return f"Error inesperado: {error}"
+
+def buscarCircuitos(entrada):
+    """
+    Lista ordenada de archivos XML de un directorio o de un patrón glob
+    """
+    if os.path.isdir(entrada):
+        entrada = os.path.join(entrada, "*.xml")
+    return sorted(ruta for ruta in glob.glob(entrada) if os.path.isfile(ruta))
@@ -0,0 +1,181 @@
+# cache.py
+# -*- coding: utf-8 -*-
+""""
+Caché binaria del circuito junto al XML: los datos de cabecera en JSON y
+las columnas de tramos en binario, para recargarlas con mmap sin copiar
+y sin volver a parsear el XML. La caché se identifica por la huella
+SHA-256 del XML de origen
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+from manifiesto import huellaArchivo
+from modelo import (Circuito, ColumnasTramos, Coordenadas, LectorCircuito,
+                    PilotoClasificado, cargarCircuito)
+
+EXTENSION = ".tramos"
+MAGIA = b'CIRCTRAM'
+VERSION = 1
+# magia, versión, orden de bytes, número de tramos, huella del XML, longitud del JSON
+FORMATO = '<8sIIQ32sQ'
+ORDEN = 1 if sys.byteorder == 'little' else 2
+
+# Columnas en el orden en que se guardan: (atributo, código de tipo)
+COLUMNAS = (('longitud', 'd'), ('latitud', 'd'), ('altitud', 'd'),
+            ('distancia', 'd'), ('sector', 'i'))
+
+CAMPOS = ('nombre', 'longitud', 'unidades_longitud', 'anchura', 'unidades_anchura',
+          'fecha', 'hora_inicio', 'numero_vueltas', 'localidad', 'pais',
+          'patrocinador', 'referencias', 'fotos', 'videos',
+          'nombre_vencedor', 'tiempo_carrera')
+
+def rutaCache(archivoXML):
+    """
+    Ruta de la caché de un XML: mismo nombre con extensión .tramos
+    """
+    return os.path.splitext(archivoXML)[0] + EXTENSION
+
+def _alinear(posicion):
+    """
+    Redondea al siguiente múltiplo de 8 para alinear las columnas
+    """
+    return (posicion + 7) & ~7
+
+def _cabecera(circuito, estado):
+    """
+    Datos del circuito distintos de los tramos, serializables en JSON
+    """
+    datos = {campo: getattr(circuito, campo) for campo in CAMPOS}
+    origen = circuito.origen
+    datos['origen'] = [origen.longitud, origen.latitud, origen.altitud]
+    datos['clasificacion'] = [[p.posicion, p.nombre, p.puntos] for p in circuito.clasificacion]
+    datos['tamano'] = estado.st_size
+    datos['mtime_ns'] = estado.st_mtime_ns
+    return datos
+
+def escribirCache(archivoXML, ruta=None):
+    """
+    Lee el XML en flujo y escribe su caché. Cada columna se vuelca a un
+    temporal por bloques, así que la memoria no depende del número de tramos
+    """
+    ruta = ruta or rutaCache(archivoXML)
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    estado = os.stat(archivoXML)
+    huella = bytes.fromhex(huellaArchivo(archivoXML))
+    lector = LectorCircuito(archivoXML)
+    temporales = [tempfile.TemporaryFile(dir=directorio) for _ in COLUMNAS]
+    try:
+        total = 0
+        for bloque in lector.bloques():
+            total += len(bloque)
+            for (atributo, _), temporal in zip(COLUMNAS, temporales):
+                getattr(bloque, atributo).tofile(temporal)
+        # Tras agotar los tramos ya se leyeron vencedor y clasificación
+        cabecera = json.dumps(_cabecera(lector.circuito, estado)).encode('utf-8')
+        descriptor, provisional = tempfile.mkstemp(dir=directorio, suffix=EXTENSION)
+        with os.fdopen(descriptor, 'wb') as salida:
+            salida.write(struct.pack(FORMATO, MAGIA, VERSION, ORDEN, total, huella, len(cabecera)))
+            salida.write(cabecera)
+            salida.write(b'\0' * (_alinear(salida.tell()) - salida.tell()))
+            for temporal in temporales:
+                temporal.seek(0)
+                shutil.copyfileobj(temporal, salida, 1 << 20)
+        os.replace(provisional, ruta)
+    finally:
+        for temporal in temporales:
+            temporal.close()
+    return ruta
+
+def _reescribirCabecera(ruta, mapa, datos, total, huella, posicion):
+    """
+    Reescribe la caché con otra cabecera copiando las columnas del mapa
+    actual, sin volver a leer el XML. El mapa abierto sigue siendo válido
+    porque la caché se sustituye con os.replace. Si no se puede escribir
+    se deja como estaba
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    cabecera = json.dumps(datos).encode('utf-8')
+    try:
+        descriptor, provisional = tempfile.mkstemp(dir=directorio, suffix=EXTENSION)
+    except OSError:
+        return
+    try:
+        with os.fdopen(descriptor, 'wb') as salida:
+            salida.write(struct.pack(FORMATO, MAGIA, VERSION, ORDEN, total, huella, len(cabecera)))
+            salida.write(cabecera)
+            salida.write(b'\0' * (_alinear(salida.tell()) - salida.tell()))
+            salida.write(memoryview(mapa)[posicion:])
+        os.replace(provisional, ruta)
+    except OSError:
+        if os.path.exists(provisional):
+            os.remove(provisional)
+
+def leerCache(archivoXML, ruta=None):
+    """
+    Devuelve el Circuito de la caché con las columnas de tramos como
+    memoryview sobre el archivo mapeado, o None si no existe, está
+    corrupta o no corresponde al XML actual
+    """
+    ruta = ruta or rutaCache(archivoXML)
+    try:
+        with open(ruta, 'rb') as archivo:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magia, version, orden, total, huella, longitud = struct.unpack_from(FORMATO, mapa, 0)
+        if magia != MAGIA or version != VERSION or orden != ORDEN:
+            return None
+        inicio = struct.calcsize(FORMATO)
+        datos = json.loads(bytes(mapa[inicio:inicio + longitud]).decode('utf-8'))
+    except (struct.error, ValueError):
+        return None
+    posicion = _alinear(inicio + longitud)
+    tamanos = [total * struct.calcsize(tipo) for _, tipo in COLUMNAS]
+    if len(mapa) != posicion + sum(tamanos):
+        return None
+    # Comprobación rápida por tamaño y fecha; si difieren, por huella
+    estado = os.stat(archivoXML)
+    if (estado.st_size, estado.st_mtime_ns) != (datos['tamano'], datos['mtime_ns']):
+        if bytes.fromhex(huellaArchivo(archivoXML)) != huella:
+            return None
+        # Mismo contenido con otra fecha: se anota para no volver a calcular la huella
+        datos['tamano'], datos['mtime_ns'] = estado.st_size, estado.st_mtime_ns
+        _reescribirCabecera(ruta, mapa, datos, total, huella, posicion)
+
+    circuito = Circuito()
+    for campo in CAMPOS:
+        setattr(circuito, campo, datos[campo])
+    circuito.origen = Coordenadas(*datos['origen'])
+    circuito.clasificacion = [PilotoClasificado(*p) for p in datos['clasificacion']]
+    columnas = ColumnasTramos()
+    memoria = memoryview(mapa)
+    for (atributo, tipo), tamano in zip(COLUMNAS, tamanos):
+        setattr(columnas, atributo, memoria[posicion:posicion + tamano].cast(tipo))
+        posicion += tamano
+    # Mantener vivo el mapa mientras se usen las columnas
+    columnas.mapa = mapa
+    circuito.tramos = columnas
+    return circuito
+
+def cargarCircuitoCache(archivoXML):
+    """
+    Carga el circuito desde la caché, regenerándola si hace falta. Si no
+    se puede escribir la caché se carga directamente del XML
+    """
+    circuito = leerCache(archivoXML)
+    if circuito is not None:
+        return circuito
+    try:
+        escribirCache(archivoXML)
+    except OSError:
+        return cargarCircuito(archivoXML)
+    circuito = leerCache(archivoXML)
+    return circuito if circuito is not None else cargarCircuito(archivoXML)
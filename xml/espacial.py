@@ -0,0 +1,281 @@
+# espacial.py
+# -*- coding: utf-8 -*-
+""""
+Índice espacial de los tramos en una rejilla uniforme: tramo más cercano
+a un punto y emparejamiento de trazas GPS con el circuito (distancia
+recorrida en la vuelta y sector)
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import math
+from array import array
+
+from modelo import vista
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class Emparejamiento(object):
+    """
+    Resultado de emparejar puntos con el circuito, en columnas: distancia
+    recorrida, tramo, separación en metros y sector de cada punto
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, distancias, tramos, separaciones, sectores):
+        """
+        Guarda las columnas del resultado
+        """
+        self.distancias = distancias
+        self.tramos = tramos
+        self.separaciones = separaciones
+        self.sectores = sectores
+
+    def __len__(self):
+        return len(self.distancias)
+
+class RejillaTramos(object):
+    """
+    Rejilla uniforme, en metros, sobre los segmentos de un IndiceDistancias.
+    Cada celda guarda los tramos cuya caja envolvente la toca. Con NumPy
+    las celdas se guardan en formato comprimido (inicios y segmentos)
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, indice, celda=None):
+        """
+        Construye la rejilla. Por defecto la celda mide el doble de la
+        longitud media de los tramos (al menos un metro); conviene que se
+        acerque a la separación típica de los puntos a emparejar
+        """
+        self.indice = indice
+        self.xs, self.ys = indice.plano()
+        xs, ys = self.xs, self.ys
+        self.x0 = float(min(xs))
+        self.y0 = float(min(ys))
+        if celda is None:
+            n = len(indice)
+            longitud = sum(math.hypot(xs[i + 1] - xs[i], ys[i + 1] - ys[i]) for i in range(n))
+            celda = max(2 * longitud / n, 1.0)
+        self.celda = float(celda)
+        self.columnas = int((max(xs) - self.x0) // self.celda) + 1
+        self.filas = int((max(ys) - self.y0) // self.celda) + 1
+        if np is not None:
+            self._construirNumpy()
+        else:
+            self._construirPython()
+
+    def _construirNumpy(self):
+        """
+        Reparte los segmentos en celdas de forma vectorizada
+        """
+        xs, ys = self.xs, self.ys
+        cx0 = ((np.minimum(xs[:-1], xs[1:]) - self.x0) // self.celda).astype(np.intp)
+        cx1 = ((np.maximum(xs[:-1], xs[1:]) - self.x0) // self.celda).astype(np.intp)
+        cy0 = ((np.minimum(ys[:-1], ys[1:]) - self.y0) // self.celda).astype(np.intp)
+        cy1 = ((np.maximum(ys[:-1], ys[1:]) - self.y0) // self.celda).astype(np.intp)
+        ancho = cx1 - cx0 + 1
+        cuenta = ancho * (cy1 - cy0 + 1)
+        segmentos = np.repeat(np.arange(len(cuenta)), cuenta)
+        k = np.arange(int(cuenta.sum())) - np.repeat(np.cumsum(cuenta) - cuenta, cuenta)
+        ancho = np.repeat(ancho, cuenta)
+        celdas = ((np.repeat(cy0, cuenta) + k // ancho) * self.columnas
+                  + np.repeat(cx0, cuenta) + k % ancho)
+        orden = np.argsort(celdas, kind='stable')
+        self.segmentos = segmentos[orden]
+        self.inicios = np.concatenate(([0], np.cumsum(np.bincount(celdas, minlength=self.filas * self.columnas))))
+
+    def _construirPython(self):
+        """
+        Reparte los segmentos en un diccionario de celdas
+        """
+        xs, ys = self.xs, self.ys
+        self.celdas = {}
+        for i in range(len(self.indice)):
+            cx0 = int((min(xs[i], xs[i + 1]) - self.x0) // self.celda)
+            cx1 = int((max(xs[i], xs[i + 1]) - self.x0) // self.celda)
+            cy0 = int((min(ys[i], ys[i + 1]) - self.y0) // self.celda)
+            cy1 = int((max(ys[i], ys[i + 1]) - self.y0) // self.celda)
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    self.celdas.setdefault(cy * self.columnas + cx, []).append(i)
+
+    def _candidatos(self, cx, cy):
+        """
+        Tramos registrados en la celda (cx, cy)
+        """
+        if not (0 <= cx < self.columnas and 0 <= cy < self.filas):
+            return ()
+        celda = cy * self.columnas + cx
+        if np is not None:
+            return self.segmentos[self.inicios[celda]:self.inicios[celda + 1]].tolist()
+        return self.celdas.get(celda, ())
+
+    def _proyeccion(self, i, px, py):
+        """
+        (separación, fracción) del punto proyectado sobre el tramo i
+        """
+        ax, ay = self.xs[i], self.ys[i]
+        dx, dy = self.xs[i + 1] - ax, self.ys[i + 1] - ay
+        longitud2 = dx * dx + dy * dy
+        t = 0.0
+        if longitud2 > 0:
+            t = min(max(((px - ax) * dx + (py - ay) * dy) / longitud2, 0.0), 1.0)
+        return math.hypot(ax + t * dx - px, ay + t * dy - py), t
+
+    def _cercanoPlano(self, px, py):
+        """
+        (separación, tramo, fracción) del tramo más cercano al punto en
+        metros. Recorre anillos de celdas hasta que ningún tramo sin
+        revisar pueda estar más cerca; si hay que recorrer más celdas que
+        tramos, los revisa todos
+        """
+        cx = math.floor((px - self.x0) / self.celda)
+        cy = math.floor((py - self.y0) / self.celda)
+        limite = max(abs(cx), abs(cx - self.columnas + 1), abs(cy), abs(cy - self.filas + 1))
+        mejor = (math.inf, 0, 0.0)
+        radio = 0
+        while True:
+            if (2 * radio + 1) ** 2 > len(self.indice):
+                return self._cercanoTodos(px, py) if np is None else self._cercanoTodosNumpy(px, py)
+            for y in range(cy - radio, cy + radio + 1):
+                paso = 1 if radio == 0 or y in (cy - radio, cy + radio) else 2 * radio
+                for x in range(cx - radio, cx + radio + 1, paso):
+                    for i in self._candidatos(x, y):
+                        separacion, t = self._proyeccion(i, px, py)
+                        if separacion < mejor[0]:
+                            mejor = (separacion, i, t)
+            if mejor[0] <= radio * self.celda or radio >= limite:
+                return mejor
+            radio += 1
+
+    def _cercanoTodos(self, px, py):
+        """
+        (separación, tramo, fracción) revisando todos los tramos
+        """
+        mejor = (math.inf, 0, 0.0)
+        for i in range(len(self.indice)):
+            separacion, t = self._proyeccion(i, px, py)
+            if separacion < mejor[0]:
+                mejor = (separacion, i, t)
+        return mejor
+
+    def _cercanoTodosNumpy(self, px, py):
+        """
+        (separación, tramo, fracción) revisando todos los tramos a la vez
+        """
+        xs, ys = self.xs, self.ys
+        ax, ay, dx, dy = xs[:-1], ys[:-1], np.diff(xs), np.diff(ys)
+        longitud2 = dx * dx + dy * dy
+        t = np.divide((px - ax) * dx + (py - ay) * dy, longitud2,
+                      out=np.zeros_like(longitud2), where=longitud2 > 0)
+        t = np.clip(t, 0.0, 1.0)
+        separaciones = np.hypot(ax + t * dx - px, ay + t * dy - py)
+        i = int(np.argmin(separaciones))
+        return float(separaciones[i]), i, float(t[i])
+
+    def tramoCercano(self, longitud, latitud):
+        """
+        Proyecta el punto sobre el tramo más cercano. Devuelve
+        (distancia recorrida, índice del tramo, separación en metros)
+        """
+        px, py = self.indice.proyectar(longitud, latitud)
+        separacion, i, t = self._cercanoPlano(float(px), float(py))
+        indice = self.indice
+        return float(indice.acumulada[i] + t * indice.tramos.distancia[i]), i, separacion
+
+    def _emparejarBloque(self, px, py, lado):
+        """
+        Empareja un bloque de puntos con los tramos del cuadrado de lado x
+        lado celdas centrado en cada uno. Devuelve (tramos, fracciones,
+        separaciones, resueltos): un punto está resuelto si su mejor tramo
+        no está más lejos que el borde del cuadrado, porque ninguno de
+        fuera puede mejorarlo
+        """
+        m = len(px)
+        u = (px - self.x0) / self.celda
+        v = (py - self.y0) / self.celda
+        cx = np.floor(u - (lado - 1) / 2).astype(np.intp)
+        cy = np.floor(v - (lado - 1) / 2).astype(np.intp)
+        desplazamientos = np.arange(lado)
+        vx = (cx[:, None] + np.tile(desplazamientos, lado)).ravel()
+        vy = (cy[:, None] + np.repeat(desplazamientos, lado)).ravel()
+        validas = (vx >= 0) & (vx < self.columnas) & (vy >= 0) & (vy < self.filas)
+        celdas = np.where(validas, vy * self.columnas + vx, 0)
+        inicio = self.inicios[celdas]
+        cuenta = np.where(validas, self.inicios[celdas + 1] - inicio, 0)
+        # Pares (punto, tramo candidato), agrupados por punto
+        puntos = np.repeat(np.repeat(np.arange(m), lado * lado), cuenta)
+        posiciones = (np.repeat(inicio, cuenta) + np.arange(int(cuenta.sum()))
+                      - np.repeat(np.cumsum(cuenta) - cuenta, cuenta))
+        segmentos = self.segmentos[posiciones]
+        ax, ay = self.xs[segmentos], self.ys[segmentos]
+        sx, sy = self.xs[segmentos + 1] - ax, self.ys[segmentos + 1] - ay
+        qx, qy = px[puntos], py[puntos]
+        longitud2 = sx * sx + sy * sy
+        t = np.divide((qx - ax) * sx + (qy - ay) * sy, longitud2,
+                      out=np.zeros_like(longitud2), where=longitud2 > 0)
+        t = np.clip(t, 0.0, 1.0)
+        distancia = np.hypot(ax + t * sx - qx, ay + t * sy - qy)
+
+        tramos = np.zeros(m, dtype=np.intp)
+        fracciones = np.zeros(m)
+        separaciones = np.full(m, np.inf)
+        porPunto = cuenta.reshape(m, lado * lado).sum(axis=1)
+        con = porPunto > 0
+        if con.any():
+            separaciones[con] = np.minimum.reduceat(distancia, (np.cumsum(porPunto) - porPunto)[con])
+            empates = np.flatnonzero(distancia == separaciones[puntos])
+            elegidos, primeros = np.unique(puntos[empates], return_index=True)
+            pares = empates[primeros]
+            tramos[elegidos] = segmentos[pares]
+            fracciones[elegidos] = t[pares]
+        # Distancia del punto al borde del cuadrado revisado
+        borde = np.minimum(np.minimum(u - cx, cx + lado - u),
+                           np.minimum(v - cy, cy + lado - v)) * self.celda
+        return tramos, fracciones, separaciones, separaciones <= borde
+
+    def emparejar(self, longitudes, latitudes, bloque=65536):
+        """
+        Empareja columnas de puntos GPS con el circuito. Devuelve un
+        Emparejamiento con la distancia recorrida, el tramo, la
+        separación y el sector de cada punto
+        """
+        indice = self.indice
+        if np is None:
+            resultado = Emparejamiento(array('d'), array('l'), array('d'), array('i'))
+            for longitud, latitud in zip(longitudes, latitudes):
+                distancia, i, separacion = self.tramoCercano(longitud, latitud)
+                resultado.distancias.append(distancia)
+                resultado.tramos.append(i)
+                resultado.separaciones.append(separacion)
+                resultado.sectores.append(indice.tramos.sector[i])
+            return resultado
+        px, py = indice.proyectar(np.asarray(longitudes, dtype=np.float64),
+                                  np.asarray(latitudes, dtype=np.float64))
+        total = len(px)
+        tramos = np.zeros(total, dtype=np.intp)
+        fracciones = np.zeros(total)
+        separaciones = np.zeros(total)
+        pendientes = np.arange(total)
+        lado = 3
+        # Se dobla el lado sólo para los puntos aún sin resolver; cuando
+        # habría que revisar más celdas que tramos se revisan todos
+        while len(pendientes) and lado * lado <= len(indice):
+            paso = max(bloque // (lado * lado), 1)
+            sinResolver = []
+            for inicio in range(0, len(pendientes), paso):
+                parte = pendientes[inicio:inicio + paso]
+                t, f, d, resueltos = self._emparejarBloque(px[parte], py[parte], lado)
+                tramos[parte[resueltos]] = t[resueltos]
+                fracciones[parte[resueltos]] = f[resueltos]
+                separaciones[parte[resueltos]] = d[resueltos]
+                sinResolver.append(parte[~resueltos])
+            pendientes = np.concatenate(sinResolver) if sinResolver else pendientes[:0]
+            lado = 2 * lado - 1
+        for i in pendientes:
+            separaciones[i], tramos[i], fracciones[i] = self._cercanoTodosNumpy(px[i], py[i])
+        distancias = indice.acumulada[tramos] + fracciones * vista(indice.tramos.distancia)[tramos]
+        return Emparejamiento(distancias, tramos, separaciones, vista(indice.tramos.sector)[tramos])
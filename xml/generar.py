@@ -0,0 +1,304 @@
+# generar.py
+# -*- coding: utf-8 -*-
+""""
+Punto de entrada único: carga el circuito una sola vez y genera en
+paralelo las salidas pedidas (KML, SVG, HTML...). Cada generador se
+importa sólo si se pide su formato. En modo vigilancia se queda
+esperando cambios en el XML y regenera sólo las salidas afectadas
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from importlib import import_module
+
+def _kml(modulo, circuito, ruta):
+    coordenadas = modulo.fragmentosCoordenadas(circuito.origen, [circuito.tramos])
+    modulo.escribirKML(circuito, coordenadas, ruta)
+
+def _kmz(modulo, circuito, ruta):
+    modulo.escribirKMZ(circuito, circuito.tramos, ruta)
+
+def _geojson(modulo, circuito, ruta):
+    modulo.escribirGeoJSON(circuito, [circuito.tramos], [circuito.tramos], ruta)
+
+def _topojson(modulo, circuito, ruta):
+    modulo.escribirTopoJSON(circuito, [circuito.tramos], [circuito.tramos], ruta)
+
+def _altimetria(modulo, circuito, ruta, compacto=False):
+    modulo.crearSVG(circuito, [circuito.tramos], [circuito.tramos], compacto=compacto).escribir(ruta)
+
+def _planta(modulo, circuito, ruta, compacto=False):
+    modulo.crearPlanta(circuito, [circuito.tramos], [circuito.tramos], compacto=compacto).escribir(ruta)
+
+def _html(modulo, circuito, ruta):
+    recursos = modulo.recursosHTML(ruta, circuito.fotos)
+    for aviso in recursos.avisos():
+        print(aviso)
+    html = modulo.Html()
+    html.escribirFlujo(ruta, modulo.fragmentosHTML(circuito, html, None, recursos.imagenes))
+
+# formato: (nombre del archivo de salida, módulo del generador, función
+# que escribe la salida con el módulo y el circuito ya cargados)
+FORMATOS = {
+    'kml': ("circuito.kml", 'xml2kml', _kml),
+    'kmz': ("circuito.kmz", 'xml2kml', _kmz),
+    'geojson': ("circuito.geojson", 'xml2geojson', _geojson),
+    'topojson': ("circuito.topojson", 'xml2geojson', _topojson),
+    'altimetria': ("altimetria.svg", 'xml2altimetria', _altimetria),
+    'planta': ("planta.svg", 'xml2planta', _planta),
+    'html': ("InfoCircuito.html", 'xml2html', _html),
+}
+
+# Los tres entregables de siempre
+POR_DEFECTO = ('kml', 'altimetria', 'html')
+
+# Formatos SVG con versión compacta para la web
+COMPACTOS = ('altimetria', 'planta')
+
+def generarSalida(formato, circuito, ruta, compacto=False):
+    """
+    Importa el generador del formato y escribe su salida. Se escribe en
+    un archivo temporal que sustituye al anterior de forma atómica, así
+    que nunca se ve un archivo a medio escribir. compacto pide la versión
+    reducida de los formatos SVG. Devuelve los segundos empleados
+    """
+    inicio = time.perf_counter()
+    _, modulo, escribir = FORMATOS[formato]
+    directorio, nombre = os.path.split(ruta)
+    temporal = os.path.join(directorio, f".{nombre}.tmp")
+    try:
+        if formato in COMPACTOS:
+            escribir(import_module(modulo), circuito, temporal, compacto)
+        else:
+            escribir(import_module(modulo), circuito, temporal)
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return time.perf_counter() - inicio
+
+def generarSalidas(circuito, salida, formatos=POR_DEFECTO, hilos=None, compacto=False):
+    """
+    Genera los formatos indicados en el directorio de salida, cada uno en
+    un hilo: mientras un generador escribe en su archivo, otro compone su
+    texto. Devuelve {formato: (ruta, segundos o excepción)}
+    """
+    os.makedirs(salida, exist_ok=True)
+    resultados = {}
+    with ThreadPoolExecutor(max_workers=hilos or len(formatos)) as ejecutor:
+        futuros = {}
+        for formato in formatos:
+            ruta = os.path.join(salida, FORMATOS[formato][0])
+            futuros[ejecutor.submit(generarSalida, formato, circuito, ruta, compacto)] = (formato, ruta)
+        for futuro in as_completed(futuros):
+            formato, ruta = futuros[futuro]
+            try:
+                resultados[formato] = (ruta, futuro.result())
+            except Exception as e:
+                resultados[formato] = (ruta, e)
+    return resultados
+
+def cargar(archivoXML, cache=True, validar=False):
+    """
+    Carga el circuito de la caché binaria o, sin cache, del XML. Con
+    validar se lee el XML validándolo con circuito.xsd en la misma pasada
+    """
+    if validar:
+        from validacion import cargarCircuitoValidado
+        return cargarCircuitoValidado(archivoXML)
+    if cache:
+        from cache import cargarCircuitoCache
+        return cargarCircuitoCache(archivoXML)
+    from modelo import cargarCircuito
+    return cargarCircuito(archivoXML)
+
+def leer(archivoXML, validar=False, previo=None):
+    """
+    Lee el XML en una sola pasada que da a la vez el circuito, la huella
+    del archivo y la de cada sección. previo es el lector de la lectura
+    anterior: si <tramos> no cambió se conservan sus columnas. Devuelve
+    el lector
+    """
+    if validar:
+        from validacion import leerCircuitoValidado
+        lector = leerCircuitoValidado(archivoXML, huellas=True)
+    else:
+        from modelo import leerCircuito
+        lector = leerCircuito(archivoXML, huellas=True)
+    if previo is not None and previo.huellas['tramos'] == lector.huellas['tramos']:
+        lector.circuito.tramos = previo.circuito.tramos
+    return lector
+
+def construir(archivoXML, salida, formatos=POR_DEFECTO, hilos=None, forzar=False,
+              validar=False, compacto=False, previo=None):
+    """
+    Regenera sólo las salidas cuyas secciones del XML o cuyo código
+    cambiaron según el manifiesto del directorio de salida. El XML se lee
+    una vez: la misma pasada carga el circuito y calcula las huellas que
+    compara el manifiesto. previo es el lector de la construcción
+    anterior. Devuelve (lo mismo que generarSalidas, sólo con las salidas
+    regeneradas; el lector)
+    """
+    from manifiesto import Manifiesto
+    os.makedirs(salida, exist_ok=True)
+    rutas = {formato: os.path.join(salida, FORMATOS[formato][0]) for formato in formatos}
+    lector = leer(archivoXML, validar, previo)
+    # Cambiar entre la versión normal y la compacta también regenera
+    variantes = {formato: "compacto" for formato in COMPACTOS} if compacto else {}
+    if 'html' in rutas:
+        # Y cambiar una imagen regenera el HTML
+        from recursos import recursosHTML
+        variantes['html'] = recursosHTML(rutas['html'], lector.circuito.fotos).firma()
+    manifiesto = Manifiesto(salida, variantes)
+    pendientes = manifiesto.pendientes(archivoXML, rutas, forzar, lector.huellas, lector.huellaArchivo)
+    resultados = {}
+    if pendientes:
+        resultados = generarSalidas(lector.circuito, salida, tuple(pendientes), hilos, compacto)
+        for formato, (_, resultado) in resultados.items():
+            if not isinstance(resultado, Exception):
+                manifiesto.registrar(formato, pendientes[formato])
+    manifiesto.guardar()
+    return resultados, lector
+
+def informar(resultados, formatos):
+    """
+    Muestra el resultado de cada salida en el orden de formatos y
+    devuelve el número de errores
+    """
+    errores = 0
+    for formato in formatos:
+        if formato not in resultados:
+            continue
+        ruta, resultado = resultados[formato]
+        if isinstance(resultado, Exception):
+            errores += 1
+            print(f"[ERROR] {ruta}: Error inesperado: {resultado}")
+        else:
+            print(f"[OK] {ruta} ({resultado:.2f} s)")
+    return errores
+
+def mostrarErrores(error):
+    """
+    Muestra los errores de validación con su línea
+    """
+    for linea, mensaje in error.errores:
+        print(f"{error.archivoXML}:{linea}: {mensaje}")
+
+def _firma(archivoXML):
+    """
+    (mtime, tamaño) del archivo, o None si no existe en este momento
+    """
+    try:
+        estado = os.stat(archivoXML)
+    except FileNotFoundError:
+        return None
+    return estado.st_mtime_ns, estado.st_size
+
+def mostrarFallo(archivoXML, error):
+    """
+    Muestra por qué no se pudo construir, con el mismo texto que los main
+    """
+    import xml.etree.ElementTree as ET
+    from validacion import ErrorValidacion
+    if isinstance(error, ErrorValidacion):
+        mostrarErrores(error)
+    elif isinstance(error, FileNotFoundError):
+        print(f"Error: No se encontró el archivo {archivoXML}")
+    elif isinstance(error, ET.ParseError):
+        print(f"Error al parsear el archivo XML: {error}")
+    else:
+        print(f"[ERROR] {archivoXML}: Error inesperado: {error}")
+
+def vigilar(archivoXML, salida, formatos=POR_DEFECTO, hilos=None, intervalo=0.5,
+            validar=False, compacto=False):
+    """
+    Comprueba el XML cada intervalo segundos y, cuando cambia y deja de
+    cambiar (el editor terminó de guardarlo), regenera las salidas
+    afectadas. Cada cambio se lee una sola vez y el circuito anterior se
+    queda en memoria para reutilizar sus tramos si no cambiaron. Si la
+    construcción falla (un XML mal formado o a medio editar, uno que no
+    cumple el esquema si se valida, un error al escribir) se avisa una
+    vez y se reintenta en cada comprobación hasta que salga bien. Termina
+    con Ctrl+C
+    """
+    # firma: versión del archivo ya construida; intento: última intentada
+    firma = intento = None
+    previo = None
+    while True:
+        actual = _firma(archivoXML)
+        if actual is not None and actual != firma:
+            time.sleep(intervalo)
+            if _firma(archivoXML) != actual:
+                continue
+            nueva = actual != intento
+            intento = actual
+            if nueva:
+                print(time.strftime("%H:%M:%S"), f"cambios en {archivoXML}")
+            try:
+                resultados, previo = construir(archivoXML, salida, formatos, hilos, validar=validar,
+                                               compacto=compacto, previo=previo)
+            except Exception as e:
+                if nueva:
+                    mostrarFallo(archivoXML, e)
+            else:
+                firma = actual
+                if not resultados:
+                    print("Sin salidas afectadas")
+                informar(resultados, formatos)
+        time.sleep(intervalo)
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera KML, SVG y HTML de un circuito leyéndolo una sola vez")
+    parser.add_argument("xml", nargs="?", default="circuitoEsquema.xml", help="XML del circuito")
+    parser.add_argument("-o", "--salida", default=".", help="directorio de salida (por defecto, el actual)")
+    parser.add_argument("-f", "--formato", action="append", choices=sorted(FORMATOS),
+                        help="formato a generar; se puede repetir (por defecto, kml, altimetria y html)")
+    parser.add_argument("-j", "--hilos", type=int, help="hilos de generación (por defecto, uno por formato)")
+    parser.add_argument("--sin-cache", action="store_true", help="lee el XML sin usar la caché binaria de tramos")
+    parser.add_argument("-v", "--validar", action="store_true",
+                        help="valida el XML con circuito.xsd al leerlo, en la misma pasada")
+    parser.add_argument("-c", "--compacto", action="store_true",
+                        help="versión reducida para la web de altimetria y planta")
+    parser.add_argument("-w", "--vigilar", action="store_true",
+                        help="se queda vigilando el XML y regenera sólo las salidas afectadas")
+    parser.add_argument("-i", "--intervalo", type=float, default=0.5,
+                        help="segundos entre comprobaciones en modo vigilancia")
+    argumentos = parser.parse_args()
+
+    # El modelo y el lector se importan aquí: --help no los necesita
+    import xml.etree.ElementTree as ET
+    from instrumentacion import perfil
+    from validacion import ErrorValidacion
+
+    formatos = tuple(dict.fromkeys(argumentos.formato or POR_DEFECTO))
+    if argumentos.vigilar:
+        try:
+            vigilar(argumentos.xml, argumentos.salida, formatos, argumentos.hilos,
+                    argumentos.intervalo, argumentos.validar, argumentos.compacto)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    try:
+        with perfil.etapa('carga'):
+            circuito = cargar(argumentos.xml, not argumentos.sin_cache, argumentos.validar)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {argumentos.xml}")
+        return 1
+    except ET.ParseError as e:
+        print(f"Error al parsear el archivo XML: {e}")
+        return 1
+    except ErrorValidacion as e:
+        mostrarErrores(e)
+        return 1
+
+    errores = informar(generarSalidas(circuito, argumentos.salida, formatos, argumentos.hilos,
+                                      argumentos.compacto), formatos)
+    perfil.emitir("generar")
+    return 1 if errores else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
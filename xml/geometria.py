@@ -0,0 +1,235 @@
+# geometria.py
+# -*- coding: utf-8 -*-
+""""
+Métricas geodésicas de los tramos calculadas a partir de las coordenadas:
+longitud por haversine para validar <distancia>, pendiente, rumbo, giro y
+curvatura de cada tramo y desnivel acumulado por sector
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import argparse
+import math
+import xml.etree.ElementTree as ET
+from array import array
+
+from instrumentacion import perfil
+from modelo import cargarCircuito, vista
+from simplificacion import RADIO_TIERRA
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def haversine(lon1, lat1, lon2, lat2):
+    """
+    Distancia en metros sobre la esfera entre dos puntos en grados. Con
+    NumPy acepta también columnas de puntos
+    """
+    if np is not None:
+        lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * RADIO_TIERRA * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIO_TIERRA * math.asin(math.sqrt(min(a, 1.0)))
+
+def rumbo(lon1, lat1, lon2, lat2):
+    """
+    Rumbo inicial en grados [0, 360) del primer punto al segundo. Con
+    NumPy acepta también columnas de puntos
+    """
+    if np is not None:
+        lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+        y = np.sin(lon2 - lon1) * np.cos(lat2)
+        x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(lon2 - lon1)
+        return np.mod(np.degrees(np.arctan2(y, x)), 360.0)
+    lon1, lat1, lon2, lat2 = map(math.radians, (lon1, lat1, lon2, lat2))
+    y = math.sin(lon2 - lon1) * math.cos(lat2)
+    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(lon2 - lon1)
+    return math.degrees(math.atan2(y, x)) % 360.0
+
+class MetricasTramos(object):
+    """
+    Métricas de cada tramo en columnas, calculadas por bloques de
+    ColumnasTramos en orden. El tramo i va del final del tramo anterior
+    (el origen para el primero) a sus coordenadas. Un tramo es sospechoso
+    si su <distancia> se aparta de la calculada más que la tolerancia
+    relativa y que la absoluta (en metros)
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, origen, toleranciaRelativa=0.1, toleranciaAbsoluta=5.0):
+        """
+        Crea las columnas vacías, empezando en el origen del circuito
+        """
+        self.toleranciaRelativa = toleranciaRelativa
+        self.toleranciaAbsoluta = toleranciaAbsoluta
+        self.calculada = array('d')
+        self.declarada = array('d')
+        self.pendiente = array('d')
+        self.rumbo = array('d')
+        self.giro = array('d')
+        self.curvatura = array('d')
+        self.sospechosos = array('l')
+        self.desnivel = {}
+        self._previo = (origen.longitud, origen.latitud, origen.altitud)
+        self._rumbo = None
+
+    def __len__(self):
+        return len(self.calculada)
+
+    @property
+    def ascenso(self):
+        return sum(subida for subida, _ in self.desnivel.values())
+
+    @property
+    def descenso(self):
+        return sum(bajada for _, bajada in self.desnivel.values())
+
+    def procesar(self, bloque):
+        """
+        Calcula las métricas de un bloque de ColumnasTramos
+        """
+        if not len(bloque):
+            return
+        inicio = perfil.reloj()
+        if np is not None:
+            self._procesarNumpy(bloque)
+        else:
+            self._procesarPython(bloque)
+        self._previo = (bloque.longitud[-1], bloque.latitud[-1], bloque.altitud[-1])
+        perfil.acumular('geometria', inicio, len(bloque))
+
+    def _procesarNumpy(self, bloque):
+        lon0, lat0, alt0 = self._previo
+        lons, lats, alts = vista(bloque.longitud), vista(bloque.latitud), vista(bloque.altitud)
+        declarada, sectores = vista(bloque.distancia), vista(bloque.sector)
+        plons = np.concatenate(([lon0], lons[:-1]))
+        plats = np.concatenate(([lat0], lats[:-1]))
+        desniveles = np.diff(alts, prepend=alt0)
+        calculada = haversine(plons, plats, lons, lats)
+        pendiente = np.divide(desniveles, calculada, out=np.zeros_like(calculada), where=calculada > 0) * 100
+
+        # Los tramos sin longitud mantienen el rumbo del anterior
+        rumbos = rumbo(plons, plats, lons, lats)
+        validos = calculada > 0
+        previo = self._rumbo if self._rumbo is not None else (rumbos[validos][0] if validos.any() else 0.0)
+        ultimo = np.maximum.accumulate(np.where(validos, np.arange(len(rumbos)), -1))
+        rumbos = np.where(ultimo >= 0, rumbos[np.maximum(ultimo, 0)], previo)
+        giros = np.mod(np.diff(rumbos, prepend=previo) + 180.0, 360.0) - 180.0
+        curvatura = np.divide(np.radians(giros), calculada, out=np.zeros_like(calculada), where=validos)
+        self._rumbo = float(rumbos[-1])
+
+        desviacion = np.abs(declarada - calculada)
+        sospechosos = np.flatnonzero((desviacion > self.toleranciaRelativa * calculada)
+                                     & (desviacion > self.toleranciaAbsoluta)) + len(self)
+        for sector in np.unique(sectores).tolist():
+            mascara = sectores == sector
+            subida = float(desniveles[mascara & (desniveles > 0)].sum())
+            bajada = float(-desniveles[mascara & (desniveles < 0)].sum())
+            acumulado = self.desnivel.setdefault(sector, [0.0, 0.0])
+            acumulado[0] += subida
+            acumulado[1] += bajada
+
+        self.sospechosos.extend(sospechosos.tolist())
+        for columna, valores in ((self.calculada, calculada), (self.declarada, declarada),
+                                 (self.pendiente, pendiente), (self.rumbo, rumbos),
+                                 (self.giro, giros), (self.curvatura, curvatura)):
+            columna.frombytes(np.ascontiguousarray(valores, dtype=np.float64).tobytes())
+
+    def _procesarPython(self, bloque):
+        lon0, lat0, alt0 = self._previo
+        calculadas, rumbos = [], []
+        for i in range(len(bloque)):
+            lon, lat = bloque.longitud[i], bloque.latitud[i]
+            calculada = haversine(lon0, lat0, lon, lat)
+            calculadas.append(calculada)
+            rumbos.append(rumbo(lon0, lat0, lon, lat) if calculada > 0 else None)
+            lon0, lat0 = lon, lat
+        # Los tramos sin longitud mantienen el rumbo del anterior; al
+        # principio, el del primer tramo con longitud, como con NumPy
+        previo = self._rumbo
+        if previo is None:
+            previo = next((r for r in rumbos if r is not None), 0.0)
+        alt0 = self._previo[2]
+        for i, calculada in enumerate(calculadas):
+            alt = bloque.altitud[i]
+            declarada = bloque.distancia[i]
+            desnivel = alt - alt0
+            actual = rumbos[i] if rumbos[i] is not None else previo
+            giro = (actual - previo + 180.0) % 360.0 - 180.0
+            previo = actual
+            desviacion = abs(declarada - calculada)
+            if (desviacion > self.toleranciaRelativa * calculada
+                    and desviacion > self.toleranciaAbsoluta):
+                self.sospechosos.append(len(self))
+            acumulado = self.desnivel.setdefault(bloque.sector[i], [0.0, 0.0])
+            if desnivel > 0:
+                acumulado[0] += desnivel
+            else:
+                acumulado[1] -= desnivel
+            self.calculada.append(calculada)
+            self.declarada.append(declarada)
+            self.pendiente.append(desnivel / calculada * 100 if calculada > 0 else 0.0)
+            self.rumbo.append(actual)
+            self.giro.append(giro)
+            self.curvatura.append(math.radians(giro) / calculada if calculada > 0 else 0.0)
+            alt0 = alt
+        self._rumbo = previo
+
+    def informe(self):
+        """
+        Líneas de texto con la validación de las distancias y el desnivel
+        """
+        lineas = [f"Distancia declarada: {sum(self.declarada):.1f} m - "
+                  f"calculada: {sum(self.calculada):.1f} m",
+                  f"Tramos con distancia sospechosa: {len(self.sospechosos)} de {len(self)}"]
+        for i in self.sospechosos[:20]:
+            lineas.append(f"    Tramo {i + 1}: declarada {self.declarada[i]:.1f} m, "
+                          f"calculada {self.calculada[i]:.1f} m")
+        if len(self.sospechosos) > 20:
+            lineas.append(f"    ... y {len(self.sospechosos) - 20} más")
+        if len(self):
+            lineas.append(f"Pendiente máxima: {max(self.pendiente):.1f} % - "
+                          f"mínima: {min(self.pendiente):.1f} %")
+        for sector, (subida, bajada) in sorted(self.desnivel.items()):
+            lineas.append(f"Sector {sector}: +{subida:.1f} m / -{bajada:.1f} m")
+        lineas.append(f"Desnivel total: +{self.ascenso:.1f} m / -{self.descenso:.1f} m")
+        return lineas
+
+def calcularMetricas(circuito, bloques=None, toleranciaRelativa=0.1, toleranciaAbsoluta=5.0):
+    """
+    Métricas de los tramos del circuito, o de los bloques indicados si
+    los tramos se leen en flujo
+    """
+    metricas = MetricasTramos(circuito.origen, toleranciaRelativa, toleranciaAbsoluta)
+    for bloque in (bloques if bloques is not None else [circuito.tramos]):
+        metricas.procesar(bloque)
+    return metricas
+
+def main():
+    parser = argparse.ArgumentParser(description="Valida las distancias de los tramos y calcula su geometría")
+    parser.add_argument("xml", nargs="?", default="circuitoEsquema.xml", help="XML del circuito")
+    parser.add_argument("-r", "--relativa", type=float, default=0.1,
+                        help="desviación relativa admitida de <distancia>")
+    parser.add_argument("-a", "--absoluta", type=float, default=5.0,
+                        help="desviación admitida de <distancia> en metros")
+    argumentos = parser.parse_args()
+
+    try:
+        circuito = cargarCircuito(argumentos.xml)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {argumentos.xml}")
+        return 1
+    except ET.ParseError as e:
+        print(f"Error al parsear el archivo XML: {e}")
+        return 1
+
+    metricas = calcularMetricas(circuito, None, argumentos.relativa, argumentos.absoluta)
+    print("\n".join(metricas.informe()))
+    perfil.emitir("geometria")
+    return 1 if len(metricas.sospechosos) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+# indice.py
+# -*- coding: utf-8 -*-
+""""
+Índice de distancia acumulada sobre los tramos del circuito: posición,
+altitud y sector a una distancia dada y distancia de un punto del trazado,
+con búsqueda binaria y consultas por lotes
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import math
+from array import array
+from bisect import bisect_right
+
+from modelo import vista
+from simplificacion import RADIO_TIERRA, proyectarMetros
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class IndiceDistancias(object):
+    """
+    Sumas prefijas de la distancia de los tramos. El vértice 0 es el
+    origen y el tramo i va del vértice i al i + 1, con acumulada[i] la
+    distancia recorrida al empezarlo. Las distancias fuera de [0, total]
+    se ajustan a los extremos del trazado
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, circuito):
+        """
+        Construye el índice a partir de un circuito con sus tramos en columnas
+        """
+        tramos = circuito.tramos
+        if not len(tramos):
+            raise ValueError("El circuito no tiene tramos")
+        origen = circuito.origen
+        self.tramos = tramos
+        self.acumulada = self._columna(tramos.distanciaAcumulada(), 0.0)
+        self.longitudes = self._columna(tramos.longitud, origen.longitud)
+        self.latitudes = self._columna(tramos.latitud, origen.latitud)
+        self.altitudes = self._columna(tramos.altitud, origen.altitud)
+        self.total = float(self.acumulada[-1])
+        self._plano = None
+
+    @staticmethod
+    def _columna(valores, inicial):
+        """
+        Columna de vértices: el valor inicial seguido de los de los tramos
+        """
+        if np is not None:
+            return np.concatenate(([inicial], np.asarray(valores, dtype=np.float64)))
+        columna = array('d', [inicial])
+        columna.extend(valores)
+        return columna
+
+    def __len__(self):
+        return len(self.tramos)
+
+    def tramoEn(self, distancia):
+        """
+        Índice del tramo que contiene la distancia indicada
+        """
+        i = bisect_right(self.acumulada, distancia) - 1
+        return min(max(i, 0), len(self) - 1)
+
+    def _fraccion(self, i, distancia):
+        """
+        Fracción recorrida del tramo i a la distancia indicada
+        """
+        longitud = self.tramos.distancia[i]
+        if longitud <= 0:
+            return 0.0
+        return min(max((distancia - self.acumulada[i]) / longitud, 0.0), 1.0)
+
+    def posicion(self, distancia):
+        """
+        (longitud, latitud, altitud) interpolada a la distancia indicada
+        """
+        i = self.tramoEn(distancia)
+        t = self._fraccion(i, distancia)
+        return tuple(float(c[i] + t * (c[i + 1] - c[i]))
+                     for c in (self.longitudes, self.latitudes, self.altitudes))
+
+    def sector(self, distancia):
+        """
+        Sector del tramo que contiene la distancia indicada
+        """
+        return self.tramos.sector[self.tramoEn(distancia)]
+
+    def tramosEn(self, distancias):
+        """
+        Índices de los tramos que contienen cada distancia
+        """
+        if np is not None:
+            indices = np.searchsorted(self.acumulada, np.asarray(distancias, dtype=np.float64), side='right') - 1
+            return np.clip(indices, 0, len(self) - 1)
+        return array('l', [self.tramoEn(d) for d in distancias])
+
+    def posiciones(self, distancias):
+        """
+        Columnas (longitudes, latitudes, altitudes) interpoladas a cada distancia
+        """
+        if np is None:
+            puntos = [self.posicion(d) for d in distancias]
+            return tuple(array('d', [p[k] for p in puntos]) for k in range(3))
+        distancias = np.asarray(distancias, dtype=np.float64)
+        indices = self.tramosEn(distancias)
+        longitudes = vista(self.tramos.distancia)[indices]
+        t = np.divide(distancias - self.acumulada[indices], longitudes,
+                      out=np.zeros_like(distancias), where=longitudes > 0)
+        t = np.clip(t, 0.0, 1.0)
+        return tuple(c[indices] + t * (c[indices + 1] - c[indices])
+                     for c in (self.longitudes, self.latitudes, self.altitudes))
+
+    def sectores(self, distancias):
+        """
+        Sector del tramo que contiene cada distancia
+        """
+        indices = self.tramosEn(distancias)
+        if np is not None:
+            return vista(self.tramos.sector)[indices]
+        return array('i', [self.tramos.sector[i] for i in indices])
+
+    def plano(self):
+        """
+        Vértices (xs, ys) en metros, centrados en el origen del circuito
+        """
+        if self._plano is None:
+            self._plano = proyectarMetros(self.longitudes, self.latitudes)
+        return self._plano
+
+    def proyectar(self, longitud, latitud):
+        """
+        Punto en la misma proyección en metros que los vértices. Con NumPy
+        acepta también columnas de puntos
+        """
+        coseno = math.cos(math.radians(self.latitudes[0]))
+        if np is not None:
+            return (np.radians(np.subtract(longitud, self.longitudes[0])) * coseno * RADIO_TIERRA,
+                    np.radians(np.subtract(latitud, self.latitudes[0])) * RADIO_TIERRA)
+        return (math.radians(longitud - self.longitudes[0]) * coseno * RADIO_TIERRA,
+                math.radians(latitud - self.latitudes[0]) * RADIO_TIERRA)
+
+    def distanciaEnPunto(self, longitud, latitud):
+        """
+        Proyecta el punto sobre el tramo más cercano. Devuelve
+        (distancia recorrida, índice del tramo, separación en metros)
+        """
+        xs, ys = self.plano()
+        px, py = self.proyectar(longitud, latitud)
+        if np is not None:
+            ax, ay, dx, dy = xs[:-1], ys[:-1], np.diff(xs), np.diff(ys)
+            longitud2 = dx * dx + dy * dy
+            t = np.divide((px - ax) * dx + (py - ay) * dy, longitud2,
+                          out=np.zeros_like(longitud2), where=longitud2 > 0)
+            t = np.clip(t, 0.0, 1.0)
+            separaciones = np.hypot(ax + t * dx - px, ay + t * dy - py)
+            i = int(np.argmin(separaciones))
+            t, separacion = float(t[i]), float(separaciones[i])
+        else:
+            i, t, separacion = 0, 0.0, math.inf
+            for j in range(len(self)):
+                dx = xs[j + 1] - xs[j]
+                dy = ys[j + 1] - ys[j]
+                longitud2 = dx * dx + dy * dy
+                f = 0.0
+                if longitud2 > 0:
+                    f = min(max(((px - xs[j]) * dx + (py - ys[j]) * dy) / longitud2, 0.0), 1.0)
+                s = math.hypot(xs[j] + f * dx - px, ys[j] + f * dy - py)
+                if s < separacion:
+                    i, t, separacion = j, f, s
+        return float(self.acumulada[i] + t * self.tramos.distancia[i]), i, separacion
@@ -0,0 +1,166 @@
+# instrumentacion.py
+# -*- coding: utf-8 -*-
+""""
+Instrumentación opcional de los generadores: tiempo por etapa, picos de
+memoria con tracemalloc y contadores de elementos. Se activa con la
+variable de entorno CIRCUITO_PERFIL (stderr, json o ruta a un .json) y
+CIRCUITO_PERFIL_MEMORIA=1; desactivada sólo cuesta llamadas vacías
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+_NULO = nullcontext()
+
+class _Etapa(object):
+    """
+    Gestor de contexto que mide un tramo de una etapa
+    """
+    __slots__ = ('perfil', 'nombre', 'inicio')
+
+    def __init__(self, perfil, nombre):
+        self.perfil = perfil
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = self.perfil.reloj()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.perfil.acumular(self.nombre, self.inicio)
+
+class Instrumentacion(object):
+    """
+    Acumula, por etapa, segundos, llamadas, elementos procesados y pico
+    de memoria. Las etapas no se anidan: en los generadores en flujo se
+    alternan lectura, construcción de cadenas y escritura
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self):
+        """
+        Crea la instrumentación desactivada
+        """
+        self.activa = False
+        self.memoria = False
+        self.destino = "stderr"
+        self.reiniciar()
+
+    def reiniciar(self):
+        """
+        Borra las medidas acumuladas
+        """
+        self.etapas = {}
+        self.contadores = {}
+        self.inicio = time.perf_counter()
+
+    def activar(self, memoria=False, destino="stderr"):
+        """
+        Activa la instrumentación. destino es "stderr" (texto), "json"
+        (JSON por stderr) o la ruta de un archivo JSON
+        """
+        self.activa = True
+        self.memoria = memoria
+        self.destino = destino
+        self.reiniciar()
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def desactivar(self):
+        """
+        Desactiva la instrumentación y tracemalloc si se activó aquí
+        """
+        if self.memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.activa = False
+        self.memoria = False
+
+    def reloj(self):
+        """
+        Marca de inicio de un tramo de etapa (0 si está desactivada)
+        """
+        if not self.activa:
+            return 0
+        if self.memoria:
+            tracemalloc.reset_peak()
+        return time.perf_counter()
+
+    def acumular(self, nombre, inicio, elementos=0):
+        """
+        Suma a la etapa el tiempo desde inicio y los elementos procesados
+        """
+        if not self.activa:
+            return
+        segundos = time.perf_counter() - inicio
+        etapa = self.etapas.get(nombre)
+        if etapa is None:
+            etapa = self.etapas[nombre] = {'segundos': 0.0, 'llamadas': 0, 'elementos': 0}
+        etapa['segundos'] += segundos
+        etapa['llamadas'] += 1
+        etapa['elementos'] += elementos
+        if self.memoria:
+            pico = tracemalloc.get_traced_memory()[1]
+            etapa['pico_bytes'] = max(etapa.get('pico_bytes', 0), pico)
+
+    def etapa(self, nombre):
+        """
+        Gestor de contexto para medir un bloque de código como etapa
+        """
+        if not self.activa:
+            return _NULO
+        return _Etapa(self, nombre)
+
+    def contar(self, nombre, cantidad=1):
+        """
+        Suma cantidad al contador indicado
+        """
+        if self.activa:
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def informe(self):
+        """
+        Diccionario con las medidas acumuladas
+        """
+        return {
+            'segundos_total': time.perf_counter() - self.inicio,
+            'etapas': self.etapas,
+            'contadores': self.contadores,
+        }
+
+    def emitir(self, titulo=None):
+        """
+        Emite el informe en el destino configurado, si está activa
+        """
+        if not self.activa:
+            return
+        informe = self.informe()
+        if titulo:
+            informe['generador'] = titulo
+        if self.destino == "stderr":
+            print(f"Perfil {titulo or ''}: {informe['segundos_total']:.4f} s", file=sys.stderr)
+            for nombre, etapa in sorted(self.etapas.items(), key=lambda e: -e[1]['segundos']):
+                linea = (f"  {nombre:<12} {etapa['segundos']:.4f} s  "
+                         f"{etapa['llamadas']} llamadas  {etapa['elementos']} elementos")
+                if 'pico_bytes' in etapa:
+                    linea += f"  pico {etapa['pico_bytes'] / 2**20:.2f} MiB"
+                print(linea, file=sys.stderr)
+            for nombre, cantidad in sorted(self.contadores.items()):
+                print(f"  #{nombre:<11} {cantidad}", file=sys.stderr)
+        elif self.destino == "json":
+            print(json.dumps(informe), file=sys.stderr)
+        else:
+            with open(self.destino, 'w', encoding='utf-8') as archivo:
+                json.dump(informe, archivo, indent=2)
+
+# Instancia compartida por los generadores
+perfil = Instrumentacion()
+
+if os.environ.get('CIRCUITO_PERFIL'):
+    _destino = os.environ['CIRCUITO_PERFIL']
+    perfil.activar(memoria=os.environ.get('CIRCUITO_PERFIL_MEMORIA') == '1',
+                   destino="stderr" if _destino == "1" else _destino)
@@ -0,0 +1,166 @@
+# lote.py
+# -*- coding: utf-8 -*-
+""""
+Genera KML, GeoJSON, TopoJSON, perfil altimétrico SVG, planta SVG,
+InfoCircuito HTML y, si se pide, KMZ para varios
+circuitos en paralelo con un conjunto de procesos
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from archivos import buscarCircuitos, describirError
+from manifiesto import Manifiesto
+from modelo import LectorCircuito
+from recursos import recursosHTML
+from xml2altimetria import generarAltimetria
+from xml2geojson import generarGeoJSON, generarTopoJSON
+from xml2html import generarHTML
+from xml2kml import generarKML, generarKMZ
+from xml2planta import generarPlanta
+
+# (clave, nombre del archivo de salida, función que lo genera)
+SALIDAS = (
+    ('kml', "circuito.kml", generarKML),
+    ('kmz', "circuito.kmz", generarKMZ),
+    ('geojson', "circuito.geojson", generarGeoJSON),
+    ('topojson', "circuito.topojson", generarTopoJSON),
+    ('altimetria', "altimetria.svg", generarAltimetria),
+    ('planta', "planta.svg", generarPlanta),
+    ('html', "InfoCircuito.html", generarHTML),
+)
+
+# Salidas que sólo se generan si se piden, como en xml2kml
+OPCIONALES = ('kmz',)
+
+class ResultadoCircuito(object):
+    """
+    Resultado de construir las salidas de un circuito
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, archivoXML):
+        """
+        Crea un resultado vacío para el archivo indicado
+        """
+        self.archivoXML = archivoXML
+        self.generados = []
+        self.omitidos = []
+        self.errores = {}
+        self.segundos = 0.0
+
+    @property
+    def correcto(self):
+        return not self.errores
+
+def directorioSalida(archivoXML, salida=None):
+    """
+    Directorio de salida de un circuito: <salida>/<nombre del XML>. salida
+    es la raíz del sitio: el HTML enlaza las imágenes y estilos con ../
+    y las busca allí. Por defecto es el directorio padre del de los XML,
+    la raíz del sitio cuando los XML están en su carpeta xml/
+    """
+    if salida is None:
+        salida = os.path.dirname(os.path.dirname(os.path.abspath(archivoXML)))
+    return os.path.join(salida, os.path.splitext(os.path.basename(archivoXML))[0])
+
+def construirCircuito(archivoXML, directorio, incremental=True, cache=True, kmz=False):
+    """
+    Genera las salidas de un circuito. Un error en una salida no impide
+    generar las demás y queda registrado en el resultado. En modo
+    incremental sólo se regeneran las salidas cuyas dependencias cambiaron.
+    Con cache las salidas leen el circuito de la caché binaria junto al XML.
+    El KMZ teselado sólo se genera con kmz
+    """
+    resultado = ResultadoCircuito(archivoXML)
+    inicio = time.perf_counter()
+    salidas = [salida for salida in SALIDAS if salida[0] not in OPCIONALES or kmz]
+    rutas = {clave: os.path.join(directorio, nombre) for clave, nombre, generar in salidas}
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        # Las fotos están antes de <tramos>: basta con leer la cabecera
+        fotos = LectorCircuito(archivoXML).circuito.fotos
+        manifiesto = Manifiesto(directorio, {'html': recursosHTML(rutas['html'], fotos).firma()})
+        pendientes = manifiesto.pendientes(archivoXML, rutas, forzar=not incremental)
+    except Exception as e:
+        resultado.errores['manifiesto'] = describirError(e, archivoXML)
+        resultado.segundos = time.perf_counter() - inicio
+        return resultado
+    for clave, nombre, generar in salidas:
+        if clave not in pendientes:
+            resultado.omitidos.append(rutas[clave])
+            continue
+        try:
+            generar(archivoXML, rutas[clave], cache=cache)
+            resultado.generados.append(rutas[clave])
+            manifiesto.registrar(clave, pendientes[clave])
+        except Exception as e:
+            resultado.errores[clave] = describirError(e, archivoXML)
+    try:
+        manifiesto.guardar()
+    except OSError as e:
+        resultado.errores['manifiesto'] = describirError(e, archivoXML)
+    resultado.segundos = time.perf_counter() - inicio
+    return resultado
+
+def construirLote(archivos, salida=None, procesos=None, incremental=True, cache=True, kmz=False):
+    """
+    Construye todos los circuitos repartidos entre procesos. Si un proceso
+    muere, sólo se marca como fallido el circuito que estaba construyendo
+    """
+    resultados = []
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = {ejecutor.submit(construirCircuito, archivo, directorioSalida(archivo, salida), incremental, cache,
+                                   kmz): archivo
+                   for archivo in archivos}
+        for futuro in as_completed(futuros):
+            archivo = futuros[futuro]
+            try:
+                resultados.append(futuro.result())
+            except Exception as e:
+                resultado = ResultadoCircuito(archivo)
+                resultado.errores['proceso'] = describirError(e, archivo)
+                resultados.append(resultado)
+    resultados.sort(key=lambda r: r.archivoXML)
+    return resultados
+
+def resumen(resultados):
+    """
+    Texto con el resultado de cada circuito y los totales del lote
+    """
+    lineas = []
+    for resultado in resultados:
+        estado = "OK" if resultado.correcto else "ERROR"
+        lineas.append(f"[{estado}] {resultado.archivoXML} ({len(resultado.generados)} generados, {len(resultado.omitidos)} sin cambios, {resultado.segundos:.2f} s)")
+        for clave, mensaje in resultado.errores.items():
+            lineas.append(f"    {clave}: {mensaje}")
+    correctos = sum(1 for r in resultados if r.correcto)
+    lineas.append(f"Circuitos: {len(resultados)} - correctos: {correctos} - con errores: {len(resultados) - correctos}")
+    return "\n".join(lineas)
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera KML, SVG y HTML para varios circuitos")
+    parser.add_argument("entrada", help="directorio o patrón glob con los XML de los circuitos")
+    parser.add_argument("-o", "--salida", help="raíz del sitio en la que crear un directorio por circuito "
+                        "(por defecto, el directorio padre del de cada XML)")
+    parser.add_argument("-p", "--procesos", type=int, help="número de procesos (por defecto, uno por CPU)")
+    parser.add_argument("-f", "--forzar", action="store_true", help="regenera todas las salidas aunque no hayan cambiado")
+    parser.add_argument("--sin-cache", action="store_true", help="lee siempre el XML sin usar la caché binaria de tramos")
+    parser.add_argument("-z", "--kmz", action="store_true",
+                        help="genera también circuito.kmz, teselado con niveles de detalle")
+    argumentos = parser.parse_args()
+
+    archivos = buscarCircuitos(argumentos.entrada)
+    if not archivos:
+        print(f"Error: No se encontraron archivos XML en {argumentos.entrada}")
+        return 1
+    resultados = construirLote(archivos, argumentos.salida, argumentos.procesos,
+                               not argumentos.forzar, not argumentos.sin_cache, argumentos.kmz)
+    print(resumen(resultados))
+    return 0 if all(r.correcto for r in resultados) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+# manifiesto.py
+# -*- coding: utf-8 -*-
+""""
+Manifiesto de construcción: huellas de las entradas y dependencias de
+cada salida para no regenerar lo que no ha cambiado
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import hashlib
+import json
+import os
+
+from modelo import LectorCircuito
+
+NOMBRE_MANIFIESTO = ".manifiesto.json"
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Secciones del XML (hijos de <circuito>) y módulos de los que depende cada salida
+DEPENDENCIAS = {
+    'kml': {
+        'secciones': ('nombre', 'localidad', 'pais', 'coordenadasOrigen', 'tramos'),
+        'codigo': ('xml2kml.py', 'modelo.py', 'simplificacion.py', 'cache.py'),
+    },
+    'kmz': {
+        'secciones': ('nombre', 'localidad', 'pais', 'coordenadasOrigen', 'tramos'),
+        'codigo': ('xml2kml.py', 'modelo.py', 'simplificacion.py', 'cache.py'),
+    },
+    'geojson': {
+        'secciones': ('nombre', 'localidad', 'pais', 'coordenadasOrigen', 'tramos'),
+        'codigo': ('xml2geojson.py', 'modelo.py', 'cache.py'),
+    },
+    'topojson': {
+        'secciones': ('nombre', 'localidad', 'pais', 'coordenadasOrigen', 'tramos'),
+        'codigo': ('xml2geojson.py', 'modelo.py', 'cache.py'),
+    },
+    'altimetria': {
+        'secciones': ('nombre', 'localidad', 'coordenadasOrigen', 'tramos'),
+        'codigo': ('xml2altimetria.py', 'geometria.py', 'modelo.py', 'simplificacion.py', 'cache.py'),
+    },
+    'planta': {
+        'secciones': ('nombre', 'localidad', 'coordenadasOrigen', 'tramos'),
+        'codigo': ('xml2planta.py', 'xml2altimetria.py', 'geometria.py', 'modelo.py', 'simplificacion.py',
+                   'cache.py'),
+    },
+    'html': {
+        'secciones': ('nombre', 'longitud', 'anchura', 'fecha', 'horaInicio',
+                      'numeroVueltas', 'localidad', 'pais', 'patrocinadorPrincipal',
+                      'referencias', 'fotos', 'videos', 'coordenadasOrigen', 'tramos',
+                      'vencedor', 'clasificacionMundial'),
+        'codigo': ('xml2html.py', 'recursos.py', 'geometria.py', 'modelo.py', 'cache.py'),
+    },
+}
+
+def huellaArchivo(ruta):
+    """
+    SHA-256 del contenido de un archivo, leído por bloques
+    """
+    huella = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            huella.update(bloque)
+    return huella.hexdigest()
+
+def huellasSecciones(archivoXML):
+    """
+    Huella de cada hijo directo de <circuito>, calculada por el lector
+    en una pasada incremental. La de <tramos> es la de sus columnas
+    """
+    lector = LectorCircuito(archivoXML, huellas=True)
+    for _ in lector.bloques():
+        pass
+    return lector.huellas
+
+def huellaCodigo(modulos):
+    """
+    Huella conjunta de los módulos que generan una salida
+    """
+    huella = hashlib.sha256()
+    for modulo in modulos:
+        huella.update(huellaArchivo(os.path.join(DIRECTORIO, modulo)).encode())
+    return huella.hexdigest()
+
+class Manifiesto(object):
+    """
+    Registro persistente, en JSON, de las huellas con las que se generó
+    cada salida de un directorio
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, directorio, variantes=None):
+        """
+        Carga el manifiesto del directorio, o empieza uno vacío.
+        variantes es {clave: texto} con las opciones de generación de
+        cada salida y la firma de los archivos que lee además del XML
+        (las imágenes del HTML), que cuentan como parte de su código
+        """
+        self.ruta = os.path.join(directorio, NOMBRE_MANIFIESTO)
+        self.datos = {'entrada': None, 'salidas': {}}
+        try:
+            with open(self.ruta, encoding='utf-8') as archivo:
+                self.datos = json.load(archivo)
+        except (FileNotFoundError, ValueError):
+            pass
+        self._secciones = None
+        self._codigo = {}
+        self.variantes = variantes or {}
+
+    def _huellaCodigo(self, clave):
+        """
+        Huella del código de una salida, calculada una vez por manifiesto
+        """
+        if clave not in self._codigo:
+            huella = huellaCodigo(DEPENDENCIAS[clave]['codigo'])
+            if clave in self.variantes:
+                huella = hashlib.sha256(f"{huella}:{self.variantes[clave]}".encode()).hexdigest()
+            self._codigo[clave] = huella
+        return self._codigo[clave]
+
+    def huella(self, archivoXML, clave):
+        """
+        Huella de las dependencias de una salida: sus secciones del XML
+        y el código que la genera
+        """
+        if self._secciones is None:
+            self._secciones = huellasSecciones(archivoXML)
+        huella = hashlib.sha256(self._huellaCodigo(clave).encode())
+        for seccion in DEPENDENCIAS[clave]['secciones']:
+            huella.update(f"{seccion}={self._secciones.get(seccion)};".encode())
+        return huella.hexdigest()
+
+    def pendientes(self, archivoXML, salidas, forzar=False, secciones=None, entrada=None):
+        """
+        Devuelve {clave: huella} de las salidas que hay que regenerar.
+        salidas es {clave: ruta del archivo generado}. Con forzar se
+        devuelven todas. secciones y entrada son las huellas de las
+        secciones y del archivo si ya se calcularon al leerlo
+        """
+        if secciones is not None:
+            self._secciones = secciones
+        if entrada is None:
+            entrada = huellaArchivo(archivoXML)
+        registradas = self.datos.get('salidas', {})
+        pendientes = {}
+        for clave, ruta in salidas.items():
+            registro = None if forzar else registradas.get(clave)
+            if (registro is not None and os.path.exists(ruta)
+                    and registro.get('entrada') == entrada
+                    and registro.get('codigo') == self._huellaCodigo(clave)):
+                # Mismo archivo de entrada y mismo código: nada que hacer
+                continue
+            huella = self.huella(archivoXML, clave)
+            if registro is not None and os.path.exists(ruta) and registro.get('huella') == huella:
+                # Cambió el XML, pero ninguna de las secciones de las que depende
+                registro['entrada'] = entrada
+                continue
+            pendientes[clave] = huella
+        self.datos['entrada'] = entrada
+        return pendientes
+
+    def registrar(self, clave, huella):
+        """
+        Anota una salida regenerada con la huella de sus dependencias
+        """
+        self.datos.setdefault('salidas', {})[clave] = {
+            'entrada': self.datos['entrada'],
+            'codigo': self._huellaCodigo(clave),
+            'huella': huella,
+        }
+
+    def guardar(self):
+        """
+        Escribe el manifiesto de forma atómica
+        """
+        temporal = self.ruta + ".tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(self.datos, archivo, indent=2, sort_keys=True)
+        os.replace(temporal, self.ruta)
@@ -0,0 +1,411 @@
+# modelo.py
+# -*- coding: utf-8 -*-
+""""
+Modelo compartido del circuito cargado en una única pasada sobre el XML
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import hashlib
+import xml.etree.ElementTree as ET
+from array import array
+from itertools import accumulate
+
+from instrumentacion import perfil
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NAMESPACE = 'http://www.uniovi.es'
+
+# Columnas de ColumnasTramos que forman la huella de <tramos>
+COLUMNAS_HUELLA = ('longitud', 'latitud', 'altitud', 'distancia', 'sector')
+
+def nombreLocal(etiqueta):
+    """
+    Devuelve el nombre local de una etiqueta {namespace}nombre
+    """
+    return etiqueta.rsplit('}', 1)[-1]
+
+class Coordenadas(object):
+    """
+    Coordenadas geográficas de un punto del circuito
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, longitud, latitud, altitud):
+        """
+        Guarda longitud, latitud y altitud como float
+        """
+        self.longitud = longitud
+        self.latitud = latitud
+        self.altitud = altitud
+
+class ColumnasTramos(object):
+    """
+    Tramos en columnas contiguas: float64 para longitud, latitud, altitud
+    y distancia, int para sector. Sin un objeto Python por punto
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self):
+        """
+        Crea las columnas vacías
+        """
+        self.longitud = array('d')
+        self.latitud = array('d')
+        self.altitud = array('d')
+        self.distancia = array('d')
+        self.sector = array('i')
+
+    def __len__(self):
+        return len(self.distancia)
+
+    def addTramo(self, distancia, longitud, latitud, altitud, sector):
+        """
+        Añade los valores de un tramo al final de las columnas
+        """
+        self.distancia.append(distancia)
+        self.longitud.append(longitud)
+        self.latitud.append(latitud)
+        self.altitud.append(altitud)
+        self.sector.append(sector)
+
+    def distanciaAcumulada(self, inicial=0.0):
+        """
+        Suma acumulada de distancia partiendo de inicial, en el mismo
+        orden de sumas que el bucle original
+        """
+        if np is not None and len(self):
+            return np.cumsum(np.concatenate(([inicial], vista(self.distancia))))[1:]
+        return array('d', accumulate(self.distancia, initial=inicial))[1:]
+
+def vista(columna):
+    """
+    Devuelve la columna (array o memoryview) como array de NumPy sin
+    copiar, o la propia columna si NumPy no está disponible
+    """
+    if np is None:
+        return columna
+    tipo = getattr(columna, 'typecode', None) or columna.format
+    return np.frombuffer(columna, dtype=np.float64 if tipo == 'd' else np.intc)
+
+def extremos(columna):
+    """
+    Devuelve (mínimo, máximo) de una columna no vacía
+    """
+    if np is not None:
+        valores = vista(columna)
+        return float(valores.min()), float(valores.max())
+    return min(columna), max(columna)
+
+def escalar(valores, minimo, rango, inicio, tamano):
+    """
+    Transforma inicio + ((v - minimo) / rango) * tamano sobre toda la columna
+    """
+    if np is not None:
+        return inicio + ((np.asarray(valores) - minimo) / rango) * tamano
+    return array('d', [inicio + ((v - minimo) / rango) * tamano for v in valores])
+
+class PilotoClasificado(object):
+    """
+    Piloto de la clasificación mundial
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, posicion, nombre, puntos):
+        """
+        Guarda posición, nombre y puntos del piloto
+        """
+        self.posicion = posicion
+        self.nombre = nombre
+        self.puntos = puntos
+
+class Circuito(object):
+    """
+    Datos del documento circuitoEsquema.xml
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self):
+        """
+        Crea un circuito vacío que rellena el cargador
+        """
+        self.nombre = None
+        self.longitud = None
+        self.unidades_longitud = None
+        self.anchura = None
+        self.unidades_anchura = None
+        self.fecha = None
+        self.hora_inicio = None
+        self.numero_vueltas = None
+        self.localidad = None
+        self.pais = None
+        self.patrocinador = None
+        self.referencias = []
+        self.fotos = []
+        self.videos = []
+        self.origen = None
+        self.tramos = ColumnasTramos()
+        self.nombre_vencedor = None
+        self.tiempo_carrera = None
+        self.clasificacion = []
+
+def _leerCoordenadas(elemento):
+    """
+    Lee un elemento con hijos longitudGeo, latitudGeo y altitudGeo
+    """
+    valores = {}
+    for hijo in elemento:
+        valores[nombreLocal(hijo.tag)] = float(hijo.text)
+    return Coordenadas(valores['longitudGeo'], valores['latitudGeo'], valores['altitudGeo'])
+
+def _volcarTramo(columnas, elemento):
+    """
+    Lee un elemento <tramo> directamente a las columnas
+    """
+    distancia = longitud = latitud = altitud = sector = None
+    for hijo in elemento:
+        etiqueta = nombreLocal(hijo.tag)
+        if etiqueta == 'distancia':
+            distancia = float(hijo.text)
+        elif etiqueta == 'coordenadas':
+            for coordenada in hijo:
+                etiqueta = nombreLocal(coordenada.tag)
+                if etiqueta == 'longitudGeo':
+                    longitud = float(coordenada.text)
+                elif etiqueta == 'latitudGeo':
+                    latitud = float(coordenada.text)
+                elif etiqueta == 'altitudGeo':
+                    altitud = float(coordenada.text)
+        elif etiqueta == 'sector':
+            sector = int(hijo.text)
+    columnas.addTramo(distancia, longitud, latitud, altitud, sector)
+
+def _leerClasificado(elemento):
+    """
+    Lee un elemento <pilotoClasificado>
+    """
+    nombre = puntos = None
+    for hijo in elemento:
+        etiqueta = nombreLocal(hijo.tag)
+        if etiqueta == 'nombrePilotoClasificado':
+            nombre = hijo.text
+        elif etiqueta == 'puntosPiloto':
+            puntos = int(hijo.text)
+    return PilotoClasificado(int(elemento.get('posicion')), nombre, puntos)
+
+def _rellenar(circuito, elemento):
+    """
+    Vuelca en el circuito un hijo directo de <circuito>
+    """
+    etiqueta = nombreLocal(elemento.tag)
+    if etiqueta == 'nombre':
+        circuito.nombre = elemento.text
+    elif etiqueta == 'longitud':
+        circuito.longitud = elemento.text
+        circuito.unidades_longitud = elemento.get('unidades')
+    elif etiqueta == 'anchura':
+        circuito.anchura = elemento.text
+        circuito.unidades_anchura = elemento.get('unidades')
+    elif etiqueta == 'fecha':
+        circuito.fecha = elemento.text
+    elif etiqueta == 'horaInicio':
+        circuito.hora_inicio = elemento.text
+    elif etiqueta == 'numeroVueltas':
+        circuito.numero_vueltas = elemento.text
+    elif etiqueta == 'localidad':
+        circuito.localidad = elemento.text
+    elif etiqueta == 'pais':
+        circuito.pais = elemento.text
+    elif etiqueta == 'patrocinadorPrincipal':
+        circuito.patrocinador = elemento.text
+    elif etiqueta == 'referencias':
+        circuito.referencias = [hijo.text for hijo in elemento]
+    elif etiqueta == 'fotos':
+        circuito.fotos = [hijo.text for hijo in elemento]
+    elif etiqueta == 'videos':
+        circuito.videos = [hijo.text for hijo in elemento]
+    elif etiqueta == 'coordenadasOrigen':
+        circuito.origen = _leerCoordenadas(elemento)
+    elif etiqueta == 'vencedor':
+        for hijo in elemento:
+            if nombreLocal(hijo.tag) == 'nombrePiloto':
+                circuito.nombre_vencedor = hijo.text
+            elif nombreLocal(hijo.tag) == 'tiempoCarrera':
+                circuito.tiempo_carrera = hijo.text
+    elif etiqueta == 'clasificacionMundial':
+        circuito.clasificacion = [_leerClasificado(hijo) for hijo in elemento]
+
+class _LecturaConHuella(object):
+    """
+    Archivo binario que calcula el SHA-256 de lo que el parser va leyendo
+    """
+    def __init__(self, archivoXML):
+        self.archivo = open(archivoXML, 'rb')
+        self.huella = hashlib.sha256()
+
+    def read(self, tamano=-1):
+        datos = self.archivo.read(tamano)
+        self.huella.update(datos)
+        return datos
+
+    def close(self):
+        self.archivo.close()
+
+class LectorCircuito(object):
+    """
+    Lee el circuito de forma incremental con iterparse: los datos previos
+    a <tramos> se cargan al crear el lector y los tramos se vuelcan a
+    columnas por bloques, eliminando del árbol cada elemento ya procesado. Con un
+    validador cada evento se valida en la misma pasada y los elementos
+    no válidos no se vuelcan al modelo. Con huellas se calculan también,
+    en la misma pasada, la huella del archivo y la de cada hijo directo
+    de <circuito>; la de <tramos> se toma de sus columnas
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, archivoXML, validador=None, huellas=False):
+        """
+        Abre el archivo y lee la cabecera hasta el inicio de <tramos>
+        """
+        self.circuito = Circuito()
+        self.validador = validador
+        # {sección: huella} y huella del archivo, completas al agotar los tramos
+        self.huellas = {} if huellas else None
+        self.huellaArchivo = None
+        self._lectura = None
+        if huellas:
+            self._lectura = _LecturaConHuella(archivoXML)
+            self._huellasTramos = [hashlib.sha256() for _ in COLUMNAS_HUELLA]
+        self._eventos = ET.iterparse(self._lectura or archivoXML, events=('start', 'end'))
+        self._raiz = None
+        self._tramos = None
+        self._profundidad = 0
+        inicio = perfil.reloj()
+        for evento, elemento in self._eventos:
+            if self._procesar(evento, elemento):
+                break
+        perfil.acumular('lectura', inicio)
+
+    def _procesar(self, evento, elemento):
+        """
+        Procesa un evento del parser. Devuelve True al entrar en <tramos>
+        """
+        valido = self.validador is None or self.validador.evento(evento, elemento)
+        if evento == 'start':
+            self._profundidad += 1
+            if self._raiz is None:
+                self._raiz = elemento
+            elif self._profundidad == 2 and nombreLocal(elemento.tag) == 'tramos':
+                self._tramos = elemento
+                return True
+            return False
+        self._profundidad -= 1
+        if self._profundidad == 1:
+            # Hijo directo de <circuito> completo: volcarlo y soltarlo
+            tramos = elemento is self._tramos
+            if tramos:
+                self._tramos = None
+            if valido:
+                _rellenar(self.circuito, elemento)
+            if self.huellas is not None and not tramos:
+                elemento.tail = None
+                self.huellas[nombreLocal(elemento.tag)] = hashlib.sha256(ET.tostring(elemento)).hexdigest()
+            self._raiz.remove(elemento)
+        return False
+
+    def _elementosTramo(self):
+        """
+        Generador de los elementos <tramo> completos. Cada elemento se
+        elimina del árbol cuando el consumidor pide el siguiente
+        """
+        for evento, elemento in self._eventos:
+            if (evento == 'end' and self._profundidad == 3
+                    and self._tramos is not None):
+                self._profundidad -= 1
+                if self.validador is None or self.validador.evento(evento, elemento):
+                    yield elemento
+                self._tramos.remove(elemento)
+            else:
+                self._procesar(evento, elemento)
+
+    def _anotarBloque(self, columnas):
+        """
+        Añade un bloque de columnas a la huella de <tramos>
+        """
+        if self.huellas is not None:
+            for huella, atributo in zip(self._huellasTramos, COLUMNAS_HUELLA):
+                huella.update(getattr(columnas, atributo))
+
+    def _cerrarHuellas(self):
+        """
+        Completa las huellas al agotar el archivo. La de <tramos> no
+        depende del tamaño de los bloques: es la de sus columnas
+        """
+        if self.huellas is None or self._lectura.archivo.closed:
+            return
+        self.huellas['tramos'] = hashlib.sha256(
+            b"".join(huella.digest() for huella in self._huellasTramos)).hexdigest()
+        self.huellaArchivo = self._lectura.huella.hexdigest()
+        self._lectura.close()
+
+    def saltarTramos(self):
+        """
+        Descarta los tramos restantes sin leerlos, para llegar sólo a los
+        datos posteriores (vencedor y clasificación)
+        """
+        for _ in self._elementosTramo():
+            pass
+
+    def bloques(self, tamano=65536):
+        """
+        Generador de ColumnasTramos con hasta tamano tramos cada uno,
+        para procesar las columnas por bloques con memoria acotada
+        """
+        columnas = ColumnasTramos()
+        inicio = perfil.reloj()
+        for elemento in self._elementosTramo():
+            _volcarTramo(columnas, elemento)
+            if len(columnas) == tamano:
+                perfil.acumular('lectura', inicio, tamano)
+                self._anotarBloque(columnas)
+                yield columnas
+                columnas = ColumnasTramos()
+                inicio = perfil.reloj()
+        perfil.acumular('lectura', inicio, len(columnas))
+        self._anotarBloque(columnas)
+        self._cerrarHuellas()
+        if len(columnas):
+            yield columnas
+
+    def columnas(self):
+        """
+        Lee todos los tramos restantes en un único ColumnasTramos
+        """
+        columnas = ColumnasTramos()
+        inicio = perfil.reloj()
+        for elemento in self._elementosTramo():
+            _volcarTramo(columnas, elemento)
+        perfil.acumular('lectura', inicio, len(columnas))
+        self._anotarBloque(columnas)
+        self._cerrarHuellas()
+        return columnas
+
+def leerCircuito(archivoXML, validador=None, huellas=False):
+    """
+    Lee el archivo entero en una sola pasada y devuelve el lector agotado,
+    con el circuito y sus tramos en columnas y, si se piden, las huellas
+    """
+    lector = LectorCircuito(archivoXML, validador, huellas)
+    tramos = lector.columnas()
+    lector.circuito.tramos = tramos
+    return lector
+
+def cargarCircuito(archivoXML):
+    """
+    Lee el archivo una vez y rellena el modelo en una sola pasada,
+    sin búsquedas .// sobre el árbol. Los tramos quedan en columnas
+    """
+    return leerCircuito(archivoXML).circuito
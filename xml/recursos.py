@@ -0,0 +1,306 @@
+# recursos.py
+# -*- coding: utf-8 -*-
+""""
+Recursos de imagen del HTML: dimensiones leídas sólo de la cabecera de
+los JPEG y PNG, variantes reducidas para srcset e informe de las imágenes
+que faltan. Los resultados se guardan en una caché por archivo que se
+invalida por fecha de modificación y, si ésta cambia, por huella
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import argparse
+import json
+import os
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentacion import perfil
+from manifiesto import huellaArchivo
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+NOMBRE_CACHE = ".recursos.json"
+DIRECTORIO_VARIANTES = "variantes"
+VERSION = 1
+
+# Anchos de las variantes reducidas; sólo se crean las menores que el original
+ANCHOS_VARIANTES = (480, 960)
+
+FIRMA_PNG = b'\x89PNG\r\n\x1a\n'
+# Marcadores SOF de JPEG que llevan las dimensiones (todos salvo DHT, JPG y DAC)
+SOF_JPEG = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _dimensionesPNG(archivo):
+    cabecera = archivo.read(24)
+    if len(cabecera) < 24 or cabecera[:8] != FIRMA_PNG or cabecera[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', cabecera[16:24])
+
+def _dimensionesJPEG(archivo):
+    if archivo.read(2) != b'\xff\xd8':
+        return None
+    while True:
+        byte = archivo.read(1)
+        while byte and byte != b'\xff':
+            byte = archivo.read(1)
+        # Los 0xFF repetidos son relleno antes del marcador
+        while byte == b'\xff':
+            byte = archivo.read(1)
+        if not byte:
+            return None
+        marcador = byte[0]
+        if marcador == 0x01 or 0xD0 <= marcador <= 0xD8:
+            continue
+        if marcador == 0xD9:
+            return None
+        longitud = archivo.read(2)
+        if len(longitud) < 2:
+            return None
+        longitud, = struct.unpack('>H', longitud)
+        if marcador in SOF_JPEG:
+            datos = archivo.read(5)
+            if len(datos) < 5:
+                return None
+            alto, ancho = struct.unpack('>HH', datos[1:5])
+            return ancho, alto
+        archivo.seek(longitud - 2, os.SEEK_CUR)
+
+def dimensiones(ruta):
+    """
+    (ancho, alto) en píxeles de un JPEG o PNG leyendo sólo su cabecera,
+    o None si no es de uno de esos formatos
+    """
+    with open(ruta, 'rb') as archivo:
+        inicio = archivo.read(8)
+        archivo.seek(0)
+        if inicio == FIRMA_PNG:
+            return _dimensionesPNG(archivo)
+        if inicio[:2] == b'\xff\xd8':
+            return _dimensionesJPEG(archivo)
+    return None
+
+class Imagen(object):
+    """
+    Imagen del HTML: ruta relativa a la raíz del sitio, dimensiones y
+    variantes reducidas (ancho, alto, ruta relativa)
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, src, ancho, alto, variantes=()):
+        """
+        Guarda los datos de una imagen ya examinada
+        """
+        self.src = src
+        self.ancho = ancho
+        self.alto = alto
+        self.variantes = [tuple(variante) for variante in variantes]
+
+class RecursosImagen(object):
+    """
+    Catálogo de las imágenes de un sitio, examinadas en paralelo y
+    guardadas en una caché JSON en la raíz del sitio. Una entrada se
+    reutiliza si coinciden la fecha y el tamaño del archivo o, si no, su
+    huella SHA-256. Las variantes se crean con Pillow si está instalado
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, raiz, anchos=ANCHOS_VARIANTES, hilos=None):
+        """
+        Carga la caché de la raíz del sitio, o empieza una vacía
+        """
+        self.raiz = raiz
+        self.anchos = tuple(anchos)
+        self.hilos = hilos
+        self.ruta = os.path.join(raiz, NOMBRE_CACHE)
+        self.imagenes = {}
+        self.faltan = []
+        # Alguna imagen se queda sin variantes por no estar Pillow
+        self.sinVariantes = False
+        self.datos = {'version': VERSION, 'imagenes': {}}
+        try:
+            with open(self.ruta, encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+            if datos.get('version') == VERSION:
+                self.datos = datos
+        except (FileNotFoundError, ValueError):
+            pass
+        self._cambios = False
+
+    def _variantes(self, src, ruta, ancho, alto):
+        """
+        Crea las variantes reducidas que falten de una imagen y devuelve
+        [(ancho, alto, ruta relativa)]
+        """
+        if Image is None:
+            return []
+        directorio, nombre = os.path.split(src)
+        base, extension = os.path.splitext(nombre)
+        variantes = []
+        imagen = None
+        try:
+            for reducido in self.anchos:
+                if reducido >= ancho:
+                    continue
+                relativa = f"{directorio}/{DIRECTORIO_VARIANTES}/{base}-{reducido}w{extension}".lstrip('/')
+                destino = os.path.join(self.raiz, relativa)
+                proporcional = max(1, round(alto * reducido / ancho))
+                if not os.path.exists(destino):
+                    if imagen is None:
+                        imagen = Image.open(ruta)
+                        imagen.load()
+                    os.makedirs(os.path.dirname(destino), exist_ok=True)
+                    # Temporal con nombre único: varios procesos de un lote
+                    # pueden estar creando la misma variante
+                    with tempfile.NamedTemporaryFile(dir=os.path.dirname(destino), prefix=f".{base}-{reducido}w.",
+                                                     suffix=extension, delete=False) as temporal:
+                        try:
+                            imagen.resize((reducido, proporcional), Image.LANCZOS).save(
+                                temporal, format=imagen.format, optimize=True)
+                        except BaseException:
+                            temporal.close()
+                            os.remove(temporal.name)
+                            raise
+                    os.replace(temporal.name, destino)
+                variantes.append((reducido, proporcional, relativa))
+        finally:
+            if imagen is not None:
+                imagen.close()
+        return variantes
+
+    def _examinar(self, src):
+        """
+        Imagen de src, de la caché si sigue vigente, o None si falta el
+        archivo o no es un JPEG o PNG
+        """
+        ruta = os.path.join(self.raiz, src)
+        try:
+            estado = os.stat(ruta)
+        except FileNotFoundError:
+            return None
+        entrada = self.datos['imagenes'].get(src)
+        if entrada is not None and (entrada['mtime'] != estado.st_mtime_ns or entrada['tamaño'] != estado.st_size):
+            # Cambió la fecha: sólo se reutiliza si el contenido es el mismo
+            huella = huellaArchivo(ruta)
+            if entrada['huella'] == huella:
+                entrada['mtime'], entrada['tamaño'] = estado.st_mtime_ns, estado.st_size
+                self._cambios = True
+            else:
+                entrada = None
+        if entrada is not None and all(os.path.exists(os.path.join(self.raiz, variante[2]))
+                                       for variante in entrada['variantes']):
+            if Image is None or entrada['anchos'] == list(self.anchos):
+                return Imagen(src, entrada['ancho'], entrada['alto'], entrada['variantes'])
+        medidas = dimensiones(ruta)
+        if medidas is None:
+            return None
+        ancho, alto = medidas
+        variantes = self._variantes(src, ruta, ancho, alto)
+        self.datos['imagenes'][src] = {
+            'mtime': estado.st_mtime_ns,
+            'tamaño': estado.st_size,
+            'huella': entrada['huella'] if entrada is not None else huellaArchivo(ruta),
+            'ancho': ancho,
+            'alto': alto,
+            'anchos': list(self.anchos) if Image is not None else [],
+            'variantes': [list(variante) for variante in variantes],
+        }
+        self._cambios = True
+        return Imagen(src, ancho, alto, variantes)
+
+    def examinar(self, fuentes):
+        """
+        Examina en paralelo las imágenes indicadas (rutas relativas a la
+        raíz) y anota en faltan las que no existen o no se pueden leer.
+        Devuelve {src: Imagen}
+        """
+        pendientes = [src for src in dict.fromkeys(fuentes) if src not in self.imagenes]
+        if not pendientes:
+            return self.imagenes
+        with perfil.etapa('recursos'):
+            with ThreadPoolExecutor(max_workers=self.hilos or min(8, len(pendientes))) as ejecutor:
+                for src, imagen in zip(pendientes, ejecutor.map(self._examinar, pendientes)):
+                    if imagen is None:
+                        self.faltan.append(src)
+                    else:
+                        self.imagenes[src] = imagen
+                        if Image is None and any(reducido < imagen.ancho for reducido in self.anchos):
+                            self.sinVariantes = True
+            perfil.contar('imagenes', len(pendientes))
+        self.guardar()
+        return self.imagenes
+
+    def avisos(self):
+        """
+        Avisos del examen: uno por imagen que falta y uno solo si sin
+        Pillow alguna imagen se queda sin variantes para srcset
+        """
+        avisos = [f"[AVISO] No se encontró la imagen {src}" for src in self.faltan]
+        if self.sinVariantes:
+            avisos.append("[AVISO] Pillow no está instalado: las imágenes se publican sin srcset")
+        return avisos
+
+    def firma(self):
+        """
+        Huella y variantes de cada imagen examinada y las que faltan, como
+        texto para el manifiesto: si cambia una imagen cambia la firma
+        """
+        partes = [f"{src}={self.datos['imagenes'][src]['huella']}:"
+                  + ",".join(variante[2] for variante in imagen.variantes)
+                  for src, imagen in sorted(self.imagenes.items())]
+        partes.extend(f"{src}=-" for src in sorted(self.faltan))
+        return ";".join(partes)
+
+    def guardar(self):
+        """
+        Escribe la caché de forma atómica si ha cambiado. Un sitio de
+        sólo lectura se queda sin caché
+        """
+        if not self._cambios:
+            return
+        # Temporal con nombre único, como las variantes
+        archivo = None
+        try:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.raiz, prefix=NOMBRE_CACHE + ".",
+                                             suffix=".tmp", delete=False) as archivo:
+                json.dump(self.datos, archivo, indent=2, sort_keys=True, ensure_ascii=False)
+            os.replace(archivo.name, self.ruta)
+        except OSError:
+            if archivo is not None and os.path.exists(archivo.name):
+                os.remove(archivo.name)
+            return
+        self._cambios = False
+
+def recursosHTML(nombreHTML, fuentes):
+    """
+    Examina las imágenes de un HTML. Las rutas del documento son
+    relativas al directorio padre del HTML (se enlazan con ../)
+    """
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(nombreHTML)))
+    recursos = RecursosImagen(raiz)
+    recursos.examinar(fuentes)
+    return recursos
+
+def main():
+    parser = argparse.ArgumentParser(description="Examina las imágenes del sitio y crea sus variantes reducidas")
+    parser.add_argument("imagenes", nargs="+", help="imágenes, relativas a la raíz del sitio")
+    parser.add_argument("-r", "--raiz", default="..", help="raíz del sitio (por defecto, el directorio padre)")
+    argumentos = parser.parse_args()
+
+    recursos = RecursosImagen(argumentos.raiz)
+    imagenes = recursos.examinar(argumentos.imagenes)
+    for src in argumentos.imagenes:
+        if src in imagenes:
+            imagen = imagenes[src]
+            print(f"{src}: {imagen.ancho}x{imagen.alto}"
+                  + "".join(f", {ruta} ({ancho}x{alto})" for ancho, alto, ruta in imagen.variantes))
+    for aviso in recursos.avisos():
+        print(aviso)
+    perfil.emitir("recursos")
+    return 1 if recursos.faltan else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
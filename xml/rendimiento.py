@@ -0,0 +1,315 @@
+# rendimiento.py
+# -*- coding: utf-8 -*-
+""""
+Banco de pruebas de rendimiento: genera circuitos sintéticos con el
+formato de circuitoEsquema.xml y mide las etapas de lectura,
+transformación y escritura de los generadores KML, SVG y HTML
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Punto de partida de los circuitos sintéticos (meta de Sepang)
+LONGITUD_ORIGEN = 101.7383756
+LATITUD_ORIGEN = 2.7607531
+ALTITUD_ORIGEN = 35.98
+RADIO_TIERRA = 6371008.8
+
+def _haversine(lon1, lat1, lon2, lat2):
+    """
+    Distancia en metros entre dos puntos geográficos
+    """
+    f1, f2 = math.radians(lat1), math.radians(lat2)
+    df = f2 - f1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(df / 2) ** 2 + math.cos(f1) * math.cos(f2) * math.sin(dl / 2) ** 2
+    return 2 * RADIO_TIERRA * math.asin(math.sqrt(a))
+
+def generarCircuitoSintetico(ruta, tramos, referencias=3, fotos=3, clasificados=3):
+    """
+    Escribe en flujo un documento con el formato de circuitoEsquema.xml
+    con el número de tramos indicado sobre una elipse alrededor de la meta.
+    Es válido según circuito.xsd mientras referencias >= 3, 1 <= fotos <= 5
+    y clasificados == 3; con valores mayores sirve para medir el HTML
+    """
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        escribir = archivo.write
+        escribir('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<circuito xsi:schemaLocation="http://www.uniovi.es circuito.xsd"\n'
+                 'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"\n'
+                 'xmlns="http://www.uniovi.es">\n'
+                 f'    <nombre>Circuito sintético {tramos}</nombre>\n'
+                 '    <longitud unidades="m">5540</longitud>\n'
+                 '    <anchura unidades="m">16</anchura>\n'
+                 '    <fecha>2025-10-26</fecha>\n'
+                 '    <horaInicio>08:00:00</horaInicio>\n'
+                 '    <numeroVueltas>20</numeroVueltas>\n'
+                 '    <localidad>Sepang</localidad>\n'
+                 '    <pais>Malasia</pais>\n'
+                 '    <patrocinadorPrincipal>Petronas</patrocinadorPrincipal>\n'
+                 '    <referencias>\n')
+        for i in range(referencias):
+            escribir(f'        <referencia>https://www.ejemplo.es/circuito/{i}</referencia>\n')
+        escribir('    </referencias>\n    <fotos>\n')
+        for i in range(fotos):
+            escribir(f'        <foto>multimedia/foto_{i}.jpg</foto>\n')
+        escribir('    </fotos>\n    <videos>\n'
+                 '        <video>multimedia/vuelta.mp4</video>\n'
+                 '    </videos>\n'
+                 '    <coordenadasOrigen>\n'
+                 f'        <longitudGeo>{LONGITUD_ORIGEN}</longitudGeo>\n'
+                 f'        <latitudGeo>{LATITUD_ORIGEN}</latitudGeo>\n'
+                 f'        <altitudGeo>{ALTITUD_ORIGEN}</altitudGeo>\n'
+                 '    </coordenadasOrigen>\n'
+                 '    <tramos>\n')
+        # Elipse de ~1.2 x 0.8 km que empieza y acaba en la meta
+        radio_lon = 600 / (RADIO_TIERRA * math.cos(math.radians(LATITUD_ORIGEN))) * 180 / math.pi
+        radio_lat = 400 / RADIO_TIERRA * 180 / math.pi
+        centro_lon = LONGITUD_ORIGEN - radio_lon
+        lon_anterior, lat_anterior = LONGITUD_ORIGEN, LATITUD_ORIGEN
+        for i in range(1, tramos + 1):
+            angulo = 2 * math.pi * i / tramos
+            lon = centro_lon + radio_lon * math.cos(angulo)
+            lat = LATITUD_ORIGEN + radio_lat * math.sin(angulo)
+            alt = ALTITUD_ORIGEN + 5 * math.sin(3 * angulo)
+            distancia = _haversine(lon_anterior, lat_anterior, lon, lat)
+            sector = 1 + (3 * (i - 1)) // tramos
+            escribir('        <tramo>\n'
+                     f'            <distancia unidades="m">{distancia:.2f}</distancia>\n'
+                     '            <coordenadas>\n'
+                     f'                <longitudGeo>{lon:.7f}</longitudGeo>\n'
+                     f'                <latitudGeo>{lat:.7f}</latitudGeo>\n'
+                     f'                <altitudGeo>{alt:.2f}</altitudGeo>\n'
+                     '            </coordenadas>\n'
+                     f'            <sector>{sector}</sector>\n'
+                     '        </tramo>\n')
+            lon_anterior, lat_anterior = lon, lat
+        escribir('    </tramos>\n'
+                 '    <vencedor>\n'
+                 '        <nombrePiloto>NO DETERMINADO</nombrePiloto>\n'
+                 '        <tiempoCarrera>PT0S</tiempoCarrera>\n'
+                 '    </vencedor>\n'
+                 '    <clasificacionMundial>\n')
+        for i in range(1, clasificados + 1):
+            escribir(f'        <pilotoClasificado posicion="{min(i, 3)}">\n'
+                     f'            <nombrePilotoClasificado>Piloto {i}</nombrePilotoClasificado>\n'
+                     f'            <puntosPiloto>{max(0, 500 - i)}</puntosPiloto>\n'
+                     '        </pilotoClasificado>\n')
+        escribir('    </clasificacionMundial>\n</circuito>\n')
+
+def _etapasKML(archivoXML, salida):
+    """
+    Etapas del generador KML sobre el modelo en columnas
+    """
+    from modelo import cargarCircuito
+    from xml2kml import escribirKML, fragmentosCoordenadas
+    estado = {}
+    def leer():
+        estado['circuito'] = cargarCircuito(archivoXML)
+    def transformar():
+        circuito = estado['circuito']
+        estado['fragmentos'] = list(fragmentosCoordenadas(circuito.origen, [circuito.tramos]))
+    def escribir():
+        escribirKML(estado['circuito'], estado['fragmentos'], salida)
+    return (('parse', leer), ('transform', transformar), ('write', escribir))
+
+def _etapasSVG(archivoXML, salida):
+    """
+    Etapas del generador del perfil altimétrico
+    """
+    from modelo import cargarCircuito
+    from xml2altimetria import crearSVG
+    estado = {}
+    def leer():
+        estado['circuito'] = cargarCircuito(archivoXML)
+    def transformar():
+        circuito = estado['circuito']
+        estado['svg'] = crearSVG(circuito, [circuito.tramos], [circuito.tramos])
+    def escribir():
+        estado['svg'].escribir(salida)
+    return (('parse', leer), ('transform', transformar), ('write', escribir))
+
+def _etapasHTML(archivoXML, salida):
+    """
+    Etapas del generador HTML
+    """
+    from modelo import cargarCircuito
+    from xml2html import Html, documentoHTML
+    estado = {}
+    def leer():
+        estado['circuito'] = cargarCircuito(archivoXML)
+    def transformar():
+        estado['documento'] = documentoHTML(estado['circuito'])
+    def escribir():
+        Html().escribir(salida, estado['documento'])
+    return (('parse', leer), ('transform', transformar), ('write', escribir))
+
+def _generadorCompleto(pipeline):
+    """
+    Generador de producción (en flujo) de cada pipeline
+    """
+    if pipeline == 'kml':
+        from xml2kml import generarKML
+        return generarKML
+    if pipeline == 'svg':
+        from xml2altimetria import generarAltimetria
+        return generarAltimetria
+    from xml2html import generarHTML
+    return generarHTML
+
+PIPELINES = {
+    'kml': _etapasKML,
+    'svg': _etapasSVG,
+    'html': _etapasHTML,
+}
+
+def _picoRSS():
+    """
+    Pico de memoria residente del proceso en bytes (ru_maxrss está en
+    KiB en Linux)
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _medirEtapas(pipeline, archivoXML, salida, memoria):
+    """
+    Ejecuta las etapas de un pipeline. Devuelve sus tiempos, el pico de
+    memoria del proceso y los bytes escritos
+    """
+    etapas = {}
+    for nombre, funcion in PIPELINES[pipeline](archivoXML, salida):
+        if memoria:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        funcion()
+        etapas[nombre] = {'segundos': time.perf_counter() - inicio}
+        if memoria:
+            etapas[nombre]['pico_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return {
+        'etapas': etapas,
+        'segundos_etapas': sum(e['segundos'] for e in etapas.values()),
+        'pico_rss_bytes': _picoRSS(),
+        'bytes_salida': os.path.getsize(salida),
+    }
+
+def _medirGenerador(pipeline, archivoXML, salida):
+    """
+    Ejecuta el generador completo (en flujo) de un pipeline. Devuelve su
+    tiempo y el pico de memoria del proceso
+    """
+    inicio = time.perf_counter()
+    _generadorCompleto(pipeline)(archivoXML, salida)
+    return {
+        'segundos_generador': time.perf_counter() - inicio,
+        'pico_rss_generador_bytes': _picoRSS(),
+    }
+
+def _enProceso(contexto, funcion, *argumentos):
+    """
+    Ejecuta la función en un proceso nuevo, para que su pico de memoria
+    no se mezcle con el de otras medidas
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as ejecutor:
+        return ejecutor.submit(funcion, *argumentos).result()
+
+def ejecutar(tamanos, pipelines, directorio, referencias=3, fotos=3, clasificados=3,
+             repeticiones=1, memoria=False):
+    """
+    Genera un circuito por tamaño y mide cada pipeline: las etapas y el
+    generador completo, cada uno en un proceso propio para que el pico de
+    memoria no se contamine entre medidas. Las salidas se escriben en un
+    subdirectorio, así que la raíz del sitio del HTML (donde se guardan
+    la caché y las variantes de las imágenes) es el propio directorio
+    """
+    resultados = []
+    contexto = multiprocessing.get_context('spawn')
+    salidas = os.path.join(directorio, "salidas")
+    os.makedirs(salidas, exist_ok=True)
+    for tramos in tamanos:
+        archivoXML = os.path.join(directorio, f"circuito_{tramos}.xml")
+        generarCircuitoSintetico(archivoXML, tramos, referencias, fotos, clasificados)
+        for pipeline in pipelines:
+            salida = os.path.join(salidas, f"salida_{tramos}.{pipeline}")
+            etapas, generador = [], []
+            for _ in range(repeticiones):
+                etapas.append(_enProceso(contexto, _medirEtapas, pipeline, archivoXML, salida, memoria))
+                generador.append(_enProceso(contexto, _medirGenerador, pipeline, archivoXML, salida))
+            # Mejor tiempo de las repeticiones, peor pico de memoria
+            mejor = min(etapas, key=lambda m: m['segundos_etapas'])
+            mejor['pico_rss_bytes'] = max(m['pico_rss_bytes'] for m in etapas)
+            mejor['segundos_generador'] = min(m['segundos_generador'] for m in generador)
+            mejor['pico_rss_generador_bytes'] = max(m['pico_rss_generador_bytes'] for m in generador)
+            mejor.update({
+                'pipeline': pipeline,
+                'tramos': tramos,
+                'referencias': referencias,
+                'fotos': fotos,
+                'clasificados': clasificados,
+                'bytes_entrada': os.path.getsize(archivoXML),
+                'repeticiones': repeticiones,
+            })
+            resultados.append(mejor)
+            print(f"{pipeline:>4} {tramos:>9} tramos: "
+                  + " ".join(f"{n}={e['segundos']:.3f}s" for n, e in mejor['etapas'].items())
+                  + f" rss={mejor['pico_rss_bytes'] / 2**20:.1f}MiB"
+                  + f" generador={mejor['segundos_generador']:.3f}s"
+                  + f" rss={mejor['pico_rss_generador_bytes'] / 2**20:.1f}MiB"
+                  + f" salida={mejor['bytes_salida']}B", file=sys.stderr)
+            os.remove(salida)
+        os.remove(archivoXML)
+    return resultados
+
+def _version(modulo):
+    try:
+        return __import__(modulo).__version__
+    except ImportError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de los generadores KML, SVG y HTML")
+    parser.add_argument("-t", "--tamanos", type=int, nargs="+",
+                        default=[10 ** e for e in range(2, 6)],
+                        help="números de tramos a medir (por defecto 10^2 a 10^5; admite hasta 10^7)")
+    parser.add_argument("--pipelines", nargs="+", choices=sorted(PIPELINES), default=['kml', 'svg', 'html'])
+    parser.add_argument("--referencias", type=int, default=3)
+    parser.add_argument("--fotos", type=int, default=3)
+    parser.add_argument("--clasificados", type=int, default=3)
+    parser.add_argument("-r", "--repeticiones", type=int, default=1)
+    parser.add_argument("-m", "--memoria", action="store_true",
+                        help="mide el pico de cada etapa con tracemalloc (más lento)")
+    parser.add_argument("-d", "--directorio", help="directorio de trabajo (por defecto, uno temporal)")
+    parser.add_argument("-o", "--salida", help="archivo JSON de resultados (por defecto, salida estándar)")
+    argumentos = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=argumentos.directorio) as directorio:
+        resultados = ejecutar(argumentos.tamanos, argumentos.pipelines, directorio,
+                              argumentos.referencias, argumentos.fotos, argumentos.clasificados,
+                              argumentos.repeticiones, argumentos.memoria)
+    informe = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': _version('numpy'),
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+    texto = json.dumps(informe, indent=2)
+    if argumentos.salida:
+        with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+if __name__ == "__main__":
+    main()
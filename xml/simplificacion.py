@@ -0,0 +1,302 @@
+# simplificacion.py
+# -*- coding: utf-8 -*-
+""""
+Simplificación de polilíneas (Douglas-Peucker y Visvalingam-Whyatt)
+para el trazado KML y el perfil altimétrico SVG, y diezmado de series
+(mínimo-máximo por columna y LTTB) para gráficas
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import heapq
+import math
+from array import array
+
+from instrumentacion import perfil
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RADIO_TIERRA = 6371008.8
+
+class Simplificacion(object):
+    """
+    Resultado de simplificar una polilínea: índices de los vértices
+    conservados sobre el total original
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, indices, total):
+        """
+        Guarda los índices conservados (en orden) y el total de vértices
+        """
+        self.indices = indices
+        self.total = total
+
+    @property
+    def conservados(self):
+        return len(self.indices)
+
+    @property
+    def descartados(self):
+        return self.total - len(self.indices)
+
+    def aplicar(self, columna):
+        """
+        Devuelve los valores de la columna en los vértices conservados
+        """
+        if np is not None:
+            return np.asarray(columna)[self.indices]
+        return array('d', [columna[i] for i in self.indices])
+
+    def informe(self):
+        """
+        Texto con los vértices conservados y descartados
+        """
+        return (f"Simplificación: {self.conservados} vértices conservados, "
+                f"{self.descartados} descartados de {self.total}")
+
+    def contar(self, nombre):
+        """
+        Anota los vértices conservados y descartados en los contadores de
+        la instrumentación, que sólo se muestran con el perfil activo
+        """
+        perfil.contar(f'{nombre}_conservados', self.conservados)
+        perfil.contar(f'{nombre}_descartados', self.descartados)
+
+def proyectarMetros(longitudes, latitudes, referencia=None):
+    """
+    Proyección equirectangular local en metros, centrada en el primer punto
+    o en referencia (longitud, latitud) si se indica, para proyectar por
+    bloques con el mismo centro. Suficiente en la extensión de un circuito
+    """
+    lon0, lat0 = referencia if referencia is not None else (longitudes[0], latitudes[0])
+    coseno = math.cos(math.radians(lat0))
+    if np is not None:
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        xs = np.radians(longitudes - lon0) * coseno * RADIO_TIERRA
+        ys = np.radians(latitudes - lat0) * RADIO_TIERRA
+        return xs, ys
+    xs = array('d', [math.radians(lon - lon0) * coseno * RADIO_TIERRA for lon in longitudes])
+    ys = array('d', [math.radians(lat - lat0) * RADIO_TIERRA for lat in latitudes])
+    return xs, ys
+
+def _distanciaSegmento(px, py, ax, ay, bx, by):
+    """
+    Distancia del punto p al segmento a-b
+    """
+    dx = bx - ax
+    dy = by - ay
+    longitud2 = dx * dx + dy * dy
+    if longitud2 == 0:
+        return math.hypot(px - ax, py - ay)
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / longitud2))
+    return math.hypot(px - ax - t * dx, py - ay - t * dy)
+
+def _maximoNumpy(xs, ys, i, j):
+    """
+    Índice y distancia del punto más alejado del segmento i-j (vectorizado)
+    """
+    ax, ay = xs[i], ys[i]
+    dx = xs[j] - ax
+    dy = ys[j] - ay
+    px = xs[i + 1:j] - ax
+    py = ys[i + 1:j] - ay
+    longitud2 = dx * dx + dy * dy
+    if longitud2 == 0:
+        distancias = np.hypot(px, py)
+    else:
+        t = np.clip((px * dx + py * dy) / longitud2, 0.0, 1.0)
+        distancias = np.hypot(px - t * dx, py - t * dy)
+    k = int(np.argmax(distancias))
+    return i + 1 + k, float(distancias[k])
+
+def _maximoPython(xs, ys, i, j):
+    """
+    Índice y distancia del punto más alejado del segmento i-j
+    """
+    indice, maximo = i, -1.0
+    for k in range(i + 1, j):
+        d = _distanciaSegmento(xs[k], ys[k], xs[i], ys[i], xs[j], ys[j])
+        if d > maximo:
+            indice, maximo = k, d
+    return indice, maximo
+
+def douglasPeucker(xs, ys, tolerancia):
+    """
+    Douglas-Peucker iterativo: conserva los vértices que se separan más
+    de tolerancia (en las unidades de xs, ys) de la línea simplificada
+    """
+    total = len(xs)
+    if total < 3:
+        return Simplificacion(list(range(total)), total)
+    if np is not None:
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        maximo = _maximoNumpy
+    else:
+        maximo = _maximoPython
+    conservar = bytearray(total)
+    conservar[0] = conservar[-1] = 1
+    pendientes = [(0, total - 1)]
+    while pendientes:
+        i, j = pendientes.pop()
+        if j - i < 2:
+            continue
+        k, distancia = maximo(xs, ys, i, j)
+        if distancia > tolerancia:
+            conservar[k] = 1
+            pendientes.append((i, k))
+            pendientes.append((k, j))
+    return Simplificacion([i for i in range(total) if conservar[i]], total)
+
+def _area(xs, ys, a, b, c):
+    """
+    Área del triángulo a-b-c
+    """
+    return abs((xs[b] - xs[a]) * (ys[c] - ys[a]) - (xs[c] - xs[a]) * (ys[b] - ys[a])) / 2
+
+def visvalingam(xs, ys, tolerancia):
+    """
+    Visvalingam-Whyatt: elimina vértices mientras su área efectiva sea
+    menor que tolerancia² (en las unidades de xs, ys al cuadrado).
+    Cada eliminación cambia el área de sus vecinos, así que el montículo
+    se recorre punto a punto en Python incluso con NumPy: es la
+    alternativa lenta, útil por su forma más suave en trazados cortos.
+    Douglas-Peucker, vectorizado con NumPy, es el método por defecto
+    """
+    total = len(xs)
+    if total < 3:
+        return Simplificacion(list(range(total)), total)
+    umbral = tolerancia * tolerancia
+    anterior = list(range(-1, total - 1))
+    siguiente = list(range(1, total + 1))
+    areas = [math.inf] * total
+    monticulo = []
+    for b in range(1, total - 1):
+        areas[b] = _area(xs, ys, b - 1, b, b + 1)
+        monticulo.append((areas[b], b))
+    heapq.heapify(monticulo)
+    eliminado = bytearray(total)
+    while monticulo:
+        area, b = heapq.heappop(monticulo)
+        if eliminado[b] or area != areas[b]:
+            continue
+        if area >= umbral:
+            break
+        eliminado[b] = 1
+        a, c = anterior[b], siguiente[b]
+        siguiente[a] = c
+        anterior[c] = a
+        # Recalcular vecinos sin bajar del área del eliminado
+        for v in (a, c):
+            if 0 < v < total - 1:
+                areas[v] = max(area, _area(xs, ys, anterior[v], v, siguiente[v]))
+                heapq.heappush(monticulo, (areas[v], v))
+    return Simplificacion([i for i in range(total) if not eliminado[i]], total)
+
+METODOS = {
+    'douglas-peucker': douglasPeucker,
+    'visvalingam': visvalingam,
+}
+
+def simplificar(xs, ys, tolerancia, metodo='douglas-peucker'):
+    """
+    Simplifica la polilínea con el método indicado
+    """
+    return METODOS[metodo](xs, ys, tolerancia)
+
+def _cubos(xs, cubos):
+    """
+    Cubo de cada punto al repartir el rango de xs (no decreciente) en
+    cubos intervalos iguales
+    """
+    minimo, maximo = xs[0], xs[-1]
+    ancho = (maximo - minimo) / cubos if maximo > minimo else 1.0
+    if np is not None:
+        return np.minimum(((np.asarray(xs) - minimo) / ancho).astype(np.intp), cubos - 1)
+    return [min(int((x - minimo) / ancho), cubos - 1) for x in xs]
+
+def minimoMaximo(xs, ys, cubos):
+    """
+    Diezmado mínimo-máximo (M4): reparte la serie, con xs no decreciente,
+    en cubos columnas y conserva de cada una el primer y el último punto y
+    los de mínimo y máximo ys. Con un cubo por píxel la línea dibujada es
+    la misma y se conservan todos los picos y valles
+    """
+    total = len(xs)
+    if total <= 4 * cubos:
+        return Simplificacion(list(range(total)), total)
+    ids = _cubos(xs, cubos)
+    if np is not None:
+        ys = np.asarray(ys, dtype=np.float64)
+        inicios = np.concatenate(([0], np.flatnonzero(np.diff(ids)) + 1))
+        cuentas = np.diff(np.append(inicios, total))
+        grupos = np.repeat(np.arange(len(inicios)), cuentas)
+        elegidos = [inicios, inicios + cuentas - 1]
+        for reduccion in (np.minimum, np.maximum):
+            extremos = reduccion.reduceat(ys, inicios)
+            candidatos = np.flatnonzero(ys == extremos[grupos])
+            _, primeros = np.unique(grupos[candidatos], return_index=True)
+            elegidos.append(candidatos[primeros])
+        return Simplificacion(np.unique(np.concatenate(elegidos)), total)
+    conservar = bytearray(total)
+    inicio = 0
+    for i in range(1, total + 1):
+        if i == total or ids[i] != ids[inicio]:
+            tramo = range(inicio, i)
+            for k in (inicio, i - 1, min(tramo, key=ys.__getitem__), max(tramo, key=ys.__getitem__)):
+                conservar[k] = 1
+            inicio = i
+    return Simplificacion([i for i in range(total) if conservar[i]], total)
+
+def lttb(xs, ys, umbral):
+    """
+    Largest-Triangle-Three-Buckets: reduce la serie, con xs no
+    decreciente, a umbral puntos eligiendo en cada cubo el que forma el
+    triángulo de mayor área con el punto elegido antes y la media del
+    cubo siguiente
+    """
+    total = len(xs)
+    if umbral >= total or umbral < 3:
+        return Simplificacion(list(range(total)), total)
+    if np is not None:
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+    paso = (total - 2) / (umbral - 2)
+    indices = [0]
+    a = 0
+    for cubo in range(umbral - 2):
+        inicio = int(cubo * paso) + 1
+        fin = int((cubo + 1) * paso) + 1
+        siguiente = min(int((cubo + 2) * paso) + 1, total)
+        if np is not None:
+            mx = xs[fin:siguiente].mean() if siguiente > fin else xs[-1]
+            my = ys[fin:siguiente].mean() if siguiente > fin else ys[-1]
+            areas = np.abs((xs[a] - mx) * (ys[inicio:fin] - ys[a])
+                           - (xs[a] - xs[inicio:fin]) * (my - ys[a]))
+            a = inicio + int(np.argmax(areas))
+        else:
+            n = siguiente - fin
+            mx = sum(xs[fin:siguiente]) / n if n else xs[-1]
+            my = sum(ys[fin:siguiente]) / n if n else ys[-1]
+            a = max(range(inicio, fin),
+                    key=lambda k: abs((xs[a] - mx) * (ys[k] - ys[a]) - (xs[a] - xs[k]) * (my - ys[a])))
+        indices.append(a)
+    indices.append(total - 1)
+    return Simplificacion(indices, total)
+
+DIEZMADOS = ('min-max', 'lttb')
+
+def diezmar(xs, ys, columnas, metodo='min-max'):
+    """
+    Diezma la serie para dibujarla en columnas píxeles de ancho. Con
+    min-max se conservan hasta cuatro puntos por columna; con lttb, dos
+    """
+    if metodo == 'min-max':
+        return minimoMaximo(xs, ys, columnas)
+    if metodo == 'lttb':
+        return lttb(xs, ys, 2 * columnas)
+    raise ValueError(f"Método de diezmado desconocido: {metodo}")
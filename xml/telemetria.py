@@ -0,0 +1,260 @@
+# telemetria.py
+# -*- coding: utf-8 -*-
+""""
+Cronometraje a partir de telemetría GPS: lee un CSV con tiempo, longitud
+y latitud por bloques, empareja cada muestra con el circuito y obtiene
+los tiempos por vuelta y por sector cruzando la meta en coordenadasOrigen
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import argparse
+import csv
+import math
+from array import array
+from bisect import bisect_right
+from itertools import islice
+
+from cache import cargarCircuitoCache
+from espacial import RejillaTramos
+from indice import IndiceDistancias
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+COLUMNAS = ('tiempo', 'longitud', 'latitud')
+
+class Vuelta(object):
+    """
+    Vuelta completa: número, instante de paso por meta al empezarla,
+    tiempo total y tiempo de cada sector, en segundos
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, numero, inicio, tiempo, sectores):
+        """
+        Guarda los datos de la vuelta. sectores es una lista de
+        (número de sector, segundos) en orden de paso
+        """
+        self.numero = numero
+        self.inicio = inicio
+        self.tiempo = tiempo
+        self.sectores = sectores
+
+def formatoTiempo(segundos):
+    """
+    Texto m:ss.mmm de un tiempo en segundos
+    """
+    minutos, segundos = divmod(segundos, 60)
+    return f"{int(minutos)}:{segundos:06.3f}"
+
+def leerTelemetria(archivoCSV, tamano=65536, columnas=COLUMNAS):
+    """
+    Lee el CSV por bloques de tamano filas. columnas son los nombres en
+    la cabecera del tiempo (en segundos), la longitud y la latitud.
+    Devuelve un generador de (tiempos, longitudes, latitudes)
+    """
+    with open(archivoCSV, newline='', encoding='utf-8') as archivo:
+        lector = csv.reader(archivo)
+        cabecera = [nombre.strip() for nombre in next(lector)]
+        try:
+            posiciones = [cabecera.index(nombre) for nombre in columnas]
+        except ValueError:
+            raise ValueError(f"El CSV debe tener las columnas {', '.join(columnas)}") from None
+        while True:
+            filas = list(islice(lector, tamano))
+            if not filas:
+                return
+            yield tuple(array('d', [float(fila[p]) for fila in filas if fila]) for p in posiciones)
+
+class Cronometro(object):
+    """
+    Cronometraje incremental: procesa bloques de muestras y guarda las
+    vueltas completas. Sólo mantiene el estado de la última muestra, así
+    que la memoria no depende del tamaño de la telemetría. La vuelta en
+    curso al empezar (hasta el primer paso por meta) se descarta
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, indice, rejilla=None):
+        """
+        Prepara los límites de sector a partir del índice del circuito
+        """
+        self.indice = indice
+        self.rejilla = rejilla or RejillaTramos(indice)
+        self.total = indice.total
+        # Distancias en las que empieza cada sector (la primera, la meta)
+        sectores = indice.tramos.sector
+        self.limites = array('d', [0.0])
+        self.sectoresLimite = [sectores[0]]
+        for i in range(1, len(indice)):
+            if sectores[i] != sectores[i - 1]:
+                self.limites.append(float(indice.acumulada[i]))
+                self.sectoresLimite.append(sectores[i])
+        self.vueltas = []
+        self._anterior = None
+        self._maximo = None
+        self._actual = None
+
+    def _cuenta(self, progreso):
+        """
+        Número de límites de sector superados hasta el progreso indicado
+        """
+        vueltas = math.floor(progreso / self.total)
+        return vueltas * len(self.limites) + bisect_right(self.limites, progreso - vueltas * self.total)
+
+    def _posicion(self, q):
+        """
+        Progreso del límite número q (el primero es el 1)
+        """
+        vueltas, k = divmod(q - 1, len(self.limites))
+        return vueltas * self.total + self.limites[k]
+
+    def _progresos(self, distancias):
+        """
+        Distancia recorrida sin reiniciar en cada vuelta, a partir de la
+        distancia en la vuelta de cada muestra y de la muestra anterior
+        """
+        mitad = self.total / 2
+        if self._anterior is None:
+            base, previa = 0.0, distancias[0]
+        else:
+            base = self._anterior[1] - self._anterior[2]
+            previa = self._anterior[2]
+        if np is not None:
+            saltos = np.diff(distancias, prepend=previa)
+            correccion = np.where(saltos < -mitad, self.total, np.where(saltos > mitad, -self.total, 0.0))
+            return base + distancias + np.cumsum(correccion)
+        progresos = array('d')
+        for distancia in distancias:
+            salto = distancia - previa
+            if salto < -mitad:
+                base += self.total
+            elif salto > mitad:
+                base -= self.total
+            progresos.append(base + distancia)
+            previa = distancia
+        return progresos
+
+    def procesar(self, tiempos, longitudes, latitudes):
+        """
+        Procesa un bloque de muestras en orden temporal y devuelve las
+        vueltas completadas en él
+        """
+        if not len(tiempos):
+            return []
+        emparejamiento = self.rejilla.emparejar(longitudes, latitudes)
+        progresos = self._progresos(emparejamiento.distancias)
+        if np is not None:
+            vueltas = np.floor(progresos / self.total)
+            cuentas = (vueltas.astype(np.int64) * len(self.limites)
+                       + np.searchsorted(self.limites, progresos - vueltas * self.total, side='right'))
+        else:
+            cuentas = [self._cuenta(p) for p in progresos]
+        if self._maximo is None:
+            self._maximo = int(cuentas[0])
+        # Sólo cuentan los límites superados por primera vez: el ruido
+        # del GPS junto a un límite no genera pasos repetidos
+        if np is not None:
+            maximos = np.maximum.accumulate(np.concatenate(([self._maximo], cuentas)))
+            cruces = np.flatnonzero(cuentas > maximos[:-1])
+        else:
+            cruces = range(len(cuentas))
+        completadas = []
+        anterior = self._anterior
+        for j in cruces:
+            cuenta = int(cuentas[j])
+            if cuenta > self._maximo:
+                if j > 0:
+                    t0, p0 = tiempos[j - 1], progresos[j - 1]
+                else:
+                    t0, p0 = anterior[0], anterior[1]
+                t1, p1 = tiempos[j], progresos[j]
+                for q in range(self._maximo + 1, cuenta + 1):
+                    posicion = self._posicion(q)
+                    instante = t1 if p1 <= p0 else t0 + (posicion - p0) / (p1 - p0) * (t1 - t0)
+                    vuelta = self._paso((q - 1) % len(self.limites), float(instante))
+                    if vuelta is not None:
+                        completadas.append(vuelta)
+                self._maximo = cuenta
+        self._anterior = (tiempos[-1], float(progresos[-1]), float(emparejamiento.distancias[-1]))
+        return completadas
+
+    def _paso(self, k, instante):
+        """
+        Registra el paso por el límite k en el instante indicado y
+        devuelve la vuelta si se ha completado
+        """
+        completada = None
+        if k == 0:
+            if self._actual is not None and len(self._actual) == len(self.limites):
+                tiempos = self._actual + [instante]
+                sectores = [(self.sectoresLimite[i], tiempos[i + 1] - tiempos[i])
+                            for i in range(len(self.limites))]
+                completada = Vuelta(len(self.vueltas) + 1, tiempos[0], instante - tiempos[0], sectores)
+                self.vueltas.append(completada)
+            self._actual = [instante]
+        elif self._actual is not None:
+            self._actual.append(instante)
+        return completada
+
+    def mejorVuelta(self):
+        """
+        Vuelta más rápida, o None si no hay vueltas completas
+        """
+        return min(self.vueltas, key=lambda v: v.tiempo, default=None)
+
+def cronometrar(archivoXML, archivoCSV, tamano=65536, columnas=COLUMNAS):
+    """
+    Cronometra la telemetría del CSV sobre el circuito del XML y
+    devuelve el cronómetro con las vueltas completas
+    """
+    cronometro = Cronometro(IndiceDistancias(cargarCircuitoCache(archivoXML)))
+    for tiempos, longitudes, latitudes in leerTelemetria(archivoCSV, tamano, columnas):
+        cronometro.procesar(tiempos, longitudes, latitudes)
+    return cronometro
+
+def escribirTiempos(cronometro, nombreCSV):
+    """
+    Escribe un CSV con una fila por vuelta: número, inicio, tiempo y
+    tiempo de cada sector
+    """
+    with open(nombreCSV, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['vuelta', 'inicio', 'tiempo'] + [f"sector{s}" for s in cronometro.sectoresLimite])
+        for vuelta in cronometro.vueltas:
+            escritor.writerow([vuelta.numero, f"{vuelta.inicio:.3f}", f"{vuelta.tiempo:.3f}"]
+                              + [f"{segundos:.3f}" for _, segundos in vuelta.sectores])
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempos por vuelta y sector a partir de telemetría GPS")
+    parser.add_argument("telemetria", help="CSV con las columnas tiempo (segundos), longitud y latitud")
+    parser.add_argument("-x", "--xml", default="circuitoEsquema.xml", help="XML del circuito")
+    parser.add_argument("-o", "--salida", help="CSV de salida con los tiempos")
+    parser.add_argument("-b", "--bloque", type=int, default=65536, help="filas leídas por bloque")
+    argumentos = parser.parse_args()
+
+    try:
+        cronometro = cronometrar(argumentos.xml, argumentos.telemetria, argumentos.bloque)
+    except FileNotFoundError as e:
+        print(f"Error: No se encontró el archivo {e.filename}")
+        return 1
+    except ValueError as e:
+        print(f"Error en la telemetría: {e}")
+        return 1
+
+    for vuelta in cronometro.vueltas:
+        parciales = "  ".join(f"S{s} {formatoTiempo(t)}" for s, t in vuelta.sectores)
+        print(f"Vuelta {vuelta.numero}: {formatoTiempo(vuelta.tiempo)}  ({parciales})")
+    mejor = cronometro.mejorVuelta()
+    if mejor is None:
+        print("No se completó ninguna vuelta")
+    else:
+        print(f"Mejor vuelta: {mejor.numero} ({formatoTiempo(mejor.tiempo)})")
+    if argumentos.salida:
+        escribirTiempos(cronometro, argumentos.salida)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,247 @@
+# temporada.py
+# -*- coding: utf-8 -*-
+""""
+Clasificación de la temporada a partir de los XML de todas sus rondas:
+un índice por piloto con su clasificación mundial, victorias y rondas
+en el top 3 del mundial, que se actualiza sólo con las rondas cuyo archivo cambió y se publica
+en HTML sin volver a leer la temporada
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from archivos import buscarCircuitos, describirError
+from instrumentacion import perfil
+from manifiesto import huellaArchivo
+from modelo import LectorCircuito
+from xml2html import Html
+
+NOMBRE_ESTADO = ".temporada.json"
+VERSION = 1
+
+# Nombre que usan los documentos para un resultado aún sin disputar
+SIN_DETERMINAR = "NO DETERMINADO"
+
+# Los documentos sólo tienen el vencedor de cada carrera, no su podio: se
+# cuentan las rondas tras las que el piloto estaba entre los TOP primeros
+# del mundial
+TOP = 3
+
+def leerRonda(archivoXML):
+    """
+    Datos de una ronda para la clasificación: circuito, fecha, vencedor y
+    [posición, piloto, puntos] de <clasificacionMundial>. Los tramos se
+    descartan sin convertirlos
+    """
+    lector = LectorCircuito(archivoXML)
+    lector.saltarTramos()
+    circuito = lector.circuito
+    return {
+        'circuito': circuito.nombre,
+        'fecha': circuito.fecha,
+        'vencedor': circuito.nombre_vencedor,
+        'clasificacion': [[piloto.posicion, piloto.nombre, piloto.puntos]
+                          for piloto in circuito.clasificacion],
+    }
+
+class Temporada(object):
+    """
+    Índice de la temporada por piloto, persistente en JSON. Cada ronda
+    guarda la huella de su archivo y lo que aporta a cada piloto, así que
+    al cambiar un archivo sólo se quita y se vuelve a añadir esa ronda.
+    <puntosPiloto> es la puntuación del mundial tras la ronda, de modo que
+    los puntos de un piloto son los de su última ronda por fecha, no la
+    suma de todas
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, rutaEstado=NOMBRE_ESTADO):
+        """
+        Carga el estado guardado y reconstruye el índice desde él, sin
+        leer ningún XML
+        """
+        self.ruta = rutaEstado
+        self.datos = {'version': VERSION, 'rondas': {}}
+        try:
+            with open(self.ruta, encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+            if datos.get('version') == VERSION:
+                self.datos = datos
+        except (FileNotFoundError, ValueError):
+            pass
+        self.errores = {}
+        # piloto: {'rondas': {archivo: (fecha, posición, puntos)}, 'victorias': {archivo}}
+        self.pilotos = {}
+        for archivo, ronda in self.datos['rondas'].items():
+            self._anadir(archivo, ronda)
+
+    def _piloto(self, nombre):
+        return self.pilotos.setdefault(nombre, {'rondas': {}, 'victorias': set()})
+
+    def _anadir(self, archivo, ronda):
+        """
+        Suma al índice lo que aporta una ronda
+        """
+        clave = (ronda['fecha'] or "", archivo)
+        for posicion, nombre, puntos in ronda['clasificacion']:
+            if nombre and nombre != SIN_DETERMINAR:
+                self._piloto(nombre)['rondas'][archivo] = (clave, posicion, puntos)
+        if ronda['vencedor'] and ronda['vencedor'] != SIN_DETERMINAR:
+            self._piloto(ronda['vencedor'])['victorias'].add(archivo)
+
+    def _quitar(self, archivo):
+        """
+        Resta del índice lo que aportaba una ronda, tocando sólo sus pilotos
+        """
+        ronda = self.datos['rondas'].pop(archivo)
+        nombres = {nombre for _, nombre, _ in ronda['clasificacion']}
+        nombres.add(ronda['vencedor'])
+        for nombre in nombres:
+            piloto = self.pilotos.get(nombre)
+            if piloto is None:
+                continue
+            piloto['rondas'].pop(archivo, None)
+            piloto['victorias'].discard(archivo)
+            if not piloto['rondas'] and not piloto['victorias']:
+                del self.pilotos[nombre]
+
+    def _pendientes(self, archivos):
+        """
+        Archivos cuya ronda hay que volver a leer. Los que conservan fecha
+        y tamaño, o su huella, se dan por vigentes
+        """
+        pendientes = {}
+        for archivo in archivos:
+            ronda = self.datos['rondas'].get(archivo)
+            try:
+                estado = os.stat(archivo)
+            except FileNotFoundError as e:
+                self.errores[archivo] = describirError(e, archivo)
+                continue
+            if ronda is not None and (ronda['mtime'], ronda['tamaño']) == (estado.st_mtime_ns, estado.st_size):
+                continue
+            huella = huellaArchivo(archivo)
+            if ronda is not None and ronda['huella'] == huella:
+                ronda['mtime'], ronda['tamaño'] = estado.st_mtime_ns, estado.st_size
+                continue
+            pendientes[archivo] = {'mtime': estado.st_mtime_ns, 'tamaño': estado.st_size, 'huella': huella}
+        return pendientes
+
+    def actualizar(self, archivos, procesos=None):
+        """
+        Pone al día el índice con los archivos de la temporada: relee en
+        paralelo las rondas nuevas o cambiadas y quita las que ya no están.
+        Una ronda que no se puede leer conserva sus datos anteriores y queda
+        en errores. Devuelve los archivos releídos
+        """
+        archivos = [os.path.abspath(archivo) for archivo in archivos]
+        self.errores = {}
+        for archivo in set(self.datos['rondas']) - set(archivos):
+            self._quitar(archivo)
+        pendientes = self._pendientes(archivos)
+        if not pendientes:
+            return []
+        actualizados = []
+        with perfil.etapa('temporada'):
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                futuros = {archivo: ejecutor.submit(leerRonda, archivo) for archivo in pendientes}
+                for archivo, futuro in futuros.items():
+                    try:
+                        ronda = futuro.result()
+                    except Exception as e:
+                        self.errores[archivo] = describirError(e, archivo)
+                        continue
+                    if archivo in self.datos['rondas']:
+                        self._quitar(archivo)
+                    ronda.update(pendientes[archivo])
+                    self.datos['rondas'][archivo] = ronda
+                    self._anadir(archivo, ronda)
+                    actualizados.append(archivo)
+            perfil.contar('rondas', len(actualizados))
+        return actualizados
+
+    def rondas(self):
+        """
+        (archivo, ronda) en orden de fecha
+        """
+        return sorted(self.datos['rondas'].items(), key=lambda par: (par[1]['fecha'] or "", par[0]))
+
+    def clasificacion(self):
+        """
+        Filas (piloto, puntos, victorias, rondas en el top 3 del mundial,
+        circuito de su última ronda) ordenadas por puntos y victorias
+        """
+        filas = []
+        for nombre, piloto in self.pilotos.items():
+            puntos = ultima = None
+            if piloto['rondas']:
+                archivo, (_, _, puntos) = max(piloto['rondas'].items(), key=lambda par: par[1][0])
+                ultima = self.datos['rondas'][archivo]['circuito']
+            top = sum(1 for _, posicion, _ in piloto['rondas'].values() if posicion <= TOP)
+            filas.append((nombre, puntos or 0, len(piloto['victorias']), top, ultima))
+        filas.sort(key=lambda fila: (-fila[1], -fila[2], fila[0]))
+        return filas
+
+    def guardar(self):
+        """
+        Escribe el estado de forma atómica
+        """
+        temporal = self.ruta + ".tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            json.dump(self.datos, archivo, indent=2, sort_keys=True, ensure_ascii=False)
+        os.replace(temporal, self.ruta)
+
+def fragmentosTemporada(temporada, html=None):
+    """
+    Generador de los fragmentos del documento HTML de la temporada,
+    compuestos desde el índice, con la cabecera y las migas de pan de la
+    página de la temporada
+    """
+    if html is None:
+        html = Html("Temporada")
+    yield html.prefijo("MotoGP-Temporada", 'temporada')
+    yield "\n" + html.addSection("Clasificación de la temporada", html.addTable(
+        ("Posición", "Piloto", "Puntos", "Victorias", f"Rondas en el top {TOP}", "Última ronda"),
+        ((posicion, nombre, puntos, victorias, top, ultima or "-")
+         for posicion, (nombre, puntos, victorias, top, ultima) in enumerate(temporada.clasificacion(), 1))))
+    yield "\n" + html.addSection("Rondas", html.addTable(
+        ("Fecha", "Circuito", "Vencedor"),
+        ((ronda['fecha'], ronda['circuito'], ronda['vencedor']) for _, ronda in temporada.rondas())))
+    yield "\n" + html.sufijo()
+
+def generarTemporada(archivos, nombreHTML, rutaEstado=NOMBRE_ESTADO, procesos=None):
+    """
+    Actualiza la temporada con los archivos indicados, guarda su estado y
+    escribe el HTML. Devuelve la temporada
+    """
+    temporada = Temporada(rutaEstado)
+    temporada.actualizar(archivos, procesos)
+    temporada.guardar()
+    html = Html("Temporada")
+    html.escribirFlujo(nombreHTML, fragmentosTemporada(temporada, html))
+    return temporada
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera la clasificación de la temporada a partir de sus circuitos")
+    parser.add_argument("entrada", help="directorio o patrón glob con los XML de las rondas")
+    parser.add_argument("-o", "--salida", default="Temporada.html", help="HTML de la clasificación")
+    parser.add_argument("-e", "--estado", default=NOMBRE_ESTADO, help="archivo con el estado de la temporada")
+    parser.add_argument("-p", "--procesos", type=int, help="procesos de lectura (por defecto, uno por CPU)")
+    argumentos = parser.parse_args()
+
+    archivos = buscarCircuitos(argumentos.entrada)
+    if not archivos:
+        print(f"Error: No se encontraron archivos XML en {argumentos.entrada}")
+        return 1
+    temporada = generarTemporada(archivos, argumentos.salida, argumentos.estado, argumentos.procesos)
+    for archivo, mensaje in temporada.errores.items():
+        print(f"[ERROR] {archivo}: {mensaje}")
+    print(f"Rondas: {len(temporada.datos['rondas'])} - pilotos: {len(temporada.pilotos)}")
+    perfil.emitir("temporada")
+    return 1 if temporada.errores else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+# test_altimetria.py
+# -*- coding: utf-8 -*-
+""""
+Pruebas de las series de gráficas del Svg: el diezmado acota los
+vértices al ancho del gráfico y conserva los picos y valles
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import math
+import unittest
+
+from xml2altimetria import Svg
+
+def _serie(total, ancho, fase=0.0):
+    """
+    Serie de total puntos escalada a ancho píxeles, con un pico y un
+    valle de un solo punto
+    """
+    xs = [ancho * i / (total - 1) for i in range(total)]
+    ys = [100 + 50 * math.sin(i / 500 + fase) for i in range(total)]
+    ys[total // 3] = 500.0
+    ys[2 * total // 3] = -300.0
+    return xs, ys
+
+def _vertices(elemento):
+    return [tuple(map(float, punto.split(","))) for punto in elemento.get('points').split()]
+
+class PruebaSeries(unittest.TestCase):
+    """
+    Diezmado de una y varias series al ancho del gráfico
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    ANCHO = 200
+    TOTAL = 50000
+
+    def test_variasSeriesAcotadas(self):
+        """
+        Cada serie queda en a lo sumo cuatro vértices por píxel y conserva
+        su pico y su valle
+        """
+        svg = Svg()
+        series = [_serie(self.TOTAL, self.ANCHO, fase) + ("#FF6600", "2", "none") for fase in (0.0, 1.0)]
+        vertices = svg.addGrafico(series, self.ANCHO)
+        polilineas = svg.raiz.findall('polyline')
+        self.assertEqual(len(polilineas), 2)
+        for total, polilinea in zip(vertices, polilineas):
+            puntos = _vertices(polilinea)
+            self.assertEqual(total, len(puntos))
+            self.assertLessEqual(len(puntos), 4 * self.ANCHO)
+            ys = [y for _, y in puntos]
+            self.assertEqual(max(ys), 500.0)
+            self.assertEqual(min(ys), -300.0)
+
+    def test_lttbAcotado(self):
+        """
+        Con LTTB quedan dos vértices por píxel y también sobreviven los picos
+        """
+        svg = Svg()
+        xs, ys = _serie(self.TOTAL, self.ANCHO)
+        vertices = svg.addSerie(xs, ys, self.ANCHO, "#FF6600", "2", "none", 'lttb')
+        self.assertEqual(vertices, 2 * self.ANCHO)
+        ys = [y for _, y in _vertices(svg.raiz.find('polyline'))]
+        self.assertIn(500.0, ys)
+        self.assertIn(-300.0, ys)
+
+    def test_serieCortaYCierre(self):
+        """
+        Una serie que cabe en el gráfico no se diezma y el cierre se añade
+        tal cual al final
+        """
+        svg = Svg()
+        vertices = svg.addSerie([0, 1, 2], [5, 6, 7], self.ANCHO, "#FF6600", "2", "none",
+                                cierre=((2, 10), (0, 10)))
+        self.assertEqual(vertices, 5)
+        self.assertEqual(svg.raiz.find('polyline').get('points'), "0.0,5.0 1.0,6.0 2.0,7.0 2,10 0,10")
+
+if __name__ == "__main__":
+    unittest.main()
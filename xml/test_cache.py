@@ -0,0 +1,91 @@
+# test_cache.py
+# -*- coding: utf-8 -*-
+""""
+Pruebas de la caché binaria de tramos: lo que se escribe se recarga
+igual que del XML y la caché deja de valer cuando cambia el contenido
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from cache import CAMPOS, COLUMNAS, cargarCircuitoCache, escribirCache, leerCache, rutaCache
+from modelo import cargarCircuito
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+ORIGEN = os.path.join(DIRECTORIO, "circuitoEsquema.xml")
+
+class PruebaCache(unittest.TestCase):
+    """
+    Ida y vuelta e invalidación de la caché junto al XML
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.archivoXML = os.path.join(self.directorio, "circuitoEsquema.xml")
+        shutil.copyfile(ORIGEN, self.archivoXML)
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def _comparar(self, circuito, esperado):
+        for campo in CAMPOS:
+            self.assertEqual(getattr(circuito, campo), getattr(esperado, campo), campo)
+        self.assertEqual(vars(circuito.origen), vars(esperado.origen))
+        self.assertEqual([vars(p) for p in circuito.clasificacion],
+                         [vars(p) for p in esperado.clasificacion])
+        for atributo, _ in COLUMNAS:
+            self.assertEqual(list(getattr(circuito.tramos, atributo)),
+                             list(getattr(esperado.tramos, atributo)), atributo)
+
+    def test_idaYVuelta(self):
+        """
+        La caché recarga el mismo circuito que el XML
+        """
+        self.assertIsNone(leerCache(self.archivoXML))
+        ruta = escribirCache(self.archivoXML)
+        self.assertEqual(ruta, rutaCache(self.archivoXML))
+        circuito = leerCache(self.archivoXML)
+        self.assertIsNotNone(circuito)
+        self.assertGreater(len(circuito.tramos.altitud), 0)
+        self._comparar(circuito, cargarCircuito(self.archivoXML))
+
+    def test_mismoContenidoOtraFecha(self):
+        """
+        Cambiar sólo la fecha no invalida la caché: la huella coincide
+        """
+        escribirCache(self.archivoXML)
+        estado = os.stat(self.archivoXML)
+        os.utime(self.archivoXML, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10**9))
+        self._comparar(leerCache(self.archivoXML), cargarCircuito(self.archivoXML))
+
+    def test_contenidoCambiado(self):
+        """
+        Un cambio en el XML invalida la caché y cargarCircuitoCache la
+        regenera con los datos nuevos
+        """
+        escribirCache(self.archivoXML)
+        with open(self.archivoXML, encoding='utf-8') as archivo:
+            texto = archivo.read()
+        self.assertIn("<altitudGeo>34.20</altitudGeo>", texto)
+        with open(self.archivoXML, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto.replace("<altitudGeo>34.20</altitudGeo>", "<altitudGeo>99.50</altitudGeo>", 1))
+        self.assertIsNone(leerCache(self.archivoXML))
+        circuito = cargarCircuitoCache(self.archivoXML)
+        self.assertIn(99.50, list(circuito.tramos.altitud))
+        self._comparar(circuito, cargarCircuito(self.archivoXML))
+
+    def test_cacheCorrupta(self):
+        """
+        Una caché truncada no se usa
+        """
+        ruta = escribirCache(self.archivoXML)
+        with open(ruta, 'r+b') as archivo:
+            archivo.truncate(os.path.getsize(ruta) - 8)
+        self.assertIsNone(leerCache(self.archivoXML))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# test_espacial.py
+# -*- coding: utf-8 -*-
+""""
+Pruebas del índice espacial de los tramos: la rejilla encuentra el mismo
+tramo más cercano que revisar todos los tramos, dentro y fuera de ella
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from espacial import RejillaTramos
+from indice import IndiceDistancias
+from modelo import cargarCircuito
+from rendimiento import generarCircuitoSintetico
+
+class PruebaRejillaTramos(unittest.TestCase):
+    """
+    Compara la rejilla con la búsqueda exhaustiva de IndiceDistancias
+    sobre un circuito sintético
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    TRAMOS = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        directorio = tempfile.mkdtemp()
+        try:
+            archivoXML = os.path.join(directorio, "circuito.xml")
+            generarCircuitoSintetico(archivoXML, cls.TRAMOS)
+            cls.indice = IndiceDistancias(cargarCircuito(archivoXML))
+        finally:
+            shutil.rmtree(directorio)
+        # Puntos alrededor del trazado y algunos muy fuera de la rejilla
+        aleatorio = random.Random(2026)
+        longitudes, latitudes = [], []
+        for _ in range(200):
+            longitud, latitud, _ = cls.indice.posicion(aleatorio.uniform(0, cls.indice.total))
+            longitudes.append(longitud + aleatorio.gauss(0, 2e-4))
+            latitudes.append(latitud + aleatorio.gauss(0, 2e-4))
+        longitudes += [cls.indice.longitudes[0] + 0.05, cls.indice.longitudes[0] - 0.05]
+        latitudes += [cls.indice.latitudes[0] - 0.05, cls.indice.latitudes[0] + 0.05]
+        cls.puntos = list(zip(longitudes, latitudes))
+
+    def _comparar(self, calculado, longitud, latitud):
+        """
+        Misma separación que la búsqueda exhaustiva y una distancia
+        recorrida coherente con el tramo devuelto
+        """
+        distancia, i, separacion = calculado
+        _, _, esperada = self.indice.distanciaEnPunto(longitud, latitud)
+        self.assertAlmostEqual(separacion, esperada, places=6)
+        self.assertLessEqual(self.indice.acumulada[i], distancia + 1e-9)
+        self.assertLessEqual(distancia, self.indice.acumulada[i + 1] + 1e-9)
+
+    def test_tramoCercano(self):
+        rejilla = RejillaTramos(self.indice)
+        for longitud, latitud in self.puntos:
+            self._comparar(rejilla.tramoCercano(longitud, latitud), longitud, latitud)
+
+    def test_emparejar(self):
+        """
+        El emparejamiento por lotes da el resultado de la búsqueda
+        exhaustiva y el sector del tramo elegido
+        """
+        rejilla = RejillaTramos(self.indice)
+        longitudes, latitudes = zip(*self.puntos)
+        resultado = rejilla.emparejar(longitudes, latitudes)
+        self.assertEqual(len(resultado), len(self.puntos))
+        for k, (longitud, latitud) in enumerate(self.puntos):
+            i = int(resultado.tramos[k])
+            self._comparar((resultado.distancias[k], i, resultado.separaciones[k]), longitud, latitud)
+            self.assertEqual(resultado.sectores[k], self.indice.tramos.sector[i])
+
+    def test_celdasYBloques(self):
+        """
+        El tamaño de celda y el de bloque no cambian el resultado
+        """
+        longitudes, latitudes = zip(*self.puntos)
+        referencia = RejillaTramos(self.indice).emparejar(longitudes, latitudes)
+        for celda, bloque in ((0.5, 65536), (50.0, 7), (5000.0, 1000)):
+            resultado = RejillaTramos(self.indice, celda).emparejar(longitudes, latitudes, bloque)
+            for a, b in zip(resultado.separaciones, referencia.separaciones):
+                self.assertAlmostEqual(a, b, places=6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# test_geojson.py
+# -*- coding: utf-8 -*-
+""""
+Pruebas de los arcos del TopoJSON: las diferencias enteras de cada arco
+reconstruyen las posiciones cuantizadas del trazado
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from modelo import cargarCircuito
+from xml2geojson import ArcosCuantizados, generarTopoJSON
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+ARCHIVO_XML = os.path.join(DIRECTORIO, "circuitoEsquema.xml")
+
+def _decodificar(arco):
+    """
+    Posiciones absolutas de un arco con diferencias
+    """
+    x, y = arco[0]
+    posiciones = [(x, y)]
+    for dx, dy in arco[1:]:
+        x, y = x + dx, y + dy
+        posiciones.append((x, y))
+    return posiciones
+
+class PruebaArcosCuantizados(unittest.TestCase):
+    """
+    Arcos escritos por ArcosCuantizados y por generarTopoJSON
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def _arcos(self, bloques, trasladar=(0.0, 0.0), escala=(0.5, 0.5)):
+        """
+        Arcos JSON escritos con un arco por lista de bloques (longitudes, latitudes)
+        """
+        salida = io.StringIO()
+        arcos = ArcosCuantizados(salida, trasladar, escala)
+        for arco in bloques:
+            arcos.abrir(*arco[0])
+            for longitudes, latitudes in arco[1:]:
+                arcos.extender(longitudes, latitudes)
+            arcos.cerrar()
+        return json.loads("[" + salida.getvalue() + "]")
+
+    def test_diferenciasSinRepetidos(self):
+        """
+        Los puntos que caen en la misma posición se omiten y los arcos
+        se encadenan por su último punto
+        """
+        arcos = self._arcos([
+            [(0.0, 0.0), ([1.0, 1.1, 2.0], [0.0, 0.1, 1.0]), ([2.0, 3.0], [1.0, -1.0])],
+            [(9.0, 9.0), ([4.0], [-1.0])],
+        ])
+        self.assertEqual(arcos, [[[0, 0], [2, 0], [2, 2], [2, -4]], [[6, -2], [2, 0]]])
+        self.assertEqual(_decodificar(arcos[0]), [(0, 0), (2, 0), (4, 2), (6, -2)])
+        self.assertEqual(_decodificar(arcos[1]), [(6, -2), (8, -2)])
+
+    def test_arcoDeUnPunto(self):
+        """
+        Un arco sin desplazamiento sigue teniendo dos posiciones
+        """
+        arcos = self._arcos([[(1.0, 1.0), ([1.1], [0.9])]])
+        self.assertEqual(arcos, [[[2, 2], [0, 0]]])
+
+    def test_topologiaDelCircuito(self):
+        """
+        Los arcos decodificados y sin sus uniones repetidas son las
+        posiciones cuantizadas del trazado, de la meta a la meta
+        """
+        directorio = tempfile.mkdtemp()
+        try:
+            ruta = os.path.join(directorio, "circuito.topojson")
+            generarTopoJSON(ARCHIVO_XML, ruta)
+            with open(ruta, encoding='utf-8') as archivo:
+                topologia = json.load(archivo)
+        finally:
+            shutil.rmtree(directorio)
+        circuito = cargarCircuito(ARCHIVO_XML)
+        tramos, origen = circuito.tramos, circuito.origen
+        (kx, ky), (x0, y0) = topologia['transform']['scale'], topologia['transform']['translate']
+        longitudes = [origen.longitud] + list(tramos.longitud) + [origen.longitud]
+        latitudes = [origen.latitud] + list(tramos.latitud) + [origen.latitud]
+        esperadas = []
+        for longitud, latitud in zip(longitudes, latitudes):
+            posicion = (round((longitud - x0) / kx), round((latitud - y0) / ky))
+            if not esperadas or esperadas[-1] != posicion:
+                esperadas.append(posicion)
+
+        arcos = [_decodificar(arco) for arco in topologia['arcs']]
+        decodificadas = list(arcos[0])
+        for anterior, arco in zip(arcos, arcos[1:]):
+            self.assertEqual(arco[0], anterior[-1])
+            decodificadas.extend(arco[1:])
+        self.assertEqual(decodificadas, esperadas)
+        for x, y in decodificadas:
+            self.assertGreaterEqual(min(x, y), 0)
+            self.assertLessEqual(max(x, y), 100000 - 1)
+
+        # Un arco por tramo continuo de un sector; el trazado los une todos
+        sectores = [s for k, s in enumerate(tramos.sector) if k == 0 or tramos.sector[k - 1] != s]
+        geometrias = topologia['objects']['circuito']['geometries']
+        self.assertEqual(len(arcos), len(sectores))
+        self.assertEqual(geometrias[1]['arcs'], list(range(len(arcos))))
+        for geometria in geometrias[2:]:
+            sector = geometria['properties']['sector']
+            self.assertEqual(geometria['arcs'], [[i] for i, s in enumerate(sectores) if s == sector])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# test_geometria.py
+# -*- coding: utf-8 -*-
+""""
+Pruebas de las métricas de los tramos: el cálculo con NumPy y el de
+Python puro deben dar las mismas columnas
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import unittest
+
+import geometria
+from modelo import ColumnasTramos, Coordenadas
+
+def _bloque(puntos):
+    """
+    ColumnasTramos con tramos (longitud, latitud, altitud, distancia, sector)
+    """
+    columnas = ColumnasTramos()
+    for longitud, latitud, altitud, distancia, sector in puntos:
+        columnas.addTramo(distancia, longitud, latitud, altitud, sector)
+    return columnas
+
+class PruebaMetricas(unittest.TestCase):
+    """
+    Compara _procesarNumpy y _procesarPython sobre los mismos bloques
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    ORIGEN = Coordenadas(101.7380, 2.7600, 10.0)
+
+    def _comparar(self, bloques):
+        numpy = geometria.MetricasTramos(self.ORIGEN)
+        python = geometria.MetricasTramos(self.ORIGEN)
+        for bloque in bloques:
+            numpy._procesarNumpy(bloque)
+            numpy._previo = (bloque.longitud[-1], bloque.latitud[-1], bloque.altitud[-1])
+            python._procesarPython(bloque)
+            python._previo = (bloque.longitud[-1], bloque.latitud[-1], bloque.altitud[-1])
+        for columna in ('calculada', 'declarada', 'pendiente', 'rumbo', 'giro', 'curvatura'):
+            for a, b in zip(getattr(numpy, columna), getattr(python, columna)):
+                self.assertAlmostEqual(a, b, places=6, msg=columna)
+        self.assertEqual(list(numpy.sospechosos), list(python.sospechosos))
+        self.assertEqual(numpy.desnivel, python.desnivel)
+        self.assertAlmostEqual(numpy._rumbo, python._rumbo, places=6)
+        return numpy
+
+    @unittest.skipIf(geometria.np is None, "sin NumPy")
+    def test_primerTramoSinLongitud(self):
+        """
+        Un primer tramo de longitud cero toma el rumbo del primer tramo
+        con longitud y no produce un giro falso en el siguiente
+        """
+        metricas = self._comparar([_bloque([
+            (101.7380, 2.7600, 10.0, 0.0, 1),
+            (101.7390, 2.7600, 11.0, 111.2, 1),
+            (101.7390, 2.7610, 12.0, 111.2, 2),
+        ])])
+        self.assertAlmostEqual(metricas.rumbo[0], metricas.rumbo[1], places=6)
+        self.assertAlmostEqual(metricas.giro[1], 0.0, places=6)
+
+    @unittest.skipIf(geometria.np is None, "sin NumPy")
+    def test_bloqueSinLongitud(self):
+        """
+        Un bloque inicial sin ningún tramo con longitud y otro después
+        """
+        self._comparar([
+            _bloque([(101.7380, 2.7600, 10.0, 0.0, 1)]),
+            _bloque([(101.7380, 2.7610, 9.0, 111.2, 1), (101.7390, 2.7610, 9.5, 500.0, 2)]),
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
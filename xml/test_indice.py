@@ -0,0 +1,99 @@
+# test_indice.py
+# -*- coding: utf-8 -*-
+""""
+Pruebas del índice de distancia acumulada: posiciones en los extremos y
+en los límites de los tramos, consultas por lotes iguales a las
+individuales y proyección de puntos del trazado
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import os
+import unittest
+
+from indice import IndiceDistancias
+from modelo import Circuito, ColumnasTramos, Coordenadas, cargarCircuito
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+class PruebaIndiceDistancias(unittest.TestCase):
+    """
+    Consultas de IndiceDistancias sobre circuitoEsquema.xml
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.circuito = cargarCircuito(os.path.join(DIRECTORIO, "circuitoEsquema.xml"))
+        cls.indice = IndiceDistancias(cls.circuito)
+
+    def _medios(self):
+        """
+        Distancia a mitad de cada tramo con longitud
+        """
+        indice = self.indice
+        return [indice.acumulada[i] + indice.tramos.distancia[i] / 2
+                for i in range(len(indice)) if indice.tramos.distancia[i] > 0]
+
+    def test_extremos(self):
+        """
+        La distancia 0 es el origen y las de fuera del trazado se ajustan
+        a sus extremos
+        """
+        indice, tramos, origen = self.indice, self.circuito.tramos, self.circuito.origen
+        self.assertEqual(indice.total, sum(tramos.distancia))
+        self.assertEqual(indice.posicion(0), (origen.longitud, origen.latitud, origen.altitud))
+        self.assertEqual(indice.posicion(-10), indice.posicion(0))
+        final = (tramos.longitud[-1], tramos.latitud[-1], tramos.altitud[-1])
+        self.assertEqual(indice.posicion(indice.total), final)
+        self.assertEqual(indice.posicion(indice.total + 10), final)
+        self.assertEqual(indice.sector(indice.total + 10), tramos.sector[-1])
+
+    def test_limitesDeTramo(self):
+        """
+        Al final de cada tramo la posición es la de su vértice y la
+        distancia pertenece ya al tramo siguiente
+        """
+        indice, tramos = self.indice, self.circuito.tramos
+        for i in range(len(indice) - 1):
+            fin = indice.acumulada[i + 1]
+            for calculado, esperado in zip(indice.posicion(fin),
+                                           (tramos.longitud[i], tramos.latitud[i], tramos.altitud[i])):
+                self.assertAlmostEqual(calculado, esperado, places=9)
+            if tramos.distancia[i + 1] > 0:
+                self.assertEqual(indice.tramoEn(fin), i + 1)
+
+    def test_lotesComoIndividuales(self):
+        """
+        posiciones y sectores dan lo mismo que posicion y sector
+        """
+        indice = self.indice
+        distancias = [-5.0, 0.0] + self._medios() + [indice.total, indice.total + 5]
+        columnas = indice.posiciones(distancias)
+        sectores = list(indice.sectores(distancias))
+        for k, distancia in enumerate(distancias):
+            for calculado, esperado in zip((c[k] for c in columnas), indice.posicion(distancia)):
+                self.assertAlmostEqual(calculado, esperado, places=9)
+            self.assertEqual(sectores[k], indice.sector(distancia))
+
+    def test_distanciaEnPunto(self):
+        """
+        Un punto del trazado se proyecta sobre sí mismo y devuelve su
+        distancia recorrida
+        """
+        indice = self.indice
+        for distancia in self._medios():
+            longitud, latitud, _ = indice.posicion(distancia)
+            recorrida, i, separacion = indice.distanciaEnPunto(longitud, latitud)
+            self.assertAlmostEqual(separacion, 0.0, places=4)
+            self.assertAlmostEqual(recorrida, distancia, places=4)
+            self.assertEqual(i, indice.tramoEn(distancia))
+
+    def test_sinTramos(self):
+        circuito = Circuito()
+        circuito.origen = Coordenadas(101.7380, 2.7600, 10.0)
+        circuito.tramos = ColumnasTramos()
+        with self.assertRaises(ValueError):
+            IndiceDistancias(circuito)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# test_manifiesto.py
+# -*- coding: utf-8 -*-
+""""
+Pruebas del manifiesto de construcción: tras editar una sección del XML
+sólo quedan pendientes las salidas que dependen de ella
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from manifiesto import DEPENDENCIAS, Manifiesto
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+ORIGEN = os.path.join(DIRECTORIO, "circuitoEsquema.xml")
+
+class PruebaManifiesto(unittest.TestCase):
+    """
+    Salidas pendientes según las secciones editadas
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.archivoXML = os.path.join(self.directorio, "circuitoEsquema.xml")
+        shutil.copyfile(ORIGEN, self.archivoXML)
+        # Las salidas sólo tienen que existir
+        self.salidas = {}
+        for clave in DEPENDENCIAS:
+            self.salidas[clave] = os.path.join(self.directorio, f"salida.{clave}")
+            open(self.salidas[clave], 'w').close()
+        manifiesto = Manifiesto(self.directorio)
+        pendientes = manifiesto.pendientes(self.archivoXML, self.salidas)
+        self.assertEqual(set(pendientes), set(DEPENDENCIAS))
+        for clave, huella in pendientes.items():
+            manifiesto.registrar(clave, huella)
+        manifiesto.guardar()
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def _editar(self, antes, despues):
+        with open(self.archivoXML, encoding='utf-8') as archivo:
+            texto = archivo.read()
+        self.assertIn(antes, texto)
+        with open(self.archivoXML, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto.replace(antes, despues, 1))
+
+    def _pendientes(self):
+        return set(Manifiesto(self.directorio).pendientes(self.archivoXML, self.salidas))
+
+    def test_sinCambios(self):
+        self.assertEqual(self._pendientes(), set())
+
+    def test_seccionDeCabecera(self):
+        """
+        El patrocinador sólo aparece en el HTML
+        """
+        self._editar("<patrocinadorPrincipal>Petronas</patrocinadorPrincipal>",
+                     "<patrocinadorPrincipal>Otro</patrocinadorPrincipal>")
+        self.assertEqual(self._pendientes(), {'html'})
+
+    def test_seccionCompartida(self):
+        """
+        El país aparece en los mapas y en el HTML, no en los SVG
+        """
+        self._editar("<pais>Malasia</pais>", "<pais>Malaysia</pais>")
+        self.assertEqual(self._pendientes(), {'kml', 'kmz', 'geojson', 'topojson', 'html'})
+
+    def test_tramos(self):
+        """
+        Un tramo editado afecta a todas las salidas
+        """
+        self._editar("<altitudGeo>34.20</altitudGeo>", "<altitudGeo>99.50</altitudGeo>")
+        self.assertEqual(self._pendientes(), set(DEPENDENCIAS))
+
+    def test_salidaBorrada(self):
+        """
+        Una salida que falta se regenera aunque no cambie nada
+        """
+        os.remove(self.salidas['planta'])
+        self.assertEqual(self._pendientes(), {'planta'})
+
+    def test_espacioEnBlanco(self):
+        """
+        Cambiar el archivo sin cambiar ninguna sección no regenera nada
+        """
+        self._editar("<pais>Malasia</pais>", "<pais>Malasia</pais>  ")
+        self.assertEqual(self._pendientes(), set())
+
+if __name__ == "__main__":
+    unittest.main()
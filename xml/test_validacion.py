@@ -0,0 +1,116 @@
+# test_validacion.py
+# -*- coding: utf-8 -*-
+""""
+Pruebas de la validación con circuito.xsd en la pasada de lectura: un
+documento válido se carga y uno no válido da los errores con su línea
+sin llegar a rellenar el modelo con los datos erróneos
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from modelo import LectorCircuito
+from validacion import (ErrorValidacion, ValidadorEsquema, cargarCircuitoValidado, cargarEsquema,
+                        main)
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+VALIDO = os.path.join(DIRECTORIO, "circuitoEsquema.xml")
+SIN_ESPACIO = os.path.join(DIRECTORIO, "circuito.xml")
+
+class PruebaValidacion(unittest.TestCase):
+    """
+    Documentos válidos y no válidos contra circuito.xsd
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def _copia(self, antes, despues):
+        """
+        Copia de circuitoEsquema.xml con la primera aparición de antes
+        cambiada por despues
+        """
+        with open(VALIDO, encoding='utf-8') as archivo:
+            texto = archivo.read()
+        self.assertIn(antes, texto)
+        ruta = os.path.join(self.directorio, "circuito.xml")
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto.replace(antes, despues, 1))
+        return ruta
+
+    def test_valido(self):
+        circuito = cargarCircuitoValidado(VALIDO)
+        self.assertEqual(circuito.nombre, "Petronas Sepang International Circuit")
+        self.assertEqual(len(circuito.clasificacion), 3)
+        self.assertGreater(len(circuito.tramos), 0)
+
+    def test_sinEspacioDeNombres(self):
+        """
+        Sin el espacio de nombres nada encaja con el esquema: se informa
+        en la raíz y no se vuelca ningún dato al modelo
+        """
+        with self.assertRaises(ErrorValidacion) as contexto:
+            cargarCircuitoValidado(SIN_ESPACIO)
+        linea, mensaje = contexto.exception.errores[0]
+        self.assertEqual(linea, 3)
+        self.assertIn("espacio de nombres", mensaje)
+        lector = LectorCircuito(SIN_ESPACIO, ValidadorEsquema(cargarEsquema()))
+        self.assertEqual(len(lector.columnas()), 0)
+        self.assertIsNone(lector.circuito.nombre)
+        self.assertEqual(lector.circuito.clasificacion, [])
+
+    def test_campoNoValido(self):
+        """
+        Un valor que no cumple su tipo se informa con su línea y la
+        sección que lo contiene no se vuelca al modelo
+        """
+        ruta = self._copia("<puntosPiloto>0</puntosPiloto>", "<puntosPiloto>x</puntosPiloto>")
+        with self.assertRaises(ErrorValidacion) as contexto:
+            cargarCircuitoValidado(ruta)
+        self.assertEqual(len(contexto.exception.errores), 1)
+        linea, mensaje = contexto.exception.errores[0]
+        self.assertIn("puntosPiloto", mensaje)
+        with open(ruta, encoding='utf-8') as archivo:
+            self.assertIn("<puntosPiloto>x", archivo.readlines()[linea - 1])
+        lector = LectorCircuito(ruta, ValidadorEsquema(cargarEsquema()))
+        lector.columnas()
+        self.assertEqual(lector.circuito.clasificacion, [])
+
+    def test_tramoNoValido(self):
+        """
+        Un tramo con una altitud que no es un número no llega a las
+        columnas: convertirlo fallaría antes de informar del error
+        """
+        ruta = self._copia("<altitudGeo>34.20</altitudGeo>", "<altitudGeo>alta</altitudGeo>")
+        with self.assertRaises(ErrorValidacion):
+            cargarCircuitoValidado(ruta)
+        lector = LectorCircuito(ruta, ValidadorEsquema(cargarEsquema()))
+        self.assertNotIn(34.20, lector.columnas().altitud)
+
+    def test_mainInforma(self):
+        """
+        La línea de órdenes informa de los errores en lugar de fallar
+        """
+        salida = io.StringIO()
+        argumentos = sys.argv
+        sys.argv = ["validacion.py", SIN_ESPACIO, VALIDO]
+        try:
+            with contextlib.redirect_stdout(salida):
+                self.assertEqual(main(), 1)
+        finally:
+            sys.argv = argumentos
+        self.assertIn(f"{VALIDO}: válido", salida.getvalue())
+        self.assertIn(f"{SIN_ESPACIO}:3:", salida.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
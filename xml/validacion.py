@@ -0,0 +1,448 @@
+# validacion.py
+# -*- coding: utf-8 -*-
+""""
+Validación del XML del circuito con circuito.xsd en la misma pasada
+incremental que lee los datos. Se admite el subconjunto de XSD que usa
+circuito.xsd: elementos globales con ref, secuencias con minOccurs y
+maxOccurs, contenido simple con atributos y restricciones de longitud,
+rango y enumeración. El esquema compilado se guarda junto al XSD
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import argparse
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from datetime import date
+from xml.parsers import expat
+
+from modelo import LectorCircuito, nombreLocal
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+ESQUEMA = os.path.join(DIRECTORIO, "circuito.xsd")
+
+EXTENSION = ".compilado.json"
+
+VERSION = 1
+
+XS = '{http://www.w3.org/2001/XMLSchema}'
+
+XSI = '{http://www.w3.org/2001/XMLSchema-instance}'
+
+# Expresiones de los tipos simples de XSD usados por el esquema
+TIPOS = {
+    'string': None,
+    'decimal': re.compile(r'[+-]?(\d+(\.\d*)?|\.\d+)$'),
+    'int': re.compile(r'[+-]?\d+$'),
+    'nonNegativeInteger': re.compile(r'(\+?\d+|-0+)$'),
+    'date': re.compile(r'(-?\d{4,})-(\d{2})-(\d{2})(Z|[+-]\d{2}:\d{2})?$'),
+    'time': re.compile(r'([01]\d|2[0-3]):[0-5]\d:[0-5]\d(\.\d+)?(Z|[+-]\d{2}:\d{2})?$'),
+    'duration': re.compile(r'-?P(?=\d|T\d)(\d+Y)?(\d+M)?(\d+D)?(T(?=\d)(\d+H)?(\d+M)?(\d+(\.\d+)?S)?)?$'),
+}
+
+FACETAS = ('minLength', 'maxLength', 'minInclusive', 'maxInclusive', 'enumeration')
+
+class ErrorValidacion(ValueError):
+    """
+    El XML no cumple el esquema. errores es una lista de (línea, mensaje)
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, archivoXML, errores):
+        """
+        Guarda los errores con su línea
+        """
+        self.archivoXML = archivoXML
+        self.errores = errores
+        super().__init__(f"{len(errores)} errores de validación en {archivoXML}; "
+                         f"el primero en la línea {errores[0][0]}: {errores[0][1]}")
+
+def _noSoportado(elemento):
+    return ValueError(f"Construcción de XSD no soportada: {nombreLocal(elemento.tag)}")
+
+def _tipoSimple(elemento):
+    """
+    (tipo base, facetas) de un <xs:simpleType> con <xs:restriction>
+    """
+    restriccion = elemento.find(XS + 'restriction')
+    if restriccion is None or len(elemento) != 1:
+        raise _noSoportado(elemento)
+    facetas = {}
+    for faceta in restriccion:
+        nombre = nombreLocal(faceta.tag)
+        if nombre not in FACETAS:
+            raise _noSoportado(faceta)
+        if nombre == 'enumeration':
+            facetas.setdefault(nombre, []).append(faceta.get('value'))
+        else:
+            facetas[nombre] = float(faceta.get('value'))
+    return _tipoBase(restriccion.get('base')), facetas
+
+def _tipoBase(nombre):
+    """
+    Nombre de un tipo predefinido de XSD sin el prefijo
+    """
+    tipo = nombre.split(':')[-1]
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de XSD no soportado: {nombre}")
+    return tipo
+
+def _atributo(elemento):
+    """
+    Regla de un <xs:attribute>
+    """
+    regla = {'requerido': elemento.get('use') == 'required', 'tipo': 'string', 'facetas': {}}
+    if elemento.get('type') is not None:
+        regla['tipo'] = _tipoBase(elemento.get('type'))
+    for hijo in elemento:
+        if hijo.tag != XS + 'simpleType':
+            raise _noSoportado(hijo)
+        regla['tipo'], regla['facetas'] = _tipoSimple(hijo)
+    return regla
+
+def _secuencia(elemento):
+    """
+    Partículas [nombre, mínimo, máximo o None] de una <xs:sequence>
+    """
+    particulas = []
+    for hijo in elemento:
+        if hijo.tag != XS + 'element' or hijo.get('ref') is None:
+            raise _noSoportado(hijo)
+        maximo = hijo.get('maxOccurs', '1')
+        particulas.append([hijo.get('ref').split(':')[-1], int(hijo.get('minOccurs', '1')),
+                           None if maximo == 'unbounded' else int(maximo)])
+    return particulas
+
+def _tipoComplejo(elemento, regla):
+    """
+    Completa la regla con un <xs:complexType>
+    """
+    for hijo in elemento:
+        if hijo.tag == XS + 'sequence':
+            regla['hijos'] = _secuencia(hijo)
+        elif hijo.tag == XS + 'attribute':
+            regla['atributos'][hijo.get('name')] = _atributo(hijo)
+        elif hijo.tag == XS + 'simpleContent':
+            extension = hijo.find(XS + 'extension')
+            if extension is None:
+                raise _noSoportado(hijo)
+            regla['tipo'] = _tipoBase(extension.get('base'))
+            for atributo in extension:
+                if atributo.tag != XS + 'attribute':
+                    raise _noSoportado(atributo)
+                regla['atributos'][atributo.get('name')] = _atributo(atributo)
+        else:
+            raise _noSoportado(hijo)
+
+def compilarEsquema(archivoXSD):
+    """
+    Convierte el XSD en un diccionario de reglas por nombre de elemento,
+    serializable en JSON. Falla con ValueError si usa construcciones
+    fuera del subconjunto admitido
+    """
+    raiz = ET.parse(archivoXSD).getroot()
+    elementos = {}
+    for declaracion in raiz:
+        if declaracion.tag != XS + 'element':
+            raise _noSoportado(declaracion)
+        regla = {'tipo': None, 'facetas': {}, 'hijos': None, 'atributos': {}}
+        if declaracion.get('type') is not None:
+            regla['tipo'] = _tipoBase(declaracion.get('type'))
+        for hijo in declaracion:
+            if hijo.tag == XS + 'simpleType':
+                regla['tipo'], regla['facetas'] = _tipoSimple(hijo)
+            elif hijo.tag == XS + 'complexType':
+                _tipoComplejo(hijo, regla)
+            else:
+                raise _noSoportado(hijo)
+        elementos[declaracion.get('name')] = regla
+    return {'espacio': raiz.get('targetNamespace'), 'elementos': elementos}
+
+_compilados = {}
+
+def cargarEsquema(archivoXSD=ESQUEMA):
+    """
+    Esquema compilado: de memoria, del archivo compilado junto al XSD si
+    coinciden tamaño y fecha, o compilándolo y guardándolo de nuevo
+    """
+    estado = os.stat(archivoXSD)
+    firma = [VERSION, estado.st_size, estado.st_mtime_ns]
+    clave = os.path.abspath(archivoXSD)
+    if clave in _compilados and _compilados[clave][0] == firma:
+        return _compilados[clave][1]
+    ruta = archivoXSD + EXTENSION
+    esquema = None
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        if datos.get('firma') == firma:
+            esquema = datos['esquema']
+    except (OSError, ValueError, KeyError):
+        pass
+    if esquema is None:
+        esquema = compilarEsquema(archivoXSD)
+        try:
+            temporal = ruta + ".tmp"
+            with open(temporal, 'w', encoding='utf-8') as archivo:
+                json.dump({'firma': firma, 'esquema': esquema}, archivo)
+            os.replace(temporal, ruta)
+        except OSError:
+            # Sin permiso de escritura junto al XSD: se compila cada vez
+            pass
+    _compilados[clave] = (firma, esquema)
+    return esquema
+
+def _comprobarValor(texto, tipo, facetas):
+    """
+    Mensaje de error del valor con el tipo y las facetas, o None si es válido
+    """
+    if tipo != 'string':
+        texto = texto.strip()
+        expresion = TIPOS[tipo]
+        coincidencia = expresion.match(texto)
+        if coincidencia is None:
+            return f"'{texto}' no es un valor {tipo} válido"
+        if tipo == 'date':
+            try:
+                date(2000, int(coincidencia.group(2)), int(coincidencia.group(3)))
+            except ValueError:
+                return f"'{texto}' no es una fecha válida"
+        if tipo == 'int' and not -2 ** 31 <= int(texto) < 2 ** 31:
+            return f"'{texto}' está fuera del rango de int"
+    if 'enumeration' in facetas and texto not in facetas['enumeration']:
+        return f"'{texto}' no es uno de {', '.join(facetas['enumeration'])}"
+    if 'minLength' in facetas and len(texto) < facetas['minLength']:
+        return f"'{texto}' tiene menos de {facetas['minLength']:g} caracteres"
+    if 'maxLength' in facetas and len(texto) > facetas['maxLength']:
+        return f"'{texto[:20]}...' tiene más de {facetas['maxLength']:g} caracteres"
+    if 'minInclusive' in facetas and float(texto) < facetas['minInclusive']:
+        return f"{texto} es menor que {facetas['minInclusive']:g}"
+    if 'maxInclusive' in facetas and float(texto) > facetas['maxInclusive']:
+        return f"{texto} es mayor que {facetas['maxInclusive']:g}"
+    return None
+
+class ValidadorEsquema(object):
+    """
+    Valida en flujo los eventos start/end de iterparse con el esquema
+    compilado. Cada elemento se identifica por su número de orden en el
+    documento y las líneas de los errores se buscan al final, sólo si
+    los hay, así que la pasada normal no paga el coste de localizarlas
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, esquema):
+        """
+        Prepara las reglas por etiqueta completa y la pila de elementos
+        abiertos
+        """
+        espacio = '{' + esquema['espacio'] + '}' if esquema['espacio'] else ''
+        # Por etiqueta: (nombre, tipo, facetas, partículas, atributos, requeridos)
+        self.reglas = {}
+        for nombre, regla in esquema['elementos'].items():
+            particulas = None
+            if regla['hijos'] is not None:
+                particulas = [(espacio + hijo, hijo, minimo, maximo) for hijo, minimo, maximo in regla['hijos']]
+            requeridos = [clave for clave, atributo in regla['atributos'].items() if atributo['requerido']]
+            self.reglas[espacio + nombre] = (nombre, regla['tipo'], regla['facetas'], particulas,
+                                             regla['atributos'], requeridos)
+        self.raiz = espacio + 'circuito'
+        self.espacio = esquema['espacio']
+        self.errores = []
+        self._numero = 0
+        # Por elemento abierto: [regla, partícula actual, apariciones, número, válido]
+        self._pila = []
+
+    def _error(self, numero, mensaje):
+        self.errores.append((numero, mensaje))
+        for marco in self._pila:
+            marco[4] = False
+
+    def evento(self, evento, elemento):
+        """
+        Valida un evento. En 'end' devuelve si el elemento y todo su
+        contenido son válidos
+        """
+        if evento != 'start':
+            return self._fin(elemento)
+        self._numero += 1
+        numero = self._numero
+        etiqueta = elemento.tag
+        regla = self.reglas.get(etiqueta)
+        pila = self._pila
+        # Lo que cuelga de un elemento no válido tampoco lo es
+        valido = pila[-1][4] if pila else True
+        if pila:
+            padre = pila[-1]
+            particulas = padre[0][3] if padre[0] is not None else ()
+            # Caso habitual: el hijo es el de la partícula actual
+            if particulas and padre[1] < len(particulas) and particulas[padre[1]][0] == etiqueta:
+                maximo = particulas[padre[1]][3]
+                padre[2] += 1
+                if maximo is not None and padre[2] > maximo:
+                    pila.append([regla, 0, 0, numero, valido])
+                    self._error(numero, f"demasiados <{nombreLocal(etiqueta)}> (máximo {maximo})")
+                    return True
+            elif padre[0] is not None:
+                pila.append([regla, 0, 0, numero, valido])
+                self._hijo(padre, etiqueta, numero)
+                if regla is not None:
+                    self._atributos(regla, elemento, numero)
+                return True
+        elif etiqueta != self.raiz:
+            pila.append([regla, 0, 0, numero, valido])
+            if nombreLocal(etiqueta) == 'circuito':
+                self._error(numero, f"<circuito> debe estar en el espacio de nombres {self.espacio}")
+            else:
+                self._error(numero, f"el elemento raíz debe ser <circuito>, no <{nombreLocal(etiqueta)}>")
+            return True
+        pila.append([regla, 0, 0, numero, valido])
+        if regla is not None and (regla[5] or elemento.attrib):
+            self._atributos(regla, elemento, numero)
+        return True
+
+    def _atributos(self, regla, elemento, numero):
+        """
+        Comprueba los atributos de un elemento al abrirlo
+        """
+        nombre, atributos, requeridos = regla[0], regla[4], regla[5]
+        for clave, valor in elemento.attrib.items():
+            if clave.startswith(XSI):
+                continue
+            if clave not in atributos:
+                self._error(numero, f"<{nombre}> no admite el atributo {clave}")
+                continue
+            mensaje = _comprobarValor(valor, atributos[clave]['tipo'], atributos[clave]['facetas'])
+            if mensaje is not None:
+                self._error(numero, f"atributo {clave} de <{nombre}>: {mensaje}")
+        for clave in requeridos:
+            if clave not in elemento.attrib:
+                self._error(numero, f"falta el atributo {clave} en <{nombre}>")
+
+    def _hijo(self, padre, etiqueta, numero):
+        """
+        Avanza la secuencia del padre con un hijo que no es el de la
+        partícula actual. Un hijo que no encaja en lo que queda de la
+        secuencia se avisa sin moverla, para no arrastrar el error a los
+        hermanos siguientes
+        """
+        nombre = nombreLocal(etiqueta)
+        particulas = padre[0][3]
+        if particulas is None:
+            self._error(numero, f"<{nombre}> no puede aparecer dentro de un elemento de contenido simple")
+            return
+        posicion = padre[1]
+        while posicion < len(particulas) and particulas[posicion][0] != etiqueta:
+            posicion += 1
+        if posicion == len(particulas):
+            self._error(numero, f"<{nombre}> no esperado en esa posición")
+            return
+        for k in range(padre[1], posicion):
+            _, esperado, minimo, _ = particulas[k]
+            if (padre[2] if k == padre[1] else 0) < minimo:
+                self._error(numero, f"falta <{esperado}> antes de <{nombre}>")
+        padre[1] = posicion
+        padre[2] = 1
+
+    def _fin(self, elemento):
+        marco = self._pila.pop()
+        regla = marco[0]
+        if regla is None:
+            return marco[4]
+        nombre, tipo, facetas, particulas = regla[0], regla[1], regla[2], regla[3]
+        if particulas is not None:
+            apariciones = marco[2]
+            for _, esperado, minimo, _ in particulas[marco[1]:]:
+                if apariciones < minimo:
+                    self._pila.append(marco)
+                    self._error(marco[3], f"falta <{esperado}> en <{nombre}>"
+                                + (f" (mínimo {minimo})" if minimo > 1 else ""))
+                    self._pila.pop()
+                apariciones = 0
+            texto = elemento.text
+            if texto is not None and not texto.isspace():
+                self._pila.append(marco)
+                self._error(marco[3], f"<{nombre}> no admite texto")
+                self._pila.pop()
+        elif tipo is not None:
+            mensaje = _comprobarValor(elemento.text or "", tipo, facetas)
+            if mensaje is not None:
+                self._pila.append(marco)
+                self._error(marco[3], f"<{nombre}>: {mensaje}")
+                self._pila.pop()
+        return marco[4]
+
+def localizarLineas(archivoXML, numeros):
+    """
+    {número de elemento: línea} de los elementos indicados, con una
+    pasada de expat que sólo cuenta aperturas de elementos
+    """
+    pendientes = set(numeros)
+    lineas = {}
+    parser = expat.ParserCreate()
+    contador = [0]
+    def inicio(nombre, atributos):
+        contador[0] += 1
+        if contador[0] in pendientes:
+            lineas[contador[0]] = parser.CurrentLineNumber
+    parser.StartElementHandler = inicio
+    with open(archivoXML, 'rb') as archivo:
+        parser.ParseFile(archivo)
+    return lineas
+
+def erroresConLinea(archivoXML, validador):
+    """
+    Lista de (línea, mensaje) de los errores del validador, por línea
+    """
+    lineas = localizarLineas(archivoXML, [numero for numero, _ in validador.errores])
+    return sorted((lineas.get(numero, 0), mensaje) for numero, mensaje in validador.errores)
+
+def leerCircuitoValidado(archivoXML, archivoXSD=ESQUEMA, huellas=False):
+    """
+    Como leerCircuito, validando en la misma pasada. Lanza
+    ErrorValidacion con todos los errores si el XML no es válido
+    """
+    validador = ValidadorEsquema(cargarEsquema(archivoXSD))
+    lector = LectorCircuito(archivoXML, validador, huellas)
+    tramos = lector.columnas()
+    if validador.errores:
+        raise ErrorValidacion(archivoXML, erroresConLinea(archivoXML, validador))
+    lector.circuito.tramos = tramos
+    return lector
+
+def cargarCircuitoValidado(archivoXML, archivoXSD=ESQUEMA):
+    """
+    Como cargarCircuito, validando en la misma pasada. Lanza
+    ErrorValidacion con todos los errores si el XML no es válido
+    """
+    return leerCircuitoValidado(archivoXML, archivoXSD).circuito
+
+def main():
+    parser = argparse.ArgumentParser(description="Valida el XML de un circuito con circuito.xsd")
+    parser.add_argument("xml", nargs="*", default=["circuitoEsquema.xml"], help="XML de los circuitos")
+    parser.add_argument("-e", "--esquema", default=ESQUEMA, help="XSD con el que validar")
+    argumentos = parser.parse_args()
+
+    errores = 0
+    for archivoXML in argumentos.xml:
+        try:
+            cargarCircuitoValidado(archivoXML, argumentos.esquema)
+            print(f"{archivoXML}: válido")
+        except ErrorValidacion as e:
+            errores += 1
+            for linea, mensaje in e.errores:
+                print(f"{archivoXML}:{linea}: {mensaje}")
+        except FileNotFoundError as e:
+            errores += 1
+            print(f"Error: No se encontró el archivo {e.filename}")
+        except ET.ParseError as e:
+            errores += 1
+            print(f"{archivoXML}:{e.position[0]}: Error al parsear el archivo XML: {e}")
+        except (ValueError, TypeError) as e:
+            errores += 1
+            print(f"{archivoXML}: no válido: {e}")
+    return 1 if errores else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,7 +5,19 @@ Crea archivos SVG con el perfil altimétrico del circuito
 @version 1.0 22/Octubre/2025
 @author: Alejandro Aldea Viana - UO293873
 """
+import argparse
 import xml.etree.ElementTree as ET
+from array import array
+from instrumentacion import perfil
+from cache import cargarCircuitoCache
+from geometria import MetricasTramos
+from modelo import cargarCircuito, escalar, extremos
+from simplificacion import METODOS, diezmar, simplificar
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class Svg(object):
     """
@@ -13,12 +25,35 @@ class Svg(object):
     @version 1.0 18/Octubre/2024
     @author: Juan Manuel Cueva Lovelle. Universidad de Oviedo
     """
-    def __init__(self, width="800", height="600"):
+    def __init__(self, width="800", height="600", compacto=False):
         """
-        Crea el elemento raíz, el espacio de nombres y la versión
+        Crea el elemento raíz, el espacio de nombres y la versión.
+        En modo compacto los estilos repetidos de textos y líneas se
+        comparten como clases en un bloque <style>, las coordenadas se
+        redondean a una décima y no se indenta el documento
         """
         self.raiz = ET.Element('svg', xmlns="http://www.w3.org/2000/svg", version="2.0", 
                               width=width, height=height, viewBox=f"0 0 {width} {height}")
+        self.compacto = compacto
+        self.clases = {}
+        self.estilo = None
+
+    def _clase(self, prefijo, reglas):
+        """
+        Nombre de la clase CSS compartida por los elementos con las mismas reglas
+        """
+        clave = (prefijo, reglas)
+        if clave not in self.clases:
+            self.clases[clave] = f"{prefijo}{sum(1 for p, _ in self.clases if p == prefijo)}"
+        return self.clases[clave]
+
+    def _coordenada(self, valor):
+        """
+        Texto de una coordenada; en modo compacto, redondeada a una décima
+        """
+        if not self.compacto:
+            return str(valor)
+        return numeroCompacto(round(float(valor) * 10), 1)
 
     def addRect(self,x,y,width,height,fill, strokeWidth,stroke):
         """
@@ -47,6 +82,11 @@ class Svg(object):
         """
         Añade un elemento line
         """
+        if self.compacto:
+            c = self._coordenada
+            ET.SubElement(self.raiz,'line', x1=c(x1), y1=c(y1), x2=c(x2), y2=c(y2),
+                         **{'class': self._clase('l', f"stroke:{stroke};stroke-width:{strokeWidth}")})
+            return
         ET.SubElement(self.raiz,'line',
                      x1=str(x1),
                      y1=str(y1),
@@ -65,10 +105,70 @@ class Svg(object):
                      **{'stroke-width': str(strokeWidth)},
                      fill=fill)
 
+    def addPath(self,d,stroke,strokeWidth,fill):
+        """
+        Añade un elemento path
+        """
+        ET.SubElement(self.raiz,'path',
+                     d=d,
+                     stroke=stroke,
+                     **{'stroke-width': str(strokeWidth)},
+                     fill=fill)
+
+    def addSerie(self, xs, ys, ancho_grafico, stroke, strokeWidth, fill, diezmado='min-max', cierre=()):
+        """
+        Añade una serie de una gráfica, ya escalada a píxeles y con xs no
+        decreciente. Si tiene más de cuatro puntos por píxel del ancho del
+        gráfico se diezma con el método indicado (None lo evita), así que
+        el tamaño depende de la resolución y no de la serie. cierre son
+        puntos (x, y) añadidos al final, como las esquinas de un área
+        rellena. Devuelve el número de vértices añadidos
+        """
+        if diezmado is not None and len(xs) > 4 * ancho_grafico:
+            with perfil.etapa('diezmado'):
+                resultado = diezmar(xs, ys, ancho_grafico, diezmado)
+            resultado.contar('diezmado')
+            xs, ys = resultado.aplicar(xs), resultado.aplicar(ys)
+        inicio = perfil.reloj()
+        if self.compacto:
+            xs = _unir([xs, array('d', [x for x, _ in cierre])])
+            ys = _unir([ys, array('d', [y for _, y in cierre])])
+            self.addPath(trazoRelativo(xs, ys), stroke, strokeWidth, fill)
+            perfil.acumular('cadenas', inicio, len(xs))
+            return len(xs)
+        puntos = list(map("{:.1f},{:.1f}".format, xs, ys))
+        puntos.extend(f"{x},{y}" for x, y in cierre)
+        self.addPolyline(" ".join(puntos), stroke, strokeWidth, fill)
+        perfil.acumular('cadenas', inicio, len(puntos))
+        return len(puntos)
+
+    def addGrafico(self, series, ancho_grafico, diezmado='min-max'):
+        """
+        Añade varias series a la misma gráfica, cada una diezmada por
+        separado al ancho del gráfico. Cada serie es (xs, ys, stroke,
+        strokeWidth, fill) y, opcionalmente, sus puntos de cierre.
+        Devuelve los vértices añadidos de cada serie
+        """
+        vertices = []
+        for xs, ys, stroke, strokeWidth, fill, *cierre in series:
+            vertices.append(self.addSerie(xs, ys, ancho_grafico, stroke, strokeWidth, fill, diezmado, *cierre))
+        return vertices
+
     def addText(self,texto,x,y,fontFamily,fontSize,style):
         """
         Añade un elemento texto
         """
+        if self.compacto:
+            reglas = f"font-family:{fontFamily};font-size:{fontSize}px"
+            if style:
+                reglas += ";" + ";".join(":".join(p.strip() for p in declaracion.split(":", 1))
+                                         for declaracion in style.split(";") if declaracion.strip())
+            elemento_texto = ET.SubElement(self.raiz,'text',
+                                         x=self._coordenada(x),
+                                         y=self._coordenada(y),
+                                         **{'class': self._clase('t', reglas)})
+            elemento_texto.text = texto
+            return
         elemento_texto = ET.SubElement(self.raiz,'text',
                                      x=str(x),
                                      y=str(y),
@@ -83,14 +183,24 @@ class Svg(object):
         Escribe el archivo SVG con declaración y codificación
         """
         arbol = ET.ElementTree(self.raiz)
-        """
-        Introduce indentación y saltos de línea
-        para generar XML en modo texto
-        """
-        ET.indent(arbol)
-        arbol.write(nombreArchivoSVG,
-                   encoding='utf-8',
-                   xml_declaration=True)
+        perfil.contar('elementos_svg', len(self.raiz))
+        if self.compacto:
+            # Clases compartidas al principio y sin espacios de indentación
+            if self.estilo is None:
+                self.estilo = ET.Element('style')
+                self.raiz.insert(0, self.estilo)
+            self.estilo.text = "".join(f".{clase}{{{reglas}}}" for (_, reglas), clase in self.clases.items())
+        else:
+            """
+            Introduce indentación y saltos de línea
+            para generar XML en modo texto
+            """
+            with perfil.etapa('indent'):
+                ET.indent(arbol)
+        with perfil.etapa('escritura'):
+            arbol.write(nombreArchivoSVG,
+                       encoding='utf-8',
+                       xml_declaration=True)
 
     def ver(self):
         """
@@ -111,7 +221,216 @@ class Svg(object):
                 print("Contenido = ", hijo.text)
             print("Atributos = ", hijo.attrib)
 
-def main():
+def numeroCompacto(entero, decimales):
+    """
+    Texto más corto del número entero / 10^decimales: sin ceros
+    sobrantes ni cero inicial ("-0.5" pasa a "-.5")
+    """
+    if decimales == 0:
+        return str(entero)
+    signo = "-" if entero < 0 else ""
+    parte_entera, parte_decimal = divmod(abs(entero), 10 ** decimales)
+    decimal = f"{parte_decimal:0{decimales}d}".rstrip("0")
+    if not decimal:
+        return f"{signo}{parte_entera}"
+    return f"{signo}{parte_entera or ''}.{decimal}"
+
+def trazoRelativo(xs, ys, decimales=1):
+    """
+    Atributo d de un path con la polilínea xs, ys: un moveto absoluto y
+    lineto relativos. Las coordenadas se cuantizan antes de restar, así
+    que los redondeos no se acumulan
+    """
+    escala = 10 ** decimales
+    if np is not None:
+        qx = np.rint(np.asarray(xs, dtype=np.float64) * escala).astype(np.int64).tolist()
+        qy = np.rint(np.asarray(ys, dtype=np.float64) * escala).astype(np.int64).tolist()
+    else:
+        qx = [round(x * escala) for x in xs]
+        qy = [round(y * escala) for y in ys]
+    partes = [f"M{numeroCompacto(qx[0], decimales)} {numeroCompacto(qy[0], decimales)}"]
+    # Un único punto es sólo el moveto: un lineto sin argumentos no es válido
+    if len(qx) > 1:
+        partes.append("l")
+    anterior = ""
+    for i in range(1, len(qx)):
+        for valor in (qx[i] - qx[i - 1], qy[i] - qy[i - 1]):
+            texto = numeroCompacto(valor, decimales)
+            # Un signo menos, o un punto tras un número con decimales,
+            # ya separa los números
+            if anterior and not (texto[0] == "-" or (texto[0] == "." and "." in anterior)):
+                partes.append(" ")
+            partes.append(texto)
+            anterior = texto
+    return "".join(partes)
+
+def _unir(columnas):
+    """
+    Concatena columnas escaladas: un array de NumPy o, sin NumPy, un
+    array('d')
+    """
+    if np is not None:
+        return np.concatenate([np.asarray(columna, dtype=np.float64) for columna in columnas])
+    unida = array('d')
+    for columna in columnas:
+        unida.extend(columna)
+    return unida
+
+def crearSVG(circuito, primera_pasada, segunda_pasada, tolerancia=None, metodo='douglas-peucker',
+             diezmado='min-max', compacto=False, geometria=False):
+    """
+    Construye el Svg del perfil altimétrico. Recibe dos iterables de
+    ColumnasTramos con los mismos tramos: la primera pasada calcula los
+    rangos y la segunda los puntos. Con tolerancia (en píxeles) se
+    simplifica el perfil. Si quedan más puntos de los que caben en el
+    ancho del gráfico se diezman con el método indicado (None lo evita).
+    En modo compacto el perfil es un path con coordenadas relativas.
+    Con geometria se calculan en la primera pasada las métricas de los
+    tramos y se añade el desnivel y la pendiente bajo el título
+    """
+    nombre_circuito = circuito.nombre
+    localidad = circuito.localidad
+    altitud_origen = circuito.origen.altitud
+    
+    # Primera pasada: rangos. Cada bloque son columnas contiguas: suma acumulada y extremos
+    # se calculan sobre la columna completa, no punto a punto
+    max_distancia = 0
+    max_altitud = min_altitud = altitud_origen
+    metricas = MetricasTramos(circuito.origen) if geometria else None
+    for bloque in primera_pasada:
+        max_distancia = float(bloque.distanciaAcumulada(max_distancia)[-1])
+        minimo, maximo = extremos(bloque.altitud)
+        max_altitud = max(max_altitud, maximo)
+        min_altitud = min(min_altitud, minimo)
+        if metricas is not None:
+            metricas.procesar(bloque)
+    
+    # Configuración del SVG
+    ancho_svg = 1000
+    alto_svg = 600
+    margen = 80
+    
+    # Área de dibujo
+    ancho_grafico = ancho_svg - 2 * margen
+    alto_grafico = alto_svg - 2 * margen
+    
+    # Escalas
+    rango_altitud = max_altitud - min_altitud
+    
+    # Crear objeto SVG
+    nuevoSVG = Svg(str(ancho_svg), str(alto_svg), compacto)
+    
+    nuevoSVG.addRect(0, 0, ancho_svg, alto_svg, "#0A1A2F", "0", "none")
+    
+    # Añadir título
+    nuevoSVG.addText(f"Perfil Altimétrico - {nombre_circuito}", 
+                    ancho_svg//2, 30, "Trebuchet MS", "18", "text-anchor: middle; font-weight: bold; fill: #FF6600")
+    nuevoSVG.addText(f"{localidad}", 
+                    ancho_svg//2, 50, "Trebuchet MS", "14", "text-anchor: middle; fill: #E0E0E0")
+    
+    # Métricas de los tramos bajo el título
+    if metricas is not None and len(metricas):
+        texto = (f"Desnivel +{metricas.ascenso:.1f} m / -{metricas.descenso:.1f} m - "
+                 f"Pendiente máx. {max(metricas.pendiente):.1f} % / mín. {min(metricas.pendiente):.1f} %")
+        if len(metricas.sospechosos):
+            texto += f" - {len(metricas.sospechosos)} tramos con distancia sospechosa"
+        nuevoSVG.addText(texto, ancho_svg//2, 68, "Trebuchet MS", "12", "text-anchor: middle; fill: #CCCCCC")
+    
+    # Segunda pasada: escalado de las columnas completas
+    # a coordenadas del SVG para la polilínea del perfil
+    # Un perfil llano o sin distancia no debe dividir por cero
+    def escalarBloque(distancias, altitudes):
+        xs = escalar(distancias, 0, max_distancia or 1.0, margen, ancho_grafico)
+        ys = escalar(altitudes, min_altitud, rango_altitud or 1.0, alto_svg - margen, -alto_grafico)
+        return xs, ys
+    
+    # Los bloques escalados se unen al final: con NumPy en un único array,
+    # sin pasar por objetos float de Python
+    xs, ys = escalarBloque([0], [altitud_origen])
+    bloques_x, bloques_y = [xs], [ys]
+    distancia_acumulada = 0
+    for bloque in segunda_pasada:
+        distancias = bloque.distanciaAcumulada(distancia_acumulada)
+        distancia_acumulada = float(distancias[-1])
+        inicio = perfil.reloj()
+        xs, ys = escalarBloque(distancias, bloque.altitud)
+        bloques_x.append(xs)
+        bloques_y.append(ys)
+        perfil.acumular('escalado', inicio, len(bloque))
+    xs_perfil, ys_perfil = _unir(bloques_x), _unir(bloques_y)
+    
+    # Simplificación opcional con tolerancia en píxeles
+    if tolerancia is not None:
+        with perfil.etapa('simplificacion'):
+            resultado = simplificar(xs_perfil, ys_perfil, tolerancia, metodo)
+        resultado.contar('simplificacion')
+        xs_perfil = resultado.aplicar(xs_perfil)
+        ys_perfil = resultado.aplicar(ys_perfil)
+    
+    # Añadir el perfil diezmado a la resolución del gráfico (a lo sumo
+    # cuatro puntos por píxel), cerrado por las esquinas inferiores
+    # derecha e izquierda para crear efecto suelo
+    nuevoSVG.addSerie(xs_perfil, ys_perfil, ancho_grafico, "#FF6600", "3", "rgba(255, 102, 0, 0.15)",
+                      diezmado, ((ancho_svg - margen, alto_svg - margen), (margen, alto_svg - margen)))
+    
+    # Añadir ejes
+    # Eje horizontal (distancias)
+    nuevoSVG.addLine(margen, alto_svg - margen, ancho_svg - margen, alto_svg - margen, "#E0E0E0", "2")
+    
+    # Eje vertical (altitudes)
+    nuevoSVG.addLine(margen, margen, margen, alto_svg - margen, "#E0E0E0", "2")
+    
+    # Etiquetas del eje horizontal (distancias)
+    num_marcas_dist = 5
+    for i in range(num_marcas_dist + 1):
+        distancia = (max_distancia / num_marcas_dist) * i
+        x = margen + (i / num_marcas_dist) * ancho_grafico
+        y = alto_svg - margen + 15
+        nuevoSVG.addText(f"{distancia:.0f}m", x, y, "Trebuchet MS", "12", "text-anchor: middle; fill: #CCCCCC")
+        # Línea de marca
+        nuevoSVG.addLine(x, alto_svg - margen, x, alto_svg - margen + 5, "#E0E0E0", "1")
+    
+    # Etiquetas del eje vertical (altitudes)
+    num_marcas_alt = 5
+    for i in range(num_marcas_alt + 1):
+        altitud = min_altitud + (rango_altitud / num_marcas_alt) * i
+        x = margen - 10
+        y = alto_svg - margen - (i / num_marcas_alt) * alto_grafico + 5
+        nuevoSVG.addText(f"{altitud:.1f}m", x, y, "Trebuchet MS", "12", "text-anchor: end; fill: #CCCCCC")
+        # Línea de marca
+        nuevoSVG.addLine(margen - 5, y - 5, margen, y - 5, "#E0E0E0", "1")
+    
+    # Etiquetas de los ejes
+    nuevoSVG.addText("Distancia (m)", ancho_svg//2, alto_svg - 20, "Trebuchet MS", "14", "text-anchor: middle; font-weight: bold; fill: #E0E0E0")
+    nuevoSVG.addText("Altitud (m)", 20, alto_svg//2, "Trebuchet MS", "14", "text-anchor: middle; font-weight: bold; writing-mode: tb; glyph-orientation-vertical: 0; fill: #E0E0E0")
+    
+    return nuevoSVG
+
+def generarAltimetria(archivoXML, nombreSVG, tolerancia=None, metodo='douglas-peucker',
+                      diezmado='min-max', compacto=False, geometria=False, cache=False):
+    """
+    Genera el SVG con el perfil altimétrico. Con tolerancia (en píxeles)
+    simplifica el perfil; los perfiles más densos que el gráfico se
+    diezman. compacto genera el SVG reducido para servir en la web.
+    geometria añade el desnivel y la pendiente calculados de los tramos.
+    Con cache lee los tramos de la caché binaria.
+    Los errores se propagan al llamador
+    """
+    # El perfil escalado ocupa tanto como las columnas: se leen una sola
+    # vez (del archivo o de la caché) y las dos pasadas las recorren
+    circuito = cargarCircuitoCache(archivoXML) if cache else cargarCircuito(archivoXML)
+    nuevoSVG = crearSVG(circuito, [circuito.tramos], [circuito.tramos],
+                        tolerancia, metodo, diezmado, compacto, geometria)
+    
+    # Escribir el archivo SVG
+    nuevoSVG.escribir(nombreSVG)
+
+def main(tolerancia=None, metodo='douglas-peucker', compacto=False, geometria=False):
+    """
+    Genera altimetria.svg. Con tolerancia (en píxeles) simplifica el
+    perfil; compacto genera la versión reducida para la web y geometria
+    añade las métricas calculadas de los tramos
+    """
     print(Svg.__doc__)
     
     # Nombre del archivo de entrada y salida
@@ -119,110 +438,8 @@ def main():
     nombreSVG = "altimetria.svg"
     
     try:
-        # Leer y parsear el archivo XML
-        arbol = ET.parse(archivoXML)
-        raiz = arbol.getroot()
-        
-        # Definir el namespace
-        namespace = {'c': 'http://www.uniovi.es'}
-        
-        # Obtener información del circuito usando XPath
-        nombre_circuito = raiz.find('.//c:nombre', namespace).text
-        localidad = raiz.find('.//c:localidad', namespace).text
-        
-        # Obtener altitud y distancia de origen usando XPath
-        altitud_origen = float(raiz.find('.//c:coordenadasOrigen/c:altitudGeo', namespace).text)
-        
-        # Obtener todas las distancias y altitudes de los tramos usando XPath
-        distancias = raiz.findall('.//c:tramo/c:distancia', namespace)
-        altitudes = raiz.findall('.//c:tramo/c:coordenadas/c:altitudGeo', namespace)
-        
-        # Procesar datos para el perfil altimétrico
-        distancia_acumulada = [0]  # Empezar en 0
-        lista_altitudes = [altitud_origen]  # Empezar con altitud de origen
-        
-        distancia_total = 0
-        for i in range(len(distancias)):
-            distancia_total += float(distancias[i].text)
-            distancia_acumulada.append(distancia_total)
-            lista_altitudes.append(float(altitudes[i].text))
-        
-        # Configuración del SVG
-        ancho_svg = 1000
-        alto_svg = 600
-        margen = 80
-        
-        # Área de dibujo
-        ancho_grafico = ancho_svg - 2 * margen
-        alto_grafico = alto_svg - 2 * margen
-        
-        # Escalas
-        max_distancia = max(distancia_acumulada)
-        max_altitud = max(lista_altitudes)
-        min_altitud = min(lista_altitudes)
-        rango_altitud = max_altitud - min_altitud
-        
-        # Crear objeto SVG
-        nuevoSVG = Svg(str(ancho_svg), str(alto_svg))
-        
-        nuevoSVG.addRect(0, 0, ancho_svg, alto_svg, "#0A1A2F", "0", "none")
-        
-        # Añadir título
-        nuevoSVG.addText(f"Perfil Altimétrico - {nombre_circuito}", 
-                        ancho_svg//2, 30, "Trebuchet MS", "18", "text-anchor: middle; font-weight: bold; fill: #FF6600")
-        nuevoSVG.addText(f"{localidad}", 
-                        ancho_svg//2, 50, "Trebuchet MS", "14", "text-anchor: middle; fill: #E0E0E0")
-        
-        # Construir puntos para la polilínea del perfil
-        puntos_perfil = []
-        for i in range(len(distancia_acumulada)):
-            x = margen + (distancia_acumulada[i] / max_distancia) * ancho_grafico
-            y = alto_svg - margen - ((lista_altitudes[i] - min_altitud) / rango_altitud) * alto_grafico
-            puntos_perfil.append(f"{x:.1f},{y:.1f}")
-        
-        # Cerrar la polilínea para crear efecto suelo
-        puntos_perfil.append(f"{ancho_svg - margen},{alto_svg - margen}")  # Esquina inferior derecha
-        puntos_perfil.append(f"{margen},{alto_svg - margen}")  # Esquina inferior izquierda
-        
-        puntos_str = " ".join(puntos_perfil)
-        
-        # Añadir la polilínea del perfil altimétrico
-        nuevoSVG.addPolyline(puntos_str, "#FF6600", "3", "rgba(255, 102, 0, 0.15)")
-        
-        # Añadir ejes
-        # Eje horizontal (distancias)
-        nuevoSVG.addLine(margen, alto_svg - margen, ancho_svg - margen, alto_svg - margen, "#E0E0E0", "2")
-        
-        # Eje vertical (altitudes)
-        nuevoSVG.addLine(margen, margen, margen, alto_svg - margen, "#E0E0E0", "2")
-        
-        # Etiquetas del eje horizontal (distancias)
-        num_marcas_dist = 5
-        for i in range(num_marcas_dist + 1):
-            distancia = (max_distancia / num_marcas_dist) * i
-            x = margen + (i / num_marcas_dist) * ancho_grafico
-            y = alto_svg - margen + 15
-            nuevoSVG.addText(f"{distancia:.0f}m", x, y, "Trebuchet MS", "12", "text-anchor: middle; fill: #CCCCCC")
-            # Línea de marca
-            nuevoSVG.addLine(x, alto_svg - margen, x, alto_svg - margen + 5, "#E0E0E0", "1")
-        
-        # Etiquetas del eje vertical (altitudes)
-        num_marcas_alt = 5
-        for i in range(num_marcas_alt + 1):
-            altitud = min_altitud + (rango_altitud / num_marcas_alt) * i
-            x = margen - 10
-            y = alto_svg - margen - (i / num_marcas_alt) * alto_grafico + 5
-            nuevoSVG.addText(f"{altitud:.1f}m", x, y, "Trebuchet MS", "12", "text-anchor: end; fill: #CCCCCC")
-            # Línea de marca
-            nuevoSVG.addLine(margen - 5, y - 5, margen, y - 5, "#E0E0E0", "1")
-        
-        # Etiquetas de los ejes
-        nuevoSVG.addText("Distancia (m)", ancho_svg//2, alto_svg - 20, "Trebuchet MS", "14", "text-anchor: middle; font-weight: bold; fill: #E0E0E0")
-        nuevoSVG.addText("Altitud (m)", 20, alto_svg//2, "Trebuchet MS", "14", "text-anchor: middle; font-weight: bold; writing-mode: tb; glyph-orientation-vertical: 0; fill: #E0E0E0")
-        
-        # Escribir el archivo SVG
-        nuevoSVG.escribir(nombreSVG)
-
+        generarAltimetria(archivoXML, nombreSVG, tolerancia, metodo, compacto=compacto,
+                          geometria=geometria)
         
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo {archivoXML}")
@@ -230,6 +447,16 @@ def main():
         print(f"Error al parsear el archivo XML: {e}")
     except Exception as e:
         print(f"Error inesperado: {e}")
+    
+    perfil.emitir("xml2altimetria")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Genera altimetria.svg con el perfil altimétrico del circuito")
+    parser.add_argument("-c", "--compacto", action="store_true",
+                        help="SVG reducido para la web: path relativo y estilos en clases")
+    parser.add_argument("-t", "--tolerancia", type=float,
+                        help="simplifica el perfil con esta tolerancia en píxeles")
+    parser.add_argument("-m", "--metodo", choices=sorted(METODOS), default='douglas-peucker',
+                        help="método de simplificación (por defecto douglas-peucker)")
+    argumentos = parser.parse_args()
+    main(argumentos.tolerancia, argumentos.metodo, compacto=argumentos.compacto) 
\ No newline at end of file
@@ -0,0 +1,344 @@
+# xml2geojson.py
+# -*- coding: utf-8 -*-
+""""
+Crea archivos GeoJSON y TopoJSON con el trazado, la meta y los sectores
+del circuito, escritos en flujo para los clientes de mapas web
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import json
+import xml.etree.ElementTree as ET
+from instrumentacion import perfil
+from cache import cargarCircuitoCache
+from modelo import cargarCircuito
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _propiedades(propiedades):
+    """
+    Texto JSON compacto de las propiedades de un objeto, sin escapar los acentos
+    """
+    return json.dumps(propiedades, ensure_ascii=False, separators=(',', ':'))
+
+def _cortesSector(sectores):
+    """
+    Genera (sector, inicio, fin) de cada tramo continuo de un mismo sector
+    dentro de un bloque
+    """
+    if np is not None:
+        cortes = (np.flatnonzero(np.diff(np.asarray(sectores))) + 1).tolist()
+    else:
+        cortes = [i for i in range(1, len(sectores)) if sectores[i] != sectores[i - 1]]
+    for a, b in zip([0] + cortes, cortes + [len(sectores)]):
+        yield sectores[a], a, b
+
+def _lista(columna):
+    """
+    Columna como lista de float de Python para darles formato
+    """
+    return columna.tolist() if hasattr(columna, 'tolist') else list(columna)
+
+class GeoJsonFlujo(object):
+    """
+    Escribe una FeatureCollection GeoJSON en flujo, directamente al archivo.
+    Las coordenadas de las líneas se escriben por bloques según llegan
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, nombreGeoJSON, decimales=None):
+        """
+        Abre el archivo y escribe el inicio de la colección. Con decimales
+        se redondean las coordenadas; sin ellos se escriben completas
+        """
+        self.archivo = open(nombreGeoJSON, 'w', encoding='utf-8')
+        self.formato = "[{},{}]" if decimales is None else f"[{{:.{decimales}f}},{{:.{decimales}f}}]"
+        self._primero = True
+        self._puntos = 0
+        self.archivo.write('{"type":"FeatureCollection","features":[')
+
+    def _abrirObjeto(self):
+        self.archivo.write("\n" if self._primero else ",\n")
+        self._primero = False
+
+    def addPunto(self, propiedades, long, lat):
+        """
+        Escribe un Feature con un Point
+        """
+        perfil.contar('features')
+        self._abrirObjeto()
+        self.archivo.write('{"type":"Feature","properties":' + _propiedades(propiedades)
+                           + ',"geometry":{"type":"Point","coordinates":'
+                           + self.formato.format(long, lat) + '}}')
+
+    def abrirLinea(self, propiedades):
+        """
+        Empieza un Feature con un LineString; las coordenadas se añaden
+        con addCoordenadas y se termina con cerrarLinea
+        """
+        perfil.contar('features')
+        self._abrirObjeto()
+        self._puntos = 0
+        self.archivo.write('{"type":"Feature","properties":' + _propiedades(propiedades)
+                           + ',"geometry":{"type":"LineString","coordinates":[')
+
+    def addCoordenadas(self, longitudes, latitudes):
+        """
+        Escribe un bloque de coordenadas de la línea abierta
+        """
+        if not len(longitudes):
+            return
+        inicio = perfil.reloj()
+        texto = ",".join(map(self.formato.format, _lista(longitudes), _lista(latitudes)))
+        perfil.acumular('cadenas', inicio, len(longitudes))
+        with perfil.etapa('escritura'):
+            self.archivo.write(texto if not self._puntos else "," + texto)
+        self._puntos += len(longitudes)
+
+    def cerrarLinea(self):
+        """
+        Termina el LineString abierto
+        """
+        self.archivo.write(']}}')
+
+    def cerrar(self):
+        """
+        Cierra la colección y libera el archivo
+        """
+        self.archivo.write('\n]}\n')
+        with perfil.etapa('escritura'):
+            self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.archivo.close()
+
+def escribirGeoJSON(circuito, primera_pasada, segunda_pasada, nombreGeoJSON, decimales=None):
+    """
+    Escribe en flujo la meta, el trazado completo y un LineString por cada
+    tramo continuo de un sector. Recibe dos iterables de ColumnasTramos con
+    los mismos tramos: la primera pasada escribe el trazado y la segunda
+    los sectores. Como en el KML, la línea empieza y acaba en la meta
+    """
+    origen = circuito.origen
+    with GeoJsonFlujo(nombreGeoJSON, decimales) as nuevoGeoJSON:
+        # Añadir el punto de la meta
+        nuevoGeoJSON.addPunto({'nombre': 'Línea de Meta',
+                               'descripcion': f'{circuito.nombre} - {circuito.localidad}, {circuito.pais}'},
+                              origen.longitud, origen.latitud)
+
+        # Añadir la línea del circuito
+        nuevoGeoJSON.abrirLinea({'nombre': f"Trazado {circuito.nombre}"})
+        nuevoGeoJSON.addCoordenadas([origen.longitud], [origen.latitud])
+        for bloque in primera_pasada:
+            nuevoGeoJSON.addCoordenadas(bloque.longitud, bloque.latitud)
+        nuevoGeoJSON.addCoordenadas([origen.longitud], [origen.latitud])
+        nuevoGeoJSON.cerrarLinea()
+
+        # Añadir los sectores: cada uno empieza donde acabó el anterior
+        sector = None
+        ultimo = (origen.longitud, origen.latitud)
+        for bloque in segunda_pasada:
+            for s, a, b in _cortesSector(bloque.sector):
+                if s != sector:
+                    if sector is not None:
+                        nuevoGeoJSON.cerrarLinea()
+                    sector = s
+                    nuevoGeoJSON.abrirLinea({'nombre': f"Sector {s}", 'sector': s})
+                    nuevoGeoJSON.addCoordenadas([ultimo[0]], [ultimo[1]])
+                nuevoGeoJSON.addCoordenadas(bloque.longitud[a:b], bloque.latitud[a:b])
+                ultimo = (bloque.longitud[b - 1], bloque.latitud[b - 1])
+        if sector is not None:
+            nuevoGeoJSON.addCoordenadas([origen.longitud], [origen.latitud])
+            nuevoGeoJSON.cerrarLinea()
+
+class ArcosCuantizados(object):
+    """
+    Escribe en flujo los arcos de una topología TopoJSON cuantizada: cada
+    arco empieza con su posición absoluta y sigue con diferencias enteras
+    respecto al punto anterior, sin los puntos repetidos
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, archivo, trasladar, escala):
+        """
+        Guarda el archivo y la transformación (trasladar y escala por eje)
+        """
+        self.archivo = archivo
+        self.trasladar = trasladar
+        self.escala = escala
+        self.previo = None
+        self.arcos = 0
+        self._puntos = 0
+
+    def cuantizar(self, longitudes, latitudes):
+        """
+        Columnas enteras (xs, ys) de las posiciones cuantizadas
+        """
+        (x0, y0), (kx, ky) = self.trasladar, self.escala
+        if np is not None:
+            return (np.rint((np.asarray(longitudes) - x0) / kx).astype(np.int64),
+                    np.rint((np.asarray(latitudes) - y0) / ky).astype(np.int64))
+        return ([round((v - x0) / kx) for v in longitudes],
+                [round((v - y0) / ky) for v in latitudes])
+
+    def abrir(self, longitud, latitud):
+        """
+        Empieza un arco en el final del anterior o, si es el primero, en
+        la posición indicada
+        """
+        if self.previo is None:
+            xs, ys = self.cuantizar([longitud], [latitud])
+            self.previo = (int(xs[0]), int(ys[0]))
+        self.archivo.write(("" if not self.arcos else ",") + "\n[" + "[{},{}]".format(*self.previo))
+        self.arcos += 1
+        self._puntos = 1
+
+    def extender(self, longitudes, latitudes):
+        """
+        Añade un bloque de posiciones al arco abierto
+        """
+        if not len(longitudes):
+            return
+        inicio = perfil.reloj()
+        xs, ys = self.cuantizar(longitudes, latitudes)
+        if np is not None:
+            dx = np.diff(xs, prepend=self.previo[0])
+            dy = np.diff(ys, prepend=self.previo[1])
+            distintos = (dx != 0) | (dy != 0)
+            dx, dy = dx[distintos].tolist(), dy[distintos].tolist()
+        else:
+            dx, dy = [], []
+            px, py = self.previo
+            for x, y in zip(xs, ys):
+                if x != px or y != py:
+                    dx.append(x - px)
+                    dy.append(y - py)
+                    px, py = x, y
+        self.previo = (int(xs[-1]), int(ys[-1]))
+        if dx:
+            self.archivo.write("," + ",".join(map("[{},{}]".format, dx, dy)))
+            self._puntos += len(dx)
+        perfil.acumular('cadenas', inicio, len(longitudes))
+
+    def cerrar(self):
+        """
+        Termina el arco abierto; un arco necesita al menos dos posiciones
+        """
+        self.archivo.write(",[0,0]]" if self._puntos < 2 else "]")
+
+def escribirTopoJSON(circuito, primera_pasada, segunda_pasada, nombreTopoJSON, cuantizacion=100000):
+    """
+    Escribe en flujo la topología con un arco por tramo continuo de un
+    sector. El trazado es la unión de todos los arcos y cada sector
+    referencia los suyos, sin repetir coordenadas. Recibe dos iterables de
+    ColumnasTramos con los mismos tramos: la primera pasada calcula la
+    extensión para la cuantización y la segunda escribe los arcos
+    """
+    origen = circuito.origen
+    min_x = max_x = origen.longitud
+    min_y = max_y = origen.latitud
+    for bloque in primera_pasada:
+        if len(bloque):
+            if np is not None:
+                xs, ys = np.asarray(bloque.longitud), np.asarray(bloque.latitud)
+                xs, ys = (float(xs.min()), float(xs.max())), (float(ys.min()), float(ys.max()))
+            else:
+                xs, ys = bloque.longitud, bloque.latitud
+            min_x, max_x = min(min_x, min(xs)), max(max_x, max(xs))
+            min_y, max_y = min(min_y, min(ys)), max(max_y, max(ys))
+
+    # Escala de la rejilla de cuantizacion x cuantizacion posiciones
+    escala = ((max_x - min_x) / (cuantizacion - 1) or 1.0, (max_y - min_y) / (cuantizacion - 1) or 1.0)
+
+    with open(nombreTopoJSON, 'w', encoding='utf-8') as archivo:
+        archivo.write('{"type":"Topology","transform":' + _propiedades({'scale': escala, 'translate': (min_x, min_y)})
+                      + ',"arcs":[')
+        arcos = ArcosCuantizados(archivo, (min_x, min_y), escala)
+        sectores = []
+        for bloque in segunda_pasada:
+            for s, a, b in _cortesSector(bloque.sector):
+                if not sectores or sectores[-1] != s:
+                    if sectores:
+                        arcos.cerrar()
+                    arcos.abrir(origen.longitud, origen.latitud)
+                    sectores.append(s)
+                arcos.extender(bloque.longitud[a:b], bloque.latitud[a:b])
+        if sectores:
+            arcos.extender([origen.longitud], [origen.latitud])
+            arcos.cerrar()
+
+        # Objetos: meta, trazado y sectores, que sólo guardan índices de arcos
+        meta = arcos.cuantizar([origen.longitud], [origen.latitud])
+        geometrias = [
+            {'type': 'Point', 'coordinates': [int(meta[0][0]), int(meta[1][0])],
+             'properties': {'nombre': 'Línea de Meta',
+                            'descripcion': f'{circuito.nombre} - {circuito.localidad}, {circuito.pais}'}},
+            {'type': 'LineString', 'arcs': list(range(len(sectores))),
+             'properties': {'nombre': f"Trazado {circuito.nombre}"}},
+        ]
+        for s in dict.fromkeys(sectores):
+            geometrias.append({'type': 'MultiLineString',
+                               'arcs': [[i] for i, sector in enumerate(sectores) if sector == s],
+                               'properties': {'nombre': f"Sector {s}", 'sector': s}})
+        perfil.contar('features', len(geometrias))
+        archivo.write('\n],"objects":{"circuito":{"type":"GeometryCollection","geometries":'
+                      + _propiedades(geometrias) + '}}}\n')
+
+def _pasadas(archivoXML, cache):
+    """
+    Circuito y dos iterables con sus tramos: las columnas de la caché
+    binaria o de una única lectura del archivo. Analizar el XML cuesta
+    mucho más que guardar las columnas, así que no se lee dos veces
+    """
+    circuito = cargarCircuitoCache(archivoXML) if cache else cargarCircuito(archivoXML)
+    return circuito, [circuito.tramos], [circuito.tramos]
+
+def generarGeoJSON(archivoXML, nombreGeoJSON, decimales=None, cache=False):
+    """
+    Genera el archivo GeoJSON del circuito. Con cache lee los tramos de
+    la caché binaria. Los errores se propagan al llamador
+    """
+    escribirGeoJSON(*_pasadas(archivoXML, cache), nombreGeoJSON, decimales)
+
+def generarTopoJSON(archivoXML, nombreTopoJSON, cuantizacion=100000, cache=False):
+    """
+    Genera el archivo TopoJSON del circuito, cuantizado en una rejilla de
+    cuantizacion x cuantizacion posiciones. Con cache lee los tramos de la
+    caché binaria. Los errores se propagan al llamador
+    """
+    escribirTopoJSON(*_pasadas(archivoXML, cache), nombreTopoJSON, cuantizacion)
+
+def main():
+    """
+    Genera circuito.geojson y circuito.topojson
+    """
+    print(GeoJsonFlujo.__doc__)
+
+    # Nombre del archivo de entrada y salidas
+    archivoXML = "circuitoEsquema.xml"
+    nombreGeoJSON = "circuito.geojson"
+    nombreTopoJSON = "circuito.topojson"
+
+    try:
+        generarGeoJSON(archivoXML, nombreGeoJSON)
+        generarTopoJSON(archivoXML, nombreTopoJSON)
+
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {archivoXML}")
+    except ET.ParseError as e:
+        print(f"Error al parsear el archivo XML: {e}")
+    except Exception as e:
+        print(f"Error inesperado: {e}")
+
+    perfil.emitir("xml2geojson")
+
+if __name__ == "__main__":
+    main()
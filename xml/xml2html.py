@@ -6,6 +6,11 @@ Crea archivos HTML con información del circuito
 @author: Alejandro Aldea Viana - UO293873
 """
 import xml.etree.ElementTree as ET
+from instrumentacion import perfil
+from cache import cargarCircuitoCache
+from geometria import calcularMetricas
+from modelo import LectorCircuito
+from recursos import recursosHTML
 
 class Html(object):
     """
@@ -13,6 +18,28 @@ class Html(object):
     @version 1.0 22/Octubre/2025
     @author: Alejandro Aldea Viana - UO293873
     """
+    # Bloques estáticos ya compuestos, compartidos entre documentos
+    _estaticos = {}
+
+    # Enlaces del menú de navegación: (destino, title, texto)
+    ENLACES = (
+        ("../index.html", "Página de inicio", "Inicio"),
+        ("../piloto.html", "Información del piloto", "Piloto"),
+        ("../circuito.html", "Información del circuito", "Circuito"),
+        ("../meteorologia.html", "Información sobre meteorología", "Meteorología"),
+        ("../clasificaciones.html", "Clasificaciones de MotoGP", "Clasificaciones"),
+        ("../juegos.html", "Juegos de MotoGP", "Juegos"),
+        ("../ayuda.html", "Ayuda de MotoGP", "Ayuda"),
+    )
+
+    # página: (descripción del head, enlace activo del menú, migas de pan
+    # tras Inicio, las intermedias enlazadas a su página del menú)
+    PAGINAS = {
+        'circuito': ("Información del circuito del proyecto MotoGP-Desktop", "Circuito", ("Circuito",)),
+        'temporada': ("Clasificación de la temporada del proyecto MotoGP-Desktop", "Clasificaciones",
+                      ("Clasificaciones", "Temporada")),
+    }
+
     def __init__(self, titulo="Información del Circuito"):
         """
         Crea la estructura básica del documento HTML
@@ -38,7 +65,8 @@ class Html(object):
         """
         return "</html>"
 
-    def addHead(self, titulo, css_path="estilo/estilo.css"):
+    def addHead(self, titulo, css_path="estilo/estilo.css",
+                descripcion="Información del circuito del proyecto MotoGP-Desktop"):
         """
         Genera la sección head completa manteniendo la estructura original
         """
@@ -46,7 +74,7 @@ class Html(object):
     <!-- Datos que describen el documento -->
     <meta charset="UTF-8" />
     <meta name ="author" content ="Alejandro Aldea Viana - UO293873" />
-    <meta name ="description" content ="Información del circuito del proyecto MotoGP-Desktop" />
+    <meta name ="description" content ="{descripcion}" />
     <meta name ="keywords" content ="MotoGP, motociclismo, deportes, velocidad, circuito" />
     <meta name ="viewport" content ="width=device-width, initial-scale=1.0" />
     <title>{titulo}</title>
@@ -68,29 +96,29 @@ class Html(object):
         """
         return "</body>"
 
-    def addHeader(self, titulo):
+    def addHeader(self, titulo, activo="Circuito"):
         """
-        Añade el header con navegación como en circuito.html original
+        Añade el header con navegación como en circuito.html original,
+        marcando como activo el enlace indicado
         """
+        enlaces = "".join(
+            f'''            <a href="{destino}" title="{title}"{' class="active"' if texto == activo else ''}>{texto}</a>\n'''
+            for destino, title, texto in self.ENLACES)
         header = f'''<header>
-        <h1><a href="../index.html" title="Ir a la página principal">MotoGP Desktop</a></h1>
+        <h1><a href="../index.html" title="Ir a la página principal">{titulo}</a></h1>
         <nav>
-            <a href="../index.html" title="Página de inicio">Inicio</a>
-            <a href="../piloto.html" title="Información del piloto">Piloto</a>
-            <a href="../circuito.html" title="Información del circuito" class="active">Circuito</a>
-            <a href="../meteorologia.html" title="Información sobre meteorología">Meteorología</a>
-            <a href="../clasificaciones.html" title="Clasificaciones de MotoGP">Clasificaciones</a>
-            <a href="../juegos.html" title="Juegos de MotoGP">Juegos</a>
-            <a href="../ayuda.html" title="Ayuda de MotoGP">Ayuda</a>
-        </nav>
+{enlaces}        </nav>
     </header>'''
         return header
 
-    def addNav(self):
+    def addNav(self, migas=("Circuito",)):
         """
-        Añade las migas de pan como en circuito.html original
+        Añade las migas de pan como en circuito.html original. Las migas
+        intermedias enlazan a su página del menú
         """
-        nav = '''<p>Estás en: <a href="../index.html">Inicio</a> &gt; Circuito</p>'''
+        destinos = {texto: destino for destino, _, texto in self.ENLACES}
+        partes = [f'<a href="{destinos[miga]}">{miga}</a>' for miga in migas[:-1]]
+        nav = f'''<p>Estás en: <a href="../index.html">Inicio</a> &gt; {" &gt; ".join(partes + [migas[-1]])}</p>'''
         return nav
 
     def addMainOpen(self):
@@ -109,11 +137,21 @@ class Html(object):
         """
         Añade una sección con título y contenido
         """
-        section = f'''<section>
+        return self.abrirSeccion(titulo) + contenido + self.cerrarSeccion()
+
+    def abrirSeccion(self, titulo):
+        """
+        Apertura de una sección con su título, para emitir el contenido en flujo
+        """
+        return f'''<section>
     <h2>{titulo}</h2>
-    {contenido}
-</section>'''
-        return section
+    '''
+
+    def cerrarSeccion(self):
+        """
+        Cierre de una sección abierta con abrirSeccion
+        """
+        return "\n</section>"
 
     def addParagraph(self, texto):
         """
@@ -133,22 +171,46 @@ class Html(object):
         """
         Añade una lista de definiciones
         """
-        dl_content = ""
-        for term, description in definitions:
-            dl_content += f"        <dt>{term}</dt>\n        <dd>{description}</dd>\n"
+        dl_content = "".join(self.addDefinitionItem(term, description)
+                             for term, description in definitions)
         return f"    <dl>\n{dl_content}    </dl>"
 
-    def addImage(self, src, alt, caption=None):
+    def addTable(self, cabecera, filas):
+        """
+        Añade una tabla con una fila de cabecera y las filas de datos
+        """
+        celdas = "".join(f"<th scope=\"col\">{titulo}</th>" for titulo in cabecera)
+        cuerpo = "".join("        <tr>" + "".join(f"<td>{valor}</td>" for valor in fila) + "</tr>\n"
+                         for fila in filas)
+        return f"    <table>\n        <tr>{celdas}</tr>\n{cuerpo}    </table>"
+
+    def addDefinitionItem(self, term, description):
         """
-        Añade una imagen con caption opcional y mejor formato
+        Añade un término y su descripción de una lista de definiciones
         """
+        return f"        <dt>{term}</dt>\n        <dd>{description}</dd>\n"
+
+    def addImage(self, src, alt, caption=None, imagen=None):
+        """
+        Añade una imagen con caption opcional y mejor formato. Con imagen
+        (recursos.Imagen) se indican sus dimensiones para que el navegador
+        reserve el hueco, se carga en diferido y se ofrecen sus variantes
+        """
+        atributos = ""
+        if imagen is not None:
+            atributos = f' width="{imagen.ancho}" height="{imagen.alto}" loading="lazy"'
+            if imagen.variantes:
+                candidatos = [f"../{ruta} {ancho}w" for ancho, _, ruta in imagen.variantes]
+                candidatos.append(f"../{src} {imagen.ancho}w")
+                atributos += (f' srcset="{", ".join(candidatos)}"'
+                              f' sizes="(max-width: {imagen.ancho}px) 100vw, {imagen.ancho}px"')
         if caption:
             return f'''    <figure>
-        <img src="../{src}" alt="{alt}" style="max-width: 100%; height: auto;">
+        <img src="../{src}" alt="{alt}"{atributos} style="max-width: 100%; height: auto;">
         <figcaption>{caption}</figcaption>
     </figure>'''
         else:
-            return f'    <img src="../{src}" alt="{alt}" style="max-width: 100%; height: auto;">'
+            return f'    <img src="../{src}" alt="{alt}"{atributos} style="max-width: 100%; height: auto;">'
     
     def addVideo(self, src, caption=None):
         """
@@ -176,12 +238,197 @@ class Html(object):
         return f'<a href="{url}">{link_text}</a>'
 
 
+    def prefijo(self, titulo, pagina='circuito'):
+        """
+        Bloque estático inicial (DOCTYPE, head, header, migas de pan y
+        apertura de main) de una de las PAGINAS. Se compone una sola vez
+        por título y página y se reutiliza entre documentos
+        """
+        clave = ('prefijo', titulo, pagina)
+        if clave not in Html._estaticos:
+            descripcion, activo, migas = self.PAGINAS[pagina]
+            Html._estaticos[clave] = "\n".join([
+                self.addDocType(), self.addHtmlOpen(), self.addHead(titulo, descripcion=descripcion),
+                self.addBodyOpen(), self.addHeader("MotoGP Desktop", activo),
+                self.addNav(migas), self.addMainOpen()])
+        return Html._estaticos[clave]
+
+    def sufijo(self):
+        """
+        Bloque estático final: cierre de main, body y html
+        """
+        if 'sufijo' not in Html._estaticos:
+            Html._estaticos['sufijo'] = "\n".join([
+                self.addMainClose(), self.addBodyClose(), self.addHtmlClose()])
+        return Html._estaticos['sufijo']
+
+    def escribirFlujo(self, nombreArchivoHTML, fragmentos):
+        """
+        Escribe el archivo HTML fragmento a fragmento, sin componer
+        el documento completo en memoria
+        """
+        with perfil.etapa('render'):
+            with open(nombreArchivoHTML, 'w', encoding='utf-8') as archivo:
+                archivo.writelines(fragmentos)
+
     def escribir(self, nombreArchivoHTML, contenido_completo):
         """
         Escribe el archivo HTML completo
         """
-        with open(nombreArchivoHTML, 'w', encoding='utf-8') as archivo:
-            archivo.write(contenido_completo)
+        with perfil.etapa('escritura'):
+            with open(nombreArchivoHTML, 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido_completo)
+
+def _tituloArchivo(ruta):
+    """
+    Título legible a partir del nombre de archivo, sin extensión
+    """
+    # Obtener el nombre del archivo sin extensión
+    nombre = ruta.split('/')[-1]
+    # Remover la extensión
+    if '.' in nombre:
+        nombre = nombre.rsplit('.', 1)[0]
+    return nombre.replace('_', ' ').title()
+
+def fragmentosHTML(circuito, html=None, metricas=None, imagenes=None):
+    """
+    Generador de los fragmentos del documento HTML en orden. Los bloques
+    estáticos se precompilan una vez y las listas (referencias, multimedia
+    y clasificación) se emiten elemento a elemento. Con metricas
+    (MetricasTramos) se añade la sección de geometría del trazado y con
+    imagenes ({src: Imagen}) las dimensiones y variantes de las fotos
+    """
+    if imagenes is None:
+        imagenes = {}
+    if html is None:
+        html = Html()
+    nombre_circuito = circuito.nombre
+    localidad = circuito.localidad
+    pais = circuito.pais
+    
+    # Estructura básica, header, migas de pan y apertura de main
+    yield html.prefijo("MotoGP-Circuito")
+    
+    # Título principal del circuito
+    yield (f'\n<section>'
+           f'\n    <h2>Información del circuito - {nombre_circuito}</h2>'
+           f'\n    <p>Circuito de {localidad}, {pais}</p>'
+           f'\n</section>')
+    
+    # Sección: Información General
+    info_general = []
+    info_general.append(html.addParagraph(f"Localización: {localidad}, {pais}"))
+    info_general.append(html.addParagraph(f"Longitud: {circuito.longitud} {circuito.unidades_longitud}"))
+    info_general.append(html.addParagraph(f"Anchura: {circuito.anchura} {circuito.unidades_anchura}"))
+    info_general.append(html.addParagraph(f"Fecha de la carrera: {circuito.fecha}"))
+    info_general.append(html.addParagraph(f"Hora de inicio: {circuito.hora_inicio}"))
+    info_general.append(html.addParagraph(f"Número de vueltas: {circuito.numero_vueltas}"))
+    info_general.append(html.addParagraph(f"Patrocinador principal: {circuito.patrocinador}"))
+    
+    yield "\n" + html.addSection("Información General", "\n".join(info_general))
+    
+    # Sección: Coordenadas de Origen
+    coord_content = []
+    coord_content.append(html.addParagraph(f"Longitud: {circuito.origen.longitud}°"))
+    coord_content.append(html.addParagraph(f"Latitud: {circuito.origen.latitud}°"))
+    coord_content.append(html.addParagraph(f"Altitud: {circuito.origen.altitud} metros"))
+    
+    yield "\n" + html.addSection("Coordenadas de Origen", "\n".join(coord_content))
+    
+    # Sección: Geometría del trazado, calculada de las coordenadas de los tramos
+    if metricas is not None and len(metricas):
+        geometria = []
+        geometria.append(html.addParagraph(f"Distancia declarada: {sum(metricas.declarada):.1f} m"))
+        geometria.append(html.addParagraph(f"Distancia calculada: {sum(metricas.calculada):.1f} m"))
+        geometria.append(html.addParagraph(f"Desnivel: +{metricas.ascenso:.1f} m / -{metricas.descenso:.1f} m"))
+        geometria.append(html.addParagraph(f"Pendiente máxima: {max(metricas.pendiente):.1f} %"))
+        geometria.append(html.addParagraph(f"Pendiente mínima: {min(metricas.pendiente):.1f} %"))
+        geometria.append(html.addDefinitionList(
+            (f"Sector {sector}", f"+{subida:.1f} m / -{bajada:.1f} m")
+            for sector, (subida, bajada) in sorted(metricas.desnivel.items())))
+        if len(metricas.sospechosos):
+            geometria.append(html.addParagraph("Tramos con distancia sospechosa:"))
+            geometria.append(html.addList(
+                f"Tramo {i + 1}: declarada {metricas.declarada[i]:.1f} m, calculada {metricas.calculada[i]:.1f} m"
+                for i in metricas.sospechosos))
+        yield "\n" + html.addSection("Geometría del trazado", "\n".join(geometria))
+    
+    # Sección: Referencias
+    if circuito.referencias:
+        yield "\n" + html.abrirSeccion("Referencias") + "<ul>"
+        for ref in circuito.referencias:
+            yield f"\n    <li>{html.addLink(ref, ref)}</li>"
+        yield "\n</ul>" + html.cerrarSeccion()
+    
+    # Sección: Multimedia
+    if circuito.fotos or circuito.videos:
+        yield "\n" + html.abrirSeccion("Multimedia")
+        separador = ""
+        if circuito.fotos:
+            yield "<h3>Fotografías</h3>"
+            for foto in circuito.fotos:
+                foto_nombre = _tituloArchivo(foto)
+                yield "\n" + html.addImage(foto, f"Fotografía del circuito: {foto_nombre}", foto_nombre,
+                                           imagenes.get(foto))
+            separador = "\n"
+        if circuito.videos:
+            yield separador + "<h3>Videos</h3>"
+            for video in circuito.videos:
+                video_nombre = _tituloArchivo(video)
+                yield "\n" + html.addVideo(video, f"Video del circuito: {video_nombre}")
+        yield html.cerrarSeccion()
+    
+    # Sección: Resultados
+    yield ("\n" + html.abrirSeccion("Resultados")
+           + html.addParagraph(f"Vencedor: {circuito.nombre_vencedor}") + "\n"
+           + html.addParagraph(f"Tiempo de carrera: {circuito.tiempo_carrera}"))
+    
+    # Clasificación mundial
+    if circuito.clasificacion:
+        yield "\n<h3>Clasificación Mundial</h3>\n    <dl>\n"
+        for clasificado in circuito.clasificacion:
+            yield html.addDefinitionItem(f"Posición {clasificado.posicion}",
+                                         f"{clasificado.nombre} - {clasificado.puntos} puntos")
+        yield "    </dl>"
+    yield html.cerrarSeccion()
+    
+    # Cerrar main, body y html
+    yield "\n" + html.sufijo()
+
+def documentoHTML(circuito):
+    """
+    Construye el texto completo del documento HTML a partir del modelo
+    """
+    return "".join(fragmentosHTML(circuito))
+
+def generarHTML(archivoXML, nombreHTML, geometria=False, cache=False):
+    """
+    Genera el archivo HTML con la información del circuito. geometria
+    añade las métricas calculadas de los tramos. Con cache lo carga de
+    la caché binaria. Sin ella los tramos no se guardan en columnas: se
+    recorren en flujo para las métricas o se descartan si la página no
+    las muestra. Devuelve los avisos de las imágenes. Los errores se
+    propagan al llamador
+    """
+    metricas = None
+    if cache:
+        circuito = cargarCircuitoCache(archivoXML)
+        if geometria:
+            metricas = calcularMetricas(circuito)
+    else:
+        # Una única pasada sobre el archivo, cargando sólo lo que usa la página
+        lector = LectorCircuito(archivoXML)
+        circuito = lector.circuito
+        if geometria:
+            metricas = calcularMetricas(circuito, lector.bloques())
+        else:
+            lector.saltarTramos()
+    recursos = recursosHTML(nombreHTML, circuito.fotos)
+    
+    # Escribir archivo HTML en flujo, sección a sección
+    html = Html()
+    html.escribirFlujo(nombreHTML, fragmentosHTML(circuito, html, metricas, recursos.imagenes))
+    return recursos.avisos()
 
 def main():
     # Archivos
@@ -189,162 +436,8 @@ def main():
     nombreHTML = "InfoCircuito.html"
     
     try:
-        # Leer y parsear el archivo XML
-        arbol = ET.parse(archivoXML)
-        raiz = arbol.getroot()
-        
-        # Definir el namespace
-        namespace = {'c': 'http://www.uniovi.es'}
-        
-        # Extraer información usando expresiones XPath
-        # Información básica del circuito
-        nombre_circuito = raiz.find('.//c:nombre', namespace).text
-        longitud = raiz.find('.//c:longitud', namespace)
-        anchura = raiz.find('.//c:anchura', namespace)
-        fecha = raiz.find('.//c:fecha', namespace).text
-        hora_inicio = raiz.find('.//c:horaInicio', namespace).text
-        numero_vueltas = raiz.find('.//c:numeroVueltas', namespace).text
-        localidad = raiz.find('.//c:localidad', namespace).text
-        pais = raiz.find('.//c:pais', namespace).text
-        patrocinador = raiz.find('.//c:patrocinadorPrincipal', namespace).text
-        
-        # Referencias
-        referencias = raiz.findall('.//c:referencias/c:referencia', namespace)
-        
-        # Multimedia
-        fotos = raiz.findall('.//c:fotos/c:foto', namespace)
-        videos = raiz.findall('.//c:videos/c:video', namespace)
-        
-        # Coordenadas de origen
-        coord_origen = raiz.find('.//c:coordenadasOrigen', namespace)
-        longitud_geo = coord_origen.find('c:longitudGeo', namespace).text
-        latitud_geo = coord_origen.find('c:latitudGeo', namespace).text
-        altitud_geo = coord_origen.find('c:altitudGeo', namespace).text
-        
-        # Información del vencedor
-        vencedor = raiz.find('.//c:vencedor', namespace)
-        nombre_vencedor = vencedor.find('c:nombrePiloto', namespace).text
-        tiempo_carrera = vencedor.find('c:tiempoCarrera', namespace).text
-        
-        # Clasificación mundial
-        clasificados = raiz.findall('.//c:clasificacionMundial/c:pilotoClasificado', namespace)
-        
-        # Crear objeto HTML
-        html = Html()
-        
-        # Construir el documento HTML
-        documento = []
-        
-        # Estructura básica
-        documento.append(html.addDocType())
-        documento.append(html.addHtmlOpen())
-        documento.append(html.addHead(f"MotoGP-Circuito"))
-        documento.append(html.addBodyOpen())
-        
-        # Header con navegación original
-        documento.append(html.addHeader("MotoGP Desktop"))
-        
-        # Migas de pan
-        documento.append(html.addNav())
-        
-        # Main content
-        documento.append(html.addMainOpen())
-        
-        # Título principal del circuito
-        documento.append(f'<section>')
-        documento.append(f'    <h2>Información del circuito - {nombre_circuito}</h2>')
-        documento.append(f'    <p>Circuito de {localidad}, {pais}</p>')
-        documento.append(f'</section>')
-        
-        # Sección: Información General
-        info_general = []
-        info_general.append(html.addParagraph(f"Localización: {localidad}, {pais}"))
-        info_general.append(html.addParagraph(f"Longitud: {longitud.text} {longitud.get('unidades')}"))
-        info_general.append(html.addParagraph(f"Anchura: {anchura.text} {anchura.get('unidades')}"))
-        info_general.append(html.addParagraph(f"Fecha de la carrera: {fecha}"))
-        info_general.append(html.addParagraph(f"Hora de inicio: {hora_inicio}"))
-        info_general.append(html.addParagraph(f"Número de vueltas: {numero_vueltas}"))
-        info_general.append(html.addParagraph(f"Patrocinador principal: {patrocinador}"))
-        
-        documento.append(html.addSection("Información General", "\n".join(info_general)))
-        
-        # Sección: Coordenadas de Origen
-        coord_content = []
-        coord_content.append(html.addParagraph(f"Longitud: {longitud_geo}°"))
-        coord_content.append(html.addParagraph(f"Latitud: {latitud_geo}°"))
-        coord_content.append(html.addParagraph(f"Altitud: {altitud_geo} metros"))
-        
-        documento.append(html.addSection("Coordenadas de Origen", "\n".join(coord_content)))
-        
-        # Sección: Referencias
-        if referencias:
-            refs_content = []
-            refs_content.append("<ul>")
-            for ref in referencias:
-                enlace = html.addLink(ref.text, ref.text)
-                refs_content.append(f"    <li>{enlace}</li>")
-            refs_content.append("</ul>")
-            refs_html = "\n".join(refs_content)
-            documento.append(html.addSection("Referencias", refs_html))
-        
-        # Sección: Multimedia
-        multimedia_content = []
-        if fotos:
-            multimedia_content.append("<h3>Fotografías</h3>")
-            for foto in fotos:
-                # Obtener el nombre del archivo sin extensión
-                foto_nombre = foto.text.split('/')[-1]
-                # Remover la extensión
-                if '.' in foto_nombre:
-                    foto_nombre = foto_nombre.rsplit('.', 1)[0]
-                foto_nombre = foto_nombre.replace('_', ' ').title()
-                multimedia_content.append(html.addImage(foto.text, f"Fotografía del circuito: {foto_nombre}", foto_nombre))
-        
-        if videos:
-            multimedia_content.append("<h3>Videos</h3>")
-            for video in videos:
-                # Obtener el nombre del archivo sin extensión
-                video_nombre = video.text.split('/')[-1]
-                # Remover la extensión
-                if '.' in video_nombre:
-                    video_nombre = video_nombre.rsplit('.', 1)[0]
-                video_nombre = video_nombre.replace('_', ' ').title()
-                multimedia_content.append(html.addVideo(video.text, f"Video del circuito: {video_nombre}"))
-        
-        if multimedia_content:
-            documento.append(html.addSection("Multimedia", "\n".join(multimedia_content)))
-        
-        # Sección: Resultados
-        resultados_content = []
-        resultados_content.append(html.addParagraph(f"Vencedor: {nombre_vencedor}"))
-        resultados_content.append(html.addParagraph(f"Tiempo de carrera: {tiempo_carrera}"))
-        
-        # Clasificación mundial
-        if clasificados:
-            resultados_content.append("<h3>Clasificación Mundial</h3>")
-            clasificacion_datos = []
-            for clasificado in clasificados:
-                posicion = clasificado.get('posicion')
-                nombre = clasificado.find('c:nombrePilotoClasificado', namespace).text
-                puntos = clasificado.find('c:puntosPiloto', namespace).text
-                clasificacion_datos.append((f"Posición {posicion}", f"{nombre} - {puntos} puntos"))
-            
-            resultados_content.append(html.addDefinitionList(clasificacion_datos))
-        
-        documento.append(html.addSection("Resultados", "\n".join(resultados_content)))
-        
-        # Cerrar main
-        documento.append(html.addMainClose())
-        
-        # Cerrar body y html
-        documento.append(html.addBodyClose())
-        documento.append(html.addHtmlClose())
-        
-        # Generar documento completo
-        documento_completo = "\n".join(documento)
-        
-        # Escribir archivo HTML
-        html.escribir(nombreHTML, documento_completo)
+        for aviso in generarHTML(archivoXML, nombreHTML):
+            print(aviso)
         
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo {archivoXML}")
@@ -352,6 +445,8 @@ def main():
         print(f"Error al parsear el archivo XML: {e}")
     except Exception as e:
         print(f"Error inesperado: {e}")
+    
+    perfil.emitir("xml2html")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,10 +1,33 @@
 
 """"
-Crea archivos KML con puntos y líneas
+Crea archivos KML con puntos y líneas, y KMZ teselados por regiones
 autor: Alejandro Aldea Viana - UO293873
 """
 
+import argparse
+import math
+import zipfile
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+from array import array
+from itertools import chain
+from instrumentacion import perfil
+from cache import cargarCircuitoCache
+from modelo import LectorCircuito
+from simplificacion import METODOS, RADIO_TIERRA, proyectarMetros, simplificar
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Niveles de detalle del KMZ: (tolerancia en metros o None para el trazado
+# completo, minLodPixels, maxLodPixels) de la región de cada tesela
+NIVELES_KMZ = (
+    (8.0, 0, 512),
+    (2.0, 512, 2048),
+    (None, 2048, -1),
+)
 
 class Kml(object):
     """
@@ -46,6 +69,55 @@ class Kml(object):
         ET.SubElement (linea, 'color').text = color
         ET.SubElement (linea, 'width').text = ancho
 
+    def addMultiLineString(self, nombre, listasCoordenadas, modoAltitud, color, ancho):
+        """
+        Añade un elemento <Placemark> con varias líneas <LineString>
+        dentro de un <MultiGeometry>
+        """
+        pm = ET.SubElement(self.doc, 'Placemark')
+        ET.SubElement(pm, 'name').text = nombre
+        multi = ET.SubElement(pm, 'MultiGeometry')
+        for coordenadas in listasCoordenadas:
+            ls = ET.SubElement(multi, 'LineString')
+            ET.SubElement(ls, 'tessellate').text = "1"
+            ET.SubElement(ls, 'coordinates').text = coordenadas
+            ET.SubElement(ls, 'altitudeMode').text = modoAltitud
+        estilo = ET.SubElement(pm, 'Style')
+        linea = ET.SubElement(estilo, 'LineStyle')
+        ET.SubElement(linea, 'color').text = color
+        ET.SubElement(linea, 'width').text = ancho
+
+    def addNetworkLink(self, nombre, href, caja, lod):
+        """
+        Añade un elemento <NetworkLink> que carga href sólo cuando su
+        <Region> está visible. caja es (norte, sur, este, oeste) en grados
+        y lod es (minLodPixels, maxLodPixels)
+        """
+        enlace = ET.SubElement(self.doc, 'NetworkLink')
+        ET.SubElement(enlace, 'name').text = nombre
+        region = ET.SubElement(enlace, 'Region')
+        limites = ET.SubElement(region, 'LatLonAltBox')
+        for etiqueta, valor in zip(('north', 'south', 'east', 'west'), caja):
+            ET.SubElement(limites, etiqueta).text = str(valor)
+        detalle = ET.SubElement(region, 'Lod')
+        ET.SubElement(detalle, 'minLodPixels').text = str(lod[0])
+        ET.SubElement(detalle, 'maxLodPixels').text = str(lod[1])
+        link = ET.SubElement(enlace, 'Link')
+        ET.SubElement(link, 'href').text = href
+        ET.SubElement(link, 'viewRefreshMode').text = 'onRegion'
+
+    def escribirKMZ(self, nombreArchivoKMZ, anexos=()):
+        """
+        Escribe un KMZ (zip comprimido) con este documento como doc.kml y
+        los documentos anexos, pares (ruta, Kml) referenciados desde sus
+        NetworkLink. Los anexos se escriben según llegan, sin indentación
+        """
+        with zipfile.ZipFile(nombreArchivoKMZ, 'w', zipfile.ZIP_DEFLATED) as kmz:
+            for ruta, kml in chain([('doc.kml', self)], anexos):
+                perfil.contar('documentos')
+                with perfil.etapa('escritura'), kmz.open(ruta, 'w') as destino:
+                    ET.ElementTree(kml.raiz).write(destino, encoding='utf-8', xml_declaration=True)
+
     def escribir(self,nombreArchivoKML):
         """
         Escribe el archivo KML con declaración y codificación
@@ -55,61 +127,293 @@ class Kml(object):
         Introduce indentacióon y saltos de línea
         para generar XML en modo texto
         """
-        ET.indent(arbol)
-        arbol.write(nombreArchivoKML, encoding='utf-8', xml_declaration=True)
+        with perfil.etapa('indent'):
+            ET.indent(arbol)
+        with perfil.etapa('escritura'):
+            arbol.write(nombreArchivoKML, encoding='utf-8', xml_declaration=True)
+
+class KmlFlujo(object):
+    """
+    Escribe el archivo KML en flujo, directamente al archivo, sin construir
+    el árbol en memoria. Produce la misma salida que Kml.escribir
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, nombreArchivoKML, indentar=True):
+        """
+        Abre el archivo y escribe declaración, raíz y <Document>
+        """
+        self.archivo = open(nombreArchivoKML, 'w', encoding='utf-8')
+        self.indentar = indentar
+        self.archivo.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        self.archivo.write('<kml xmlns="http://www.opengis.net/kml/2.2">')
+        self._abrir('Document', 1)
+
+    def _linea(self, nivel):
+        """
+        Salto de línea e indentación previos a una etiqueta
+        """
+        return "\n" + "  " * nivel if self.indentar else ""
 
-def main():
+    def _abrir(self, etiqueta, nivel):
+        self.archivo.write(f"{self._linea(nivel)}<{etiqueta}>")
+
+    def _cerrar(self, etiqueta, nivel):
+        self.archivo.write(f"{self._linea(nivel)}</{etiqueta}>")
+
+    def _hoja(self, etiqueta, texto, nivel):
+        self.archivo.write(f"{self._linea(nivel)}<{etiqueta}>{escape(str(texto))}</{etiqueta}>")
+
+    def addPlacemark(self,nombre,descripcion,long,lat,alt, modoAltitud):
+        """
+        Escribe un elemento <Placemark> con puntos <Point>
+        """
+        perfil.contar('placemarks')
+        self._abrir('Placemark', 2)
+        self._hoja('name', nombre, 3)
+        self._hoja('description', descripcion, 3)
+        self._abrir('Point', 3)
+        self._hoja('coordinates', '{},{},{}'.format(long,lat,alt), 4)
+        self._hoja('altitudeMode', modoAltitud, 4)
+        self._cerrar('Point', 3)
+        self._cerrar('Placemark', 2)
+
+    def addLineString(self,nombre,extrude,tesela, listaCoordenadas, modoAltitud, color, ancho):
+        """
+        Escribe un elemento <Placemark> con líneas <LineString>.
+        listaCoordenadas puede ser una cadena o un iterable de fragmentos,
+        que se escriben según llegan
+        """
+        perfil.contar('placemarks')
+        self._hoja('name', nombre, 2)
+        self._abrir('Placemark', 2)
+        self._abrir('LineString', 3)
+        self._hoja('extrude', extrude, 4)
+        self._hoja('tessellation', tesela, 4)
+        self._abrir('coordinates', 4)
+        if isinstance(listaCoordenadas, str):
+            listaCoordenadas = [listaCoordenadas]
+        for fragmento in listaCoordenadas:
+            with perfil.etapa('escritura'):
+                self.archivo.write(escape(fragmento))
+        self.archivo.write('</coordinates>')
+        self._hoja('altitudeMode', modoAltitud, 4)
+        self._cerrar('LineString', 3)
+        self._abrir('Style', 3)
+        self._abrir('LineStyle', 4)
+        self._hoja('color', color, 5)
+        self._hoja('width', ancho, 5)
+        self._cerrar('LineStyle', 4)
+        self._cerrar('Style', 3)
+        self._cerrar('Placemark', 2)
+
+    def cerrar(self):
+        """
+        Cierra <Document> y la raíz y libera el archivo
+        """
+        self._cerrar('Document', 1)
+        self._cerrar('kml', 0)
+        with perfil.etapa('escritura'):
+            self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.archivo.close()
+
+def fragmentosCoordenadas(origen, bloques, tolerancia=None, metodo='douglas-peucker'):
+    """
+    Fragmentos de texto de la línea del circuito, desde y hasta la meta,
+    generados bloque a bloque a partir de un iterable de ColumnasTramos.
+    Con tolerancia (en metros) se simplifica la línea completa
+    """
+    if tolerancia is None:
+        yield f"{origen.longitud},{origen.latitud}\n"
+        for bloque in bloques:
+            inicio = perfil.reloj()
+            texto = "".join(map("{},{}\n".format, bloque.longitud, bloque.latitud))
+            perfil.acumular('cadenas', inicio, len(bloque))
+            yield texto
+        yield f"{origen.longitud},{origen.latitud}"
+        return
+    # La simplificación necesita la línea completa en columnas
+    longitudes = array('d', [origen.longitud])
+    latitudes = array('d', [origen.latitud])
+    for bloque in bloques:
+        longitudes.extend(bloque.longitud)
+        latitudes.extend(bloque.latitud)
+    longitudes.append(origen.longitud)
+    latitudes.append(origen.latitud)
+    with perfil.etapa('simplificacion'):
+        resultado = simplificar(*proyectarMetros(longitudes, latitudes), tolerancia, metodo)
+    resultado.contar('simplificacion')
+    with perfil.etapa('cadenas'):
+        puntos = list(map("{},{}".format, resultado.aplicar(longitudes).tolist(),
+                          resultado.aplicar(latitudes).tolist()))
+        texto = "\n".join(puntos)
+    yield texto
+
+def escribirKML(circuito, coordenadas, nombreKML):
+    """
+    Escribe en flujo el punto de meta y la línea del circuito a partir
+    de los fragmentos de coordenadas
+    """
+    with KmlFlujo(nombreKML) as nuevoKML:
+        # Añadir el punto de la meta
+        nuevoKML.addPlacemark('Línea de Meta',
+                            f'{circuito.nombre} - {circuito.localidad}, {circuito.pais}',
+                            circuito.origen.longitud, circuito.origen.latitud, 0,
+                            'clampToGround')
+        
+        # Añadir la línea del circuito
+        nuevoKML.addLineString(f"Trazado {circuito.nombre}", "1", "1",
+                             coordenadas, 'relativeToGround',
+                             "#ff0000ff", "3")
+
+def _recorridosCelda(xs, ys, lado):
+    """
+    Genera (celda, inicio, fin) de cada recorrido consecutivo de la
+    polilínea por una misma celda de lado metros. fin incluye el primer
+    punto de la celda siguiente para que la línea no quede cortada
+    """
+    total = len(xs)
+    if np is not None:
+        cx = np.floor(np.asarray(xs) / lado).astype(np.int64)
+        cy = np.floor(np.asarray(ys) / lado).astype(np.int64)
+        cortes = (np.flatnonzero((np.diff(cx) != 0) | (np.diff(cy) != 0)) + 1).tolist()
+    else:
+        cx = [math.floor(x / lado) for x in xs]
+        cy = [math.floor(y / lado) for y in ys]
+        cortes = [i for i in range(1, total) if cx[i] != cx[i - 1] or cy[i] != cy[i - 1]]
+    for a, b in zip([0] + cortes, cortes + [total]):
+        yield (int(cx[a]), int(cy[a])), a, min(b + 1, total)
+
+def teselarCircuito(circuito, longitudes, latitudes, lado=500.0, niveles=NIVELES_KMZ,
+                    metodo='douglas-peucker'):
+    """
+    Reparte la línea del circuito en teselas de lado metros con varios
+    niveles de detalle. Devuelve el Kml raíz, con la meta y un NetworkLink
+    con región por tesela y nivel, y un generador de (ruta, Kml) de las
+    teselas, que se construyen de una en una al escribirlas
+    """
+    origen = circuito.origen
+    referencia = (origen.longitud, origen.latitud)
+    xs, ys = proyectarMetros(longitudes, latitudes, referencia)
+
+    # Línea de cada nivel y recorridos de cada tesela
+    lineas = []
+    teselas = {}
+    for nivel, (tolerancia, _, _) in enumerate(niveles):
+        if tolerancia is None:
+            lineas.append((longitudes, latitudes))
+            lx, ly = xs, ys
+        else:
+            with perfil.etapa('simplificacion'):
+                resultado = simplificar(xs, ys, tolerancia, metodo)
+            lineas.append((resultado.aplicar(longitudes), resultado.aplicar(latitudes)))
+            lx, ly = resultado.aplicar(xs), resultado.aplicar(ys)
+        for celda, a, b in _recorridosCelda(lx, ly, lado):
+            teselas.setdefault((celda, nivel), []).append((a, b))
+
+    # Documento raíz: meta y una región por tesela y nivel
+    coseno = math.cos(math.radians(origen.latitud))
+    def grados(x, y):
+        return (origen.longitud + math.degrees(x / (RADIO_TIERRA * coseno)),
+                origen.latitud + math.degrees(y / RADIO_TIERRA))
+
+    raiz = Kml()
+    raiz.addPlacemark('Línea de Meta',
+                      f'{circuito.nombre} - {circuito.localidad}, {circuito.pais}',
+                      origen.longitud, origen.latitud, 0,
+                      'clampToGround')
+    orden = sorted(teselas)
+    for (cx, cy), nivel in orden:
+        oeste, sur = grados(cx * lado, cy * lado)
+        este, norte = grados((cx + 1) * lado, (cy + 1) * lado)
+        raiz.addNetworkLink(f"Tesela {cx},{cy} nivel {nivel}", f"teselas/{cx}_{cy}_{nivel}.kml",
+                            (norte, sur, este, oeste), niveles[nivel][1:])
+
+    def anexos():
+        for (cx, cy), nivel in orden:
+            lons, lats = lineas[nivel]
+            inicio = perfil.reloj()
+            tramos = ["\n".join(map("{},{}".format, lons[a:b].tolist(), lats[a:b].tolist()))
+                      for a, b in teselas[(cx, cy), nivel]]
+            perfil.acumular('cadenas', inicio)
+            tesela = Kml()
+            tesela.addMultiLineString(f"Trazado {circuito.nombre}", tramos, 'relativeToGround',
+                                      "#ff0000ff", "3")
+            yield f"teselas/{cx}_{cy}_{nivel}.kml", tesela
+
+    return raiz, anexos()
+
+def escribirKMZ(circuito, tramos, nombreKMZ, lado=500.0, niveles=NIVELES_KMZ, metodo='douglas-peucker'):
+    """
+    Tesela la línea de los tramos indicados y escribe el KMZ
+    """
+    # Como en el KML, la línea empieza y acaba en la meta
+    origen = circuito.origen
+    longitudes = array('d', [origen.longitud])
+    latitudes = array('d', [origen.latitud])
+    longitudes.extend(tramos.longitud)
+    latitudes.extend(tramos.latitud)
+    longitudes.append(origen.longitud)
+    latitudes.append(origen.latitud)
+    raiz, anexos = teselarCircuito(circuito, longitudes, latitudes, lado, niveles, metodo)
+    raiz.escribirKMZ(nombreKMZ, anexos)
+
+def generarKMZ(archivoXML, nombreKMZ, lado=500.0, niveles=NIVELES_KMZ, metodo='douglas-peucker',
+               cache=False):
+    """
+    Genera el KMZ del circuito con la línea repartida en teselas de lado
+    metros y un nivel de detalle por cada entrada de niveles. Con cache
+    lee los tramos de la caché binaria. Los errores se propagan al llamador
+    """
+    if cache:
+        circuito = cargarCircuitoCache(archivoXML)
+        tramos = circuito.tramos
+    else:
+        lector = LectorCircuito(archivoXML)
+        circuito, tramos = lector.circuito, lector.columnas()
+    escribirKMZ(circuito, tramos, nombreKMZ, lado, niveles, metodo)
+
+def generarKML(archivoXML, nombreKML, tolerancia=None, metodo='douglas-peucker', cache=False):
+    """
+    Genera el archivo KML del circuito. Con tolerancia (en metros)
+    simplifica el trazado. Con cache lee los tramos de la caché binaria.
+    Los errores se propagan al llamador
+    """
+    if cache:
+        circuito = cargarCircuitoCache(archivoXML)
+        coordenadas = fragmentosCoordenadas(circuito.origen, [circuito.tramos], tolerancia, metodo)
+        escribirKML(circuito, coordenadas, nombreKML)
+        return
+    # Lectura incremental: la cabecera ya está cargada y los tramos
+    # se leen por bloques sin mantener el árbol en memoria
+    lector = LectorCircuito(archivoXML)
+    coordenadas = fragmentosCoordenadas(lector.circuito.origen, lector.bloques(), tolerancia, metodo)
+    escribirKML(lector.circuito, coordenadas, nombreKML)
+
+def main(tolerancia=None, metodo='douglas-peucker', kmz=False):
+    """
+    Genera circuito.kml y, si se pide kmz, circuito.kmz teselado. Con
+    tolerancia (en metros) simplifica el trazado del KML
+    """
     print(Kml.__doc__)
     
     # Nombre del archivo de entrada y salida
     archivoXML = "circuitoEsquema.xml"
     nombreKML = "circuito.kml"
+    nombreKMZ = "circuito.kmz"
     
     try:
-        arbol = ET.parse(archivoXML)
-        raiz = arbol.getroot()
-        namespace = {'c': 'http://www.uniovi.es'}
-        nuevoKML = Kml()
-        
-        # //nombre - descendientes 'nombre' de la raíz
-        nombre_circuito = raiz.find('.//c:nombre', namespace).text
-        # //localidad - descendientes 'localidad' de la raíz  
-        localidad = raiz.find('.//c:localidad', namespace).text
-        # //pais - descendientes 'pais' de la raíz
-        pais = raiz.find('.//c:pais', namespace).text
-        
-        # //coordenadasOrigen/longitudGeo - descendientes 'longitudGeo' hijos de 'coordenadasOrigen'
-        longitud_origen = float(raiz.find('.//c:coordenadasOrigen/c:longitudGeo', namespace).text)
-        latitud_origen = float(raiz.find('.//c:coordenadasOrigen/c:latitudGeo', namespace).text)
-        
-        # Añadir el punto de la meta
-        nuevoKML.addPlacemark('Línea de Meta',
-                            f'{nombre_circuito} - {localidad}, {pais}',
-                            longitud_origen, latitud_origen, 0,
-                            'clampToGround')
-        
-        # //tramo/coordenadas/longitudGeo - descendientes 'longitudGeo' de 'coordenadas' que son hijos de 'tramo'
-        coordenadas_longitud = raiz.findall('.//c:tramo/c:coordenadas/c:longitudGeo', namespace)
-        coordenadas_latitud = raiz.findall('.//c:tramo/c:coordenadas/c:latitudGeo', namespace)
-        
-        # Construir la cadena de coordenadas para la línea del circuito
-        # empezando desde el punto de meta
-        coordenadas_circuito = f"{longitud_origen},{latitud_origen}\n"
-        
-        for i in range(len(coordenadas_longitud)):
-            longitud = float(coordenadas_longitud[i].text)
-            latitud = float(coordenadas_latitud[i].text)
-            coordenadas_circuito += f"{longitud},{latitud}\n"
-        
-        coordenadas_circuito += f"{longitud_origen},{latitud_origen}"
-        
-        # Añadir la línea del circuito
-        nuevoKML.addLineString(f"Trazado {nombre_circuito}", "1", "1",
-                             coordenadas_circuito, 'relativeToGround',
-                             "#ff0000ff", "3")
-        
-        # Escribir el archivo KML
-        nuevoKML.escribir(nombreKML)
+        generarKML(archivoXML, nombreKML, tolerancia, metodo)
+        if kmz:
+            generarKMZ(archivoXML, nombreKMZ)
         
     except FileNotFoundError:
         print(f"Error: No se encontró el archivo {archivoXML}")
@@ -117,6 +421,16 @@ def main():
         print(f"Error al parsear el archivo XML: {e}")
     except Exception as e:
         print(f"Error inesperado: {e}")
+    
+    perfil.emitir("xml2kml")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Genera circuito.kml con el trazado del circuito")
+    parser.add_argument("-z", "--kmz", action="store_true",
+                        help="genera también circuito.kmz, teselado con niveles de detalle")
+    parser.add_argument("-t", "--tolerancia", type=float,
+                        help="simplifica el trazado con esta tolerancia en metros")
+    parser.add_argument("-m", "--metodo", choices=sorted(METODOS), default='douglas-peucker',
+                        help="método de simplificación (por defecto douglas-peucker)")
+    argumentos = parser.parse_args()
+    main(argumentos.tolerancia, argumentos.metodo, argumentos.kmz) 
\ No newline at end of file
@@ -0,0 +1,239 @@
+# xml2planta.py
+# -*- coding: utf-8 -*-
+""""
+Crea archivos SVG con la planta del circuito: el trazado visto desde
+arriba a partir de las coordenadas de los tramos, coloreado por sectores
+y con la línea de salida/meta
+@version 1.0 18/Octubre/2026
+@author: Alejandro Aldea Viana - UO293873
+"""
+import argparse
+import math
+import xml.etree.ElementTree as ET
+from array import array
+from instrumentacion import perfil
+from cache import cargarCircuitoCache
+from modelo import cargarCircuito
+from simplificacion import METODOS, proyectarMetros, simplificar
+from xml2altimetria import Svg, trazoRelativo
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Colores de los sectores, por orden de aparición
+COLORES_SECTOR = ("#FF6600", "#00A0E0", "#FFD700", "#7CFC00", "#FF4FA3", "#B388FF")
+
+def _cuantizarBloque(xs, ys):
+    """
+    Redondea a décimas de píxel y quita los puntos consecutivos repetidos.
+    Devuelve columnas (xs, ys) sin el primer punto si repite el anterior
+    """
+    if np is not None:
+        qx = np.rint(np.asarray(xs) * 10) / 10
+        qy = np.rint(np.asarray(ys) * 10) / 10
+        distintos = np.ones(len(qx), dtype=bool)
+        distintos[1:] = (qx[1:] != qx[:-1]) | (qy[1:] != qy[:-1])
+        return qx[distintos], qy[distintos]
+    salida_x, salida_y = array('d'), array('d')
+    for x, y in zip(xs, ys):
+        x, y = round(x * 10) / 10, round(y * 10) / 10
+        if not salida_x or x != salida_x[-1] or y != salida_y[-1]:
+            salida_x.append(x)
+            salida_y.append(y)
+    return salida_x, salida_y
+
+class TrazoSector(object):
+    """
+    Polilínea en píxeles de un tramo continuo de un mismo sector
+    @version 1.0 18/Octubre/2026
+    @author: Alejandro Aldea Viana - UO293873
+    """
+    def __init__(self, sector, x, y):
+        """
+        Empieza la polilínea del sector en el punto (x, y)
+        """
+        self.sector = sector
+        self.xs = array('d', [x])
+        self.ys = array('d', [y])
+
+    def extender(self, xs, ys):
+        """
+        Añade puntos ya cuantizados, sin repetir el último
+        """
+        qx, qy = _cuantizarBloque(xs, ys)
+        inicio = 1 if len(qx) and qx[0] == self.xs[-1] and qy[0] == self.ys[-1] else 0
+        self.xs.extend(qx[inicio:].tolist() if np is not None else qx[inicio:])
+        self.ys.extend(qy[inicio:].tolist() if np is not None else qy[inicio:])
+
+def crearPlanta(circuito, primera_pasada, segunda_pasada, tolerancia=None, metodo='douglas-peucker',
+                compacto=False):
+    """
+    Construye el Svg con la planta del circuito. Recibe dos iterables de
+    ColumnasTramos con los mismos tramos: la primera pasada calcula la
+    extensión proyectada y la segunda los puntos de cada sector. El último
+    sector se cierra en el origen, como la línea del KML. Con
+    tolerancia (en píxeles) se simplifica cada sector
+    """
+    origen = circuito.origen
+    referencia = (origen.longitud, origen.latitud)
+
+    # Primera pasada: extensión en metros, proyectando cada bloque con el origen como centro
+    min_x = max_x = min_y = max_y = 0.0
+    for bloque in primera_pasada:
+        inicio = perfil.reloj()
+        xs, ys = proyectarMetros(bloque.longitud, bloque.latitud, referencia)
+        perfil.acumular('proyeccion', inicio, len(bloque))
+        if len(bloque):
+            if np is not None:
+                xs, ys = (float(xs.min()), float(xs.max())), (float(ys.min()), float(ys.max()))
+            min_x, max_x = min(min_x, min(xs)), max(max_x, max(xs))
+            min_y, max_y = min(min_y, min(ys)), max(max_y, max(ys))
+
+    # Configuración del SVG
+    ancho_svg = 1000
+    alto_svg = 800
+    margen = 80
+
+    # Misma escala en los dos ejes, centrando el trazado en el área de dibujo
+    ancho_grafico = ancho_svg - 2 * margen
+    alto_grafico = alto_svg - 2 * margen
+    escala = min(ancho_grafico / ((max_x - min_x) or 1), alto_grafico / ((max_y - min_y) or 1))
+    desplazamiento_x = margen + (ancho_grafico - (max_x - min_x) * escala) / 2
+    desplazamiento_y = alto_svg - margen - (alto_grafico - (max_y - min_y) * escala) / 2
+
+    def aPixeles(xs, ys):
+        if np is not None:
+            return desplazamiento_x + (xs - min_x) * escala, desplazamiento_y - (ys - min_y) * escala
+        return ([desplazamiento_x + (x - min_x) * escala for x in xs],
+                [desplazamiento_y - (y - min_y) * escala for y in ys])
+
+    # Segunda pasada: puntos en píxeles repartidos en tramos continuos de cada sector
+    x0, y0 = aPixeles(*proyectarMetros([origen.longitud], [origen.latitud], referencia))
+    x0, y0 = round(float(x0[0]) * 10) / 10, round(float(y0[0]) * 10) / 10
+    trazos = []
+    actual = None
+    for bloque in segunda_pasada:
+        if not len(bloque):
+            continue
+        inicio = perfil.reloj()
+        px, py = aPixeles(*proyectarMetros(bloque.longitud, bloque.latitud, referencia))
+        sectores = bloque.sector
+        if np is not None:
+            cortes = (np.flatnonzero(np.diff(np.asarray(sectores))) + 1).tolist()
+        else:
+            cortes = [i for i in range(1, len(sectores)) if sectores[i] != sectores[i - 1]]
+        for a, b in zip([0] + cortes, cortes + [len(bloque)]):
+            if actual is None or actual.sector != sectores[a]:
+                # El sector nuevo empieza donde acabó el anterior (o en el origen)
+                x, y = (x0, y0) if actual is None else (actual.xs[-1], actual.ys[-1])
+                actual = TrazoSector(sectores[a], x, y)
+                trazos.append(actual)
+            actual.extender(px[a:b], py[a:b])
+        perfil.acumular('escalado', inicio, len(bloque))
+    # El circuito es cerrado: el último sector vuelve a la salida/meta
+    if actual is not None:
+        actual.extender([x0], [y0])
+
+    # Simplificación opcional con tolerancia en píxeles
+    if tolerancia is not None:
+        with perfil.etapa('simplificacion'):
+            for trazo in trazos:
+                resultado = simplificar(trazo.xs, trazo.ys, tolerancia, metodo)
+                trazo.xs = array('d', resultado.aplicar(trazo.xs))
+                trazo.ys = array('d', resultado.aplicar(trazo.ys))
+
+    # Crear objeto SVG
+    nuevoSVG = Svg(str(ancho_svg), str(alto_svg), compacto)
+
+    nuevoSVG.addRect(0, 0, ancho_svg, alto_svg, "#0A1A2F", "0", "none")
+
+    # Añadir título
+    nuevoSVG.addText(f"Planta - {circuito.nombre}",
+                    ancho_svg//2, 30, "Trebuchet MS", "18", "text-anchor: middle; font-weight: bold; fill: #FF6600")
+    nuevoSVG.addText(f"{circuito.localidad}",
+                    ancho_svg//2, 50, "Trebuchet MS", "14", "text-anchor: middle; fill: #E0E0E0")
+
+    # Añadir el trazado, un elemento por tramo continuo de cada sector
+    colores = {}
+    inicio = perfil.reloj()
+    for trazo in trazos:
+        color = colores.setdefault(trazo.sector, COLORES_SECTOR[len(colores) % len(COLORES_SECTOR)])
+        if compacto:
+            nuevoSVG.addPath(trazoRelativo(trazo.xs, trazo.ys), color, "4", "none")
+        else:
+            puntos = " ".join(map("{:.1f},{:.1f}".format, trazo.xs, trazo.ys))
+            nuevoSVG.addPolyline(puntos, color, "4", "none")
+    perfil.acumular('cadenas', inicio, sum(len(t.xs) for t in trazos))
+
+    # Línea de salida/meta perpendicular a la dirección de salida
+    if trazos:
+        primera = trazos[0]
+        dx, dy = (primera.xs[1] - x0, primera.ys[1] - y0) if len(primera.xs) > 1 else (1.0, 0.0)
+        longitud = math.hypot(dx, dy) or 1.0
+        nx, ny = -dy / longitud * 14, dx / longitud * 14
+        nuevoSVG.addLine(round(x0 - nx, 1), round(y0 - ny, 1), round(x0 + nx, 1), round(y0 + ny, 1),
+                         "#FFFFFF", "4")
+        nuevoSVG.addCircle(x0, y0, "4", "#FFFFFF")
+        nuevoSVG.addText("Salida/Meta", round(x0 + nx + 6, 1), round(y0 + ny, 1),
+                         "Trebuchet MS", "12", "fill: #FFFFFF")
+
+    # Leyenda de sectores
+    for i, (sector, color) in enumerate(colores.items()):
+        y = alto_svg - margen // 2 + 5
+        x = margen + i * 120
+        nuevoSVG.addLine(x, y - 4, x + 30, y - 4, color, "4")
+        nuevoSVG.addText(f"Sector {sector}", x + 38, y, "Trebuchet MS", "12", "fill: #CCCCCC")
+
+    return nuevoSVG
+
+def generarPlanta(archivoXML, nombreSVG, tolerancia=None, metodo='douglas-peucker',
+                  compacto=False, cache=False):
+    """
+    Genera el SVG con la planta del circuito. Con tolerancia (en píxeles)
+    simplifica el trazado; compacto genera el SVG reducido para la web.
+    Con cache lee los tramos de la caché binaria.
+    Los errores se propagan al llamador
+    """
+    # El trazado proyectado ocupa tanto como las columnas: se leen una
+    # sola vez (del archivo o de la caché) y las dos pasadas las recorren
+    circuito = cargarCircuitoCache(archivoXML) if cache else cargarCircuito(archivoXML)
+    nuevoSVG = crearPlanta(circuito, [circuito.tramos], [circuito.tramos],
+                           tolerancia, metodo, compacto)
+
+    # Escribir el archivo SVG
+    nuevoSVG.escribir(nombreSVG)
+
+def main(tolerancia=None, metodo='douglas-peucker', compacto=False):
+    """
+    Genera planta.svg. Con tolerancia (en píxeles) simplifica el trazado
+    """
+    print(Svg.__doc__)
+
+    # Nombre del archivo de entrada y salida
+    archivoXML = "circuitoEsquema.xml"
+    nombreSVG = "planta.svg"
+
+    try:
+        generarPlanta(archivoXML, nombreSVG, tolerancia, metodo, compacto=compacto)
+
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {archivoXML}")
+    except ET.ParseError as e:
+        print(f"Error al parsear el archivo XML: {e}")
+    except Exception as e:
+        print(f"Error inesperado: {e}")
+
+    perfil.emitir("xml2planta")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera planta.svg con el trazado del circuito visto desde arriba")
+    parser.add_argument("-c", "--compacto", action="store_true",
+                        help="SVG reducido para la web: paths relativos y estilos en clases")
+    parser.add_argument("-t", "--tolerancia", type=float,
+                        help="simplifica el trazado con esta tolerancia en píxeles")
+    parser.add_argument("-m", "--metodo", choices=sorted(METODOS), default='douglas-peucker',
+                        help="método de simplificación (por defecto douglas-peucker)")
+    argumentos = parser.parse_args()
+    main(argumentos.tolerancia, argumentos.metodo, compacto=argumentos.compacto)